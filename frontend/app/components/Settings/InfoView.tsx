@@ -1,7 +1,12 @@
 "use client";
 
 import React, { useState, useEffect } from "react";
-import { Credentials, NodePayload, CollectionPayload } from "@/app/types";
+import {
+  Credentials,
+  NodePayload,
+  CollectionPayload,
+  CachePayload,
+} from "@/app/types";
 import { IoTrash, IoDocumentSharp, IoReload } from "react-icons/io5";
 import { FaWrench } from "react-icons/fa";
 import { deleteAllDocuments, fetchMeta } from "@/app/api";
@@ -25,6 +30,7 @@ const InfoView: React.FC<InfoViewProps> = ({
   const [isLoading, setIsLoading] = useState<boolean>(false);
   const [collectionPayload, setCollectionPayload] =
     useState<CollectionPayload | null>(null);
+  const [cachePayload, setCachePayload] = useState<CachePayload | null>(null);
 
   const fetchMetadata = async () => {
     setIsLoading(true);
@@ -32,6 +38,7 @@ const InfoView: React.FC<InfoViewProps> = ({
     if (metaData?.error === "") {
       setNodePayload(metaData.node_payload);
       setCollectionPayload(metaData.collection_payload);
+      setCachePayload(metaData.cache_payload);
       setIsLoading(false);
     } else {
       setIsLoading(false);
@@ -220,6 +227,77 @@ const InfoView: React.FC<InfoViewProps> = ({
               <span className="loading loading-dots loading-sm mt-2"></span>
             )}
           </div>
+
+          <div className="flex flex-col border-2 border-bg-verba shadow-sm p-4 rounded-lg">
+            <p className="text-text-alt-verba text-sm lg:text-base font-semibold">
+              Embedding Cache
+            </p>
+            {cachePayload ? (
+              cachePayload.enabled ? (
+                <ul className="flex flex-col mt-2 list-disc list-inside">
+                  <li className="text-sm text-text-verba flex justify-between">
+                    <span>Entries</span>
+                    <span>
+                      {cachePayload.entries} ({cachePayload.size_mb} /{" "}
+                      {cachePayload.max_size_mb} MB)
+                    </span>
+                  </li>
+                  <li className="text-sm text-text-verba flex justify-between">
+                    <span>Hit rate</span>
+                    <span>{(cachePayload.hit_rate * 100).toFixed(1)}%</span>
+                  </li>
+                  <li className="text-sm text-text-verba flex justify-between">
+                    <span>Hits</span>
+                    <span>
+                      {cachePayload.local_hits} local
+                      {cachePayload.weaviate_enabled &&
+                        ` - ${cachePayload.weaviate_hits} Weaviate`}
+                    </span>
+                  </li>
+                  <li className="text-sm text-text-verba flex justify-between">
+                    <span>Misses</span>
+                    <span>{cachePayload.misses}</span>
+                  </li>
+                  <li className="text-sm text-text-verba flex justify-between">
+                    <span>Evictions</span>
+                    <span>{cachePayload.evictions}</span>
+                  </li>
+                </ul>
+              ) : (
+                <p className="text-sm text-text-verba mt-2">Disabled</p>
+              )
+            ) : (
+              <span className="loading loading-dots loading-sm mt-2"></span>
+            )}
+          </div>
+
+          <div className="flex flex-col border-2 border-bg-verba shadow-sm p-4 rounded-lg">
+            <p className="text-text-alt-verba text-sm lg:text-base font-semibold">
+              Query Caches
+            </p>
+            {cachePayload?.query_cache ? (
+              <ul className="flex flex-col mt-2 list-disc list-inside">
+                <li className="text-sm text-text-verba flex justify-between">
+                  <span>Query vectors</span>
+                  <span>
+                    {(cachePayload.query_cache.hit_rate * 100).toFixed(1)}% hit
+                    rate ({cachePayload.query_cache.entries} /{" "}
+                    {cachePayload.query_cache.max_size} entries)
+                  </span>
+                </li>
+                <li className="text-sm text-text-verba flex justify-between">
+                  <span>Semantic answers</span>
+                  <span>
+                    {cachePayload.semantic_cache.enabled
+                      ? `${(cachePayload.semantic_cache.hit_rate * 100).toFixed(1)}% hit rate (${cachePayload.semantic_cache.hits} hits)`
+                      : "Disabled"}
+                  </span>
+                </li>
+              </ul>
+            ) : (
+              <span className="loading loading-dots loading-sm mt-2"></span>
+            )}
+          </div>
         </div>
       </div>
       <UserModalComponent
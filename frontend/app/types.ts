@@ -292,10 +292,39 @@ export type CollectionPayload = {
   collections: CollectionInfo[];
 };
 
+// Embedding cache statistics
+export type CachePayload = {
+  enabled: boolean;
+  weaviate_enabled: boolean;
+  entries: number;
+  size_mb: number;
+  max_size_mb: number;
+  hits: number;
+  local_hits: number;
+  weaviate_hits: number;
+  misses: number;
+  evictions: number;
+  hit_rate: number;
+  query_cache: {
+    entries: number;
+    max_size: number;
+    hits: number;
+    misses: number;
+    hit_rate: number;
+  };
+  semantic_cache: {
+    enabled: boolean;
+    hits: number;
+    misses: number;
+    hit_rate: number;
+  };
+};
+
 export type MetadataPayload = {
   error: string;
   node_payload: NodePayload;
   collection_payload: CollectionPayload;
+  cache_payload: CachePayload;
 };
 
 export type ChunksPayload = {
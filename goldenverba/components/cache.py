@@ -0,0 +1,433 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from wasabi import msg
+
+from goldenverba.components.util import get_cache_dir, hash_content
+
+
+class EmbeddingCache:
+    """
+    Local on-disk embedding cache keyed by (model, sha256(text)).
+    Vectors are stored as float32 in a SQLite file and the least recently used entries are evicted once the size limit is reached.
+    The file is opened on first use, all methods block and are meant to run through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str = None, max_size_mb: float = None):
+        self.enabled = os.getenv("VERBA_EMBEDDING_CACHE", "true").lower() != "false"
+        self.weaviate_enabled = (
+            os.getenv("VERBA_EMBEDDING_CACHE_WEAVIATE", "false").lower() == "true"
+        )
+        self.path = path or os.getenv("VERBA_EMBEDDING_CACHE_PATH")
+        self.max_size = int(
+            (
+                max_size_mb
+                if max_size_mb is not None
+                else float(os.getenv("VERBA_EMBEDDING_CACHE_SIZE_MB", 512))
+            )
+            * 1024
+            * 1024
+        )
+        self.lock = threading.Lock()
+        self.hits = {"local": 0, "weaviate": 0}
+        self.misses = 0
+        self.evictions = 0
+        self.connection = None
+        self.size = 0
+
+    def connect(self) -> bool:
+        """Open the SQLite file on first use, callers hold the lock
+        @returns bool - Whether the cache is usable
+        """
+        if not self.enabled or self.connection is not None:
+            return self.enabled
+        try:
+            path = self.path or os.path.join(get_cache_dir(), "embedding_cache.db")
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT, hash TEXT, vector BLOB, size INTEGER, last_used REAL, "
+                "PRIMARY KEY (model, hash))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+            connection.commit()
+            self.size = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM embeddings"
+            ).fetchone()[0]
+            self.connection = connection
+        except Exception as e:
+            msg.warn(f"Embedding cache disabled: {str(e)}")
+            self.enabled = False
+        return self.enabled
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        """Return the cached vectors of the given content hashes"""
+        if not self.enabled or len(hashes) == 0:
+            return {}
+
+        vectors = {}
+        unique_hashes = list(set(hashes))
+        with self.lock:
+            if not self.connect():
+                return {}
+            # Stay below SQLite's variable limit
+            for i in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[i : i + 500]
+                rows = self.connection.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch],
+                ).fetchall()
+                for _hash, vector in rows:
+                    vectors[_hash] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+            if vectors:
+                now = time.time()
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND hash = ?",
+                    [(now, model, _hash) for _hash in vectors],
+                )
+                self.connection.commit()
+        return vectors
+
+    def set_many(self, model: str, vectors: dict[str, list[float]]):
+        """Store vectors by content hash and evict the least recently used entries if needed"""
+        if not self.enabled or len(vectors) == 0:
+            return
+
+        now = time.time()
+        rows = []
+        for _hash, vector in vectors.items():
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((model, _hash, blob, len(blob), now))
+
+        with self.lock:
+            if not self.connect():
+                return
+            for row in rows:
+                cursor = self.connection.execute(
+                    "INSERT OR IGNORE INTO embeddings (model, hash, vector, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    row,
+                )
+                if cursor.rowcount > 0:
+                    self.size += row[3]
+            self.connection.commit()
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        # Trim to 90% of the limit so eviction does not run on every insert
+        target = int(self.max_size * 0.9)
+        rows = self.connection.execute(
+            "SELECT model, hash, size FROM embeddings ORDER BY last_used ASC"
+        )
+        evicted = []
+        size = self.size
+        for model, _hash, entry_size in rows:
+            if size <= target:
+                break
+            evicted.append((model, _hash))
+            size -= entry_size
+        rows.close()
+        self.connection.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND hash = ?", evicted
+        )
+        self.connection.commit()
+        self.size = size
+        self.evictions += len(evicted)
+
+    def record(self, local_hits: int, weaviate_hits: int, misses: int):
+        self.hits["local"] += local_hits
+        self.hits["weaviate"] += weaviate_hits
+        self.misses += misses
+
+    def clear(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            if not self.connect():
+                return
+            self.connection.execute("DELETE FROM embeddings")
+            self.connection.commit()
+            self.size = 0
+
+    def get_stats(self) -> dict:
+        hits = self.hits["local"] + self.hits["weaviate"]
+        total = hits + self.misses
+        entries = 0
+        with self.lock:
+            if self.connect():
+                entries = self.connection.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+        return {
+            "enabled": self.enabled,
+            "weaviate_enabled": self.weaviate_enabled,
+            "entries": entries,
+            "size_mb": round(self.size / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size / (1024 * 1024), 2),
+            "hits": hits,
+            "local_hits": self.hits["local"],
+            "weaviate_hits": self.hits["weaviate"],
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / total, 4) if total > 0 else 0,
+        }
+
+
+class PageCache:
+    """
+    Local cache of crawled pages keyed by the requested URL.
+    Stores the ETag and Last-Modified validators with the final URL and the compressed HTML so re-crawls can use conditional GETs.
+    The least recently used pages are evicted once VERBA_PAGE_CACHE_SIZE_MB is reached.
+    The file is opened on first use, all methods block and are meant to run through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str = None, max_size_mb: float = None):
+        self.enabled = os.getenv("VERBA_PAGE_CACHE", "true").lower() != "false"
+        self.path = path or os.getenv("VERBA_PAGE_CACHE_PATH")
+        self.max_size = int(
+            (
+                max_size_mb
+                if max_size_mb is not None
+                else float(os.getenv("VERBA_PAGE_CACHE_SIZE_MB", 256))
+            )
+            * 1024
+            * 1024
+        )
+        self.lock = threading.Lock()
+        self.evictions = 0
+        self.connection = None
+        self.size = 0
+
+    def connect(self) -> bool:
+        """Open the SQLite file on first use, callers hold the lock
+        @returns bool - Whether the cache is usable
+        """
+        if not self.enabled or self.connection is not None:
+            return self.enabled
+        try:
+            path = self.path or os.path.join(get_cache_dir(), "page_cache.db")
+            connection = sqlite3.connect(path, check_same_thread=False)
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(pages)")]
+            if columns and "last_used" not in columns:
+                # Caches of earlier versions have no sizes, start over
+                connection.execute("DROP TABLE pages")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, final_url TEXT, etag TEXT, last_modified TEXT, html BLOB, "
+                "size INTEGER, fetched_at REAL, last_used REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used)"
+            )
+            connection.commit()
+            self.size = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()[0]
+            self.connection = connection
+        except Exception as e:
+            msg.warn(f"Page cache disabled: {str(e)}")
+            self.enabled = False
+        return self.enabled
+
+    def get(self, url: str) -> dict | None:
+        if not self.enabled:
+            return None
+        with self.lock:
+            if not self.connect():
+                return None
+            row = self.connection.execute(
+                "SELECT final_url, etag, last_modified, html FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE pages SET last_used = ? WHERE url = ?", (time.time(), url)
+            )
+            self.connection.commit()
+        return {
+            "final_url": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "html": zlib.decompress(row[3]).decode("utf-8"),
+        }
+
+    def set(
+        self,
+        url: str,
+        final_url: str,
+        etag: str | None,
+        last_modified: str | None,
+        html: str,
+    ):
+        """Store a page under its requested URL and evict the least recently used pages if needed"""
+        # Pages without validators can't be revalidated, there is no point in storing them
+        if not self.enabled or (etag is None and last_modified is None):
+            return
+        blob = zlib.compress(html.encode("utf-8"))
+        now = time.time()
+        with self.lock:
+            if not self.connect():
+                return
+            previous = self.connection.execute(
+                "SELECT size FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO pages (url, final_url, etag, last_modified, html, size, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, final_url, etag, last_modified, blob, len(blob), now, now),
+            )
+            self.connection.commit()
+            self.size += len(blob) - (previous[0] if previous else 0)
+            if self.size > self.max_size:
+                self.evict()
+
+    def evict(self):
+        # Trim to 90% of the limit so eviction does not run on every insert
+        target = int(self.max_size * 0.9)
+        rows = self.connection.execute(
+            "SELECT url, size FROM pages ORDER BY last_used ASC"
+        )
+        evicted = []
+        size = self.size
+        for url, entry_size in rows:
+            if size <= target:
+                break
+            evicted.append((url,))
+            size -= entry_size
+        rows.close()
+        self.connection.executemany("DELETE FROM pages WHERE url = ?", evicted)
+        self.connection.commit()
+        self.size = size
+        self.evictions += len(evicted)
+
+
+class TTLCache:
+    """In-process LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def contains(self, key) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and time.monotonic() - entry[1] < self.ttl
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = (value, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total > 0 else 0,
+        }
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+class SemanticCache:
+    """
+    Settings and keys of the semantic answer cache.
+    Entries live in the VERBA_SemanticCache collections, see WeaviateManager for lookup and invalidation.
+    """
+
+    def __init__(self):
+        # Opt in, cached answers can be stale until their documents change or the TTL expires
+        self.enabled = os.getenv("VERBA_SEMANTIC_CACHE", "false").lower() == "true"
+        # Maximum cosine distance between two queries to count as the same question
+        self.max_distance = float(os.getenv("VERBA_SEMANTIC_CACHE_DISTANCE", 0.05))
+        self.ttl = float(os.getenv("VERBA_SEMANTIC_CACHE_TTL", 86400))
+        # Per lookup, retrieved chunks or generated answers
+        self.hits = {"retrieval": 0, "answer": 0}
+        self.misses = {"retrieval": 0, "answer": 0}
+
+    def record(self, lookup: str, entry: dict | None) -> dict | None:
+        """Count the result of a retrieval or answer lookup, failed lookups count as misses"""
+        if entry is not None:
+            self.hits[lookup] += 1
+        else:
+            self.misses[lookup] += 1
+        return entry
+
+    def get_config_key(self, rag_config: dict) -> str:
+        """Answers are only shared between requests with the same selected components and settings
+        Credentials (password settings) and endpoint URLs don't change the answer and are left out of the key
+        """
+        selected = {}
+        for component in ["Embedder", "Retriever", "Generator"]:
+            if component in rag_config:
+                name = rag_config[component].selected
+                selected[component] = {
+                    "name": name,
+                    "config": {
+                        key: setting.value
+                        for key, setting in rag_config[component]
+                        .components[name]
+                        .config.items()
+                        if setting.type != "password" and not key.endswith("URL")
+                    },
+                }
+        return hash_content(json.dumps(selected, sort_keys=True, default=str))
+
+    def get_filter_key(self, labels: list[str], document_uuids: list[str]) -> str:
+        return hash_content(
+            json.dumps([sorted(labels or []), sorted(document_uuids or [])])
+        )
+
+    def get_context_key(self, context: str) -> str:
+        return hash_content(context)
+
+    def is_first_turn(self, conversation: list) -> bool:
+        """Only answers without previous turns are cached, follow ups depend on the conversation"""
+        return not any(item.type == "system" for item in conversation)
+
+    def get_stats(self) -> dict:
+        hits = sum(self.hits.values())
+        total = hits + sum(self.misses.values())
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": total - hits,
+            "hit_rate": round(hits / total, 4) if total > 0 else 0,
+            "lookups": {
+                lookup: {"hits": self.hits[lookup], "misses": self.misses[lookup]}
+                for lookup in self.hits
+            },
+        }
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 with contextlib.suppress(Exception):
@@ -65,7 +66,9 @@ class CodeChunker(Chunker):
                 continue
             
             char_end_i = -1
-            for i, chunk in enumerate(text_splitter.split_text(document.content)):
+            for i, chunk in enumerate(
+                await asyncio.to_thread(text_splitter.split_text, document.content)
+            ):
                 
                 if chunk_overlap == 0:
                     char_start_i = char_end_i + 1
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 with contextlib.suppress(Exception):
@@ -43,7 +44,9 @@ class HTMLChunker(Chunker):
             if len(document.chunks) > 0:
                 continue
             
-            for i, chunk in enumerate(text_splitter.split_text(document.content)):
+            for i, chunk in enumerate(
+                await asyncio.to_thread(text_splitter.split_text, document.content)
+            ):
                 
                 chunk_text = ""
 
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 import json
@@ -54,7 +55,9 @@ class JSONChunker(Chunker):
                 continue
 
             char_end_i = -1
-            for i, chunk in enumerate(text_splitter.split_text(json_obj)):
+            for i, chunk in enumerate(
+                await asyncio.to_thread(text_splitter.split_text, json_obj)
+            ):
 
                 char_start_i = char_end_i + 1
                 char_end_i = char_start_i + len(chunk)
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 with contextlib.suppress(Exception):
@@ -45,7 +46,9 @@ class MarkdownChunker(Chunker):
             if len(document.chunks) > 0:
                 continue
 
-            for i, chunk in enumerate(text_splitter.split_text(document.content)):
+            for i, chunk in enumerate(
+                await asyncio.to_thread(text_splitter.split_text, document.content)
+            ):
                 
                 chunk_text = ""
 
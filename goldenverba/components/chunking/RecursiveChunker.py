@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 with contextlib.suppress(Exception):
@@ -82,7 +83,9 @@ class RecursiveChunker(Chunker):
                 continue
             
             # char_end_i = -1
-            for i, chunk in enumerate(text_splitter.split_text(document.content)):
+            for i, chunk in enumerate(
+                await asyncio.to_thread(text_splitter.split_text, document.content)
+            ):
 
                 # leavingt this commented because this _does_ work but the text splitter strips whitespace and therefore modifies the original doc
                 # if overlap == 0:
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 
 from wasabi import msg
@@ -7,7 +8,7 @@ with contextlib.suppress(Exception):
 
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, load_spacy_docs
 from goldenverba.components.types import InputConfig
 from goldenverba.components.interfaces import Embedding
 
@@ -55,6 +56,11 @@ class SemanticChunker(Chunker):
         )
         max_sentences = int(config["Max Sentences Per Chunk"].value)
 
+        await asyncio.to_thread(
+            load_spacy_docs,
+            [document for document in documents if len(document.chunks) == 0],
+        )
+
         for document in documents:
 
             # Skip if document already contains chunks
@@ -1,8 +1,9 @@
+import asyncio
 from wasabi import msg
 
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, load_spacy_docs
 from goldenverba.components.types import InputConfig
 from goldenverba.components.interfaces import Embedding
 
@@ -42,6 +43,11 @@ class SentenceChunker(Chunker):
         units = int(config["Sentences"].value)
         overlap = int(config["Overlap"].value)
 
+        await asyncio.to_thread(
+            load_spacy_docs,
+            [document for document in documents if len(document.chunks) == 0],
+        )
+
         for document in documents:
 
             doc = document.spacy_doc
@@ -1,8 +1,9 @@
+import asyncio
 from wasabi import msg
 
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, load_spacy_docs
 from goldenverba.components.types import InputConfig
 from goldenverba.components.interfaces import Embedding
 
@@ -42,6 +43,12 @@ class TokenChunker(Chunker):
         units = int(config["Tokens"].value)
         overlap = int(config["Overlap"].value)
 
+        # spaCy parsing is the expensive part, keep it off the event loop
+        await asyncio.to_thread(
+            load_spacy_docs,
+            [document for document in documents if len(document.chunks) == 0],
+        )
+
         for document in documents:
 
             doc = document.spacy_doc
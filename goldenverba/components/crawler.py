@@ -0,0 +1,244 @@
+import os
+import time
+import asyncio
+from typing import AsyncIterator, Callable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
+import xml.etree.ElementTree as ET
+
+import aiohttp
+from wasabi import msg
+
+from goldenverba.components.cache import PageCache
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str | None:
+    """Canonical form of a URL used for deduplication, None for non http(s) URLs"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class HostState:
+    """Politeness state of a single host"""
+
+    def __init__(self, max_connections: int, delay: float):
+        self.semaphore = asyncio.Semaphore(max_connections)
+        self.lock = asyncio.Lock()
+        self.delay = delay
+        self.next_request = 0.0
+        self.robots: RobotFileParser = None
+        self.ready = asyncio.Event()
+
+    async def wait(self):
+        # Space out request starts by the crawl delay of the host
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_request > now:
+                await asyncio.sleep(self.next_request - now)
+            self.next_request = time.monotonic() + self.delay
+
+
+class Crawler:
+    """
+    Breadth-first crawler with a bounded worker pool and per-host politeness limits.
+    Pages are revalidated against the PageCache with conditional GETs, unchanged pages are served from the cache.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_depth: int = 0,
+        link_extractor: Callable[[str, str], list[str]] = None,
+        respect_robots: bool = True,
+        use_sitemap: bool = False,
+        page_cache: PageCache = None,
+    ):
+        self.session = session
+        self.max_depth = max_depth
+        self.link_extractor = link_extractor
+        self.respect_robots = respect_robots
+        self.use_sitemap = use_sitemap
+        self.page_cache = page_cache
+        self.concurrency = int(os.getenv("VERBA_CRAWL_CONCURRENCY", 8))
+        self.max_per_host = int(os.getenv("VERBA_CRAWL_MAX_PER_HOST", 2))
+        self.delay = float(os.getenv("VERBA_CRAWL_DELAY", 0.25))
+        self.max_pages = int(os.getenv("VERBA_CRAWL_MAX_PAGES", 10000))
+        self.user_agent = os.getenv("VERBA_CRAWL_USER_AGENT", "Verba")
+        self.hosts: dict[str, HostState] = {}
+        self.seen: set[str] = set()
+        self.fetched = 0
+        self.not_modified = 0
+
+    async def get_host(self, url: str) -> HostState:
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        if key not in self.hosts:
+            host = HostState(self.max_per_host, self.delay)
+            self.hosts[key] = host
+            if self.respect_robots or self.use_sitemap:
+                host.robots = await self.fetch_robots(key)
+                delay = (
+                    host.robots.crawl_delay(self.user_agent) if host.robots else None
+                )
+                if delay is not None:
+                    host.delay = max(host.delay, float(delay))
+            host.ready.set()
+        # Other workers wait until robots.txt of a new host is loaded
+        await self.hosts[key].ready.wait()
+        return self.hosts[key]
+
+    async def fetch_robots(self, base_url: str) -> RobotFileParser | None:
+        robots = RobotFileParser(base_url + "/robots.txt")
+        try:
+            async with self.session.get(base_url + "/robots.txt") as response:
+                if response.status >= 400:
+                    # Like urllib, a missing robots.txt allows everything
+                    robots.parse([])
+                    return robots
+                robots.parse((await response.text()).splitlines())
+                return robots
+        except Exception as e:
+            msg.warn(f"Couldn't read robots.txt of {base_url}: {str(e)}")
+            return None
+
+    async def allowed(self, url: str) -> bool:
+        if not self.respect_robots:
+            return True
+        host = await self.get_host(url)
+        return host.robots is None or host.robots.can_fetch(self.user_agent, url)
+
+    async def fetch_sitemap_urls(self, seed: str) -> list[str]:
+        """URLs listed in the sitemaps of the seed's host, sitemap indexes are followed one level"""
+        host = await self.get_host(seed)
+        parts = urlsplit(seed)
+        sitemaps = (host.robots.site_maps() if host.robots else None) or [
+            f"{parts.scheme}://{parts.netloc}/sitemap.xml"
+        ]
+        urls = []
+        for depth in range(2):
+            nested = []
+            for sitemap in sitemaps:
+                try:
+                    async with self.session.get(sitemap) as response:
+                        response.raise_for_status()
+                        root = ET.fromstring(await response.read())
+                except Exception as e:
+                    msg.warn(f"Couldn't read sitemap {sitemap}: {str(e)}")
+                    continue
+                for element in root.iter():
+                    if element.tag.endswith("loc") and element.text:
+                        if root.tag.endswith("sitemapindex"):
+                            nested.append(element.text.strip())
+                        else:
+                            urls.append(element.text.strip())
+            sitemaps = nested
+        return [url for url in urls if urlsplit(url).netloc == parts.netloc]
+
+    async def fetch(self, url: str) -> tuple[str, str]:
+        """GET a page, revalidating a cached copy with If-None-Match / If-Modified-Since
+        @returns tuple - Final URL after redirects and the HTML
+        """
+        headers = {"User-Agent": self.user_agent}
+        cached = (
+            await asyncio.to_thread(self.page_cache.get, url)
+            if self.page_cache
+            else None
+        )
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        host = await self.get_host(url)
+        async with host.semaphore:
+            await host.wait()
+            async with self.session.get(url, headers=headers) as response:
+                # Pages are cached under the requested URL, both paths return the URL after redirects
+                if response.status == 304 and cached is not None:
+                    self.not_modified += 1
+                    return cached["final_url"] or url, cached["html"]
+                response.raise_for_status()
+                html = await response.text()
+                final_url = normalize_url(str(response.url)) or url
+                if self.page_cache:
+                    await asyncio.to_thread(
+                        self.page_cache.set,
+                        url,
+                        final_url,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        html,
+                    )
+                self.fetched += 1
+                return final_url, html
+
+    async def crawl(self, seeds: list[str]) -> AsyncIterator[tuple[str, str]]:
+        """Yield (url, html) of every reachable page in breadth-first order"""
+        frontier: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        done = object()
+
+        async def enqueue(url: str, depth: int):
+            url = normalize_url(url)
+            if url is None or url in self.seen or len(self.seen) >= self.max_pages:
+                return
+            self.seen.add(url)
+            if await self.allowed(url):
+                frontier.put_nowait((url, depth))
+            else:
+                msg.info(f"Skipping {url}, disallowed by robots.txt")
+
+        async def worker():
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    final_url, html = await self.fetch(url)
+                    # Redirect targets count as visited too
+                    if final_url != url:
+                        if final_url in self.seen:
+                            continue
+                        self.seen.add(final_url)
+                    if self.link_extractor and depth < self.max_depth:
+                        # Parsing large pages would block the other workers
+                        links = await asyncio.to_thread(
+                            self.link_extractor, html, final_url
+                        )
+                        for link in links:
+                            await enqueue(link, depth + 1)
+                    await results.put((final_url, html))
+                except Exception as e:
+                    msg.warn(f"Failed to process URL {url}: {str(e)}")
+                finally:
+                    frontier.task_done()
+
+        async def finish():
+            await frontier.join()
+            await results.put(done)
+
+        for seed in seeds:
+            await enqueue(seed, 0)
+            if self.use_sitemap:
+                for url in await self.fetch_sitemap_urls(seed):
+                    await enqueue(url, 0)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.create_task(finish()))
+        try:
+            while (result := await results.get()) is not done:
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            msg.info(
+                f"Crawled {self.fetched + self.not_modified} pages ({self.not_modified} not modified)"
+            )
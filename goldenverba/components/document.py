@@ -4,6 +4,38 @@ from spacy.tokens import Doc
 from spacy.language import Language
 import spacy
 import json
+import threading
+
+MAX_BATCH_SIZE = 500000
+PIPE_BATCH_SIZE = 64
+
+_nlp: Language | None = None
+# Documents are parsed in worker threads, the shared pipeline and its vocab are not thread safe
+_nlp_lock = threading.Lock()
+
+
+def get_nlp() -> Language:
+    """Return the shared blank English pipeline with a sentencizer"""
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.blank("en")
+        _nlp.add_pipe("sentencizer", config={"punct_chars": None})
+    return _nlp
+
+
+def parse_content(content: str) -> Doc:
+    """Parse content with the shared pipeline, splitting very large content into batches"""
+    with _nlp_lock:
+        nlp = get_nlp()
+
+        if len(content) > MAX_BATCH_SIZE:
+            docs = [
+                nlp(content[i : i + MAX_BATCH_SIZE])
+                for i in range(0, len(content), MAX_BATCH_SIZE)
+            ]
+            return Doc.from_docs(docs)
+
+        return nlp(content)
 
 
 class Document:
@@ -17,6 +49,8 @@ class Document:
         source: str = "",
         meta: dict = {},
         metadata: str = "",
+        embedder: str = "",
+        embedding_collection: str = "",
     ):
         self.title = title
         self.content = content
@@ -26,26 +60,22 @@ class Document:
         self.source = source
         self.meta = meta
         self.metadata = metadata
+        # Set on import, filterable copies of the embedding model in meta
+        self.embedder = embedder
+        self.embedding_collection = embedding_collection
         self.chunks: list[Chunk] = []
+        self._spacy_doc: Doc | None = None
 
-        MAX_BATCH_SIZE = 500000
+    @property
+    def spacy_doc(self) -> Doc:
+        """Sentence segmented spaCy Doc of the content, parsed on first access"""
+        if self._spacy_doc is None:
+            self._spacy_doc = parse_content(self.content)
+        return self._spacy_doc
 
-        nlp = spacy.blank("en")
-        nlp.add_pipe("sentencizer", config={"punct_chars": None})
-
-        if nlp and len(content) > MAX_BATCH_SIZE:
-            # Process content in batches
-            docs = []
-            for i in range(0, len(content), MAX_BATCH_SIZE):
-                batch = content[i : i + MAX_BATCH_SIZE]
-                docs.append(nlp(batch))
-
-            # Merge all processed docs
-            doc = Doc.from_docs(docs)
-        else:
-            doc = nlp(content) if nlp else None
-
-        self.spacy_doc = doc
+    @spacy_doc.setter
+    def spacy_doc(self, doc: Doc):
+        self._spacy_doc = doc
 
     @staticmethod
     def to_json(document) -> dict:
@@ -59,11 +89,13 @@ class Document:
             "source": document.source,
             "meta": json.dumps(document.meta),
             "metadata": document.metadata,
+            "embedder": document.embedder,
+            "embedding_collection": document.embedding_collection,
         }
         return doc_dict
 
     @staticmethod
-    def from_json(doc_dict: dict, nlp):
+    def from_json(doc_dict: dict):
         """Convert a JSON string to a Document object."""
 
         if (
@@ -85,6 +117,8 @@ class Document:
                 source=doc_dict.get("source", ""),
                 meta=doc_dict.get("meta", {}),
                 metadata=doc_dict.get("metadata", ""),
+                embedder=doc_dict.get("embedder", ""),
+                embedding_collection=doc_dict.get("embedding_collection", ""),
             )
             return document
         else:
@@ -103,3 +137,27 @@ def create_document(content: str, fileConfig: FileConfig) -> Document:
         metadata=fileConfig.metadata,
         meta={},
     )
+
+
+def load_spacy_docs(documents: list[Document]) -> None:
+    """Parse all documents that have not been parsed yet, batching them through nlp.pipe"""
+    pending = [
+        document
+        for document in documents
+        if document._spacy_doc is None and len(document.content) <= MAX_BATCH_SIZE
+    ]
+    if pending:
+        with _nlp_lock:
+            nlp = get_nlp()
+            for document, doc in zip(
+                pending,
+                nlp.pipe(
+                    (document.content for document in pending),
+                    batch_size=PIPE_BATCH_SIZE,
+                ),
+            ):
+                document._spacy_doc = doc
+
+    # Oversized documents are parsed in slices on first access
+    for document in documents:
+        document.spacy_doc
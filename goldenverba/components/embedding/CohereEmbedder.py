@@ -1,11 +1,11 @@
 import os
 import requests
-import aiohttp
 import json
 
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
+from goldenverba.components.http_pool import http_pool
 
 from wasabi import msg
 
@@ -18,6 +18,10 @@ class CohereEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "Cohere"
+        self.requests_per_minute = 2000
+        self.max_concurrency = 8
+        # Cohere accepts up to 96 texts per request and truncates each to 512 tokens
+        self.max_batch_size = 96
         self.description = "Vectorizes documents and queries using Cohere"
         self.url = os.getenv("COHERE_BASE_URL", "https://api.cohere.com/v1")
         models = get_models(self.url, get_token("COHERE_API_KEY", None), "embed")
@@ -55,16 +59,16 @@ class CohereEmbedder(Embedding):
 
         all_embeddings = []
 
-        async with aiohttp.ClientSession() as session:
-            for chunk in chunks(content, 96):
-                data = {"texts": chunk, "model": model, "input_type": "search_document"}
-                async with session.post(
-                    self.url + "/embed", data=json.dumps(data), headers=headers
-                ) as response:
-                    response.raise_for_status()
-                    response_data = await response.json()
-                    embeddings = response_data.get("embeddings", [])
-                    all_embeddings.extend(embeddings)
+        session = http_pool.get_session()
+        for chunk in chunks(content, 96):
+            data = {"texts": chunk, "model": model, "input_type": "search_document"}
+            async with session.post(
+                self.url + "/embed", data=json.dumps(data), headers=headers
+            ) as response:
+                response.raise_for_status()
+                response_data = await response.json()
+                embeddings = response_data.get("embeddings", [])
+                all_embeddings.extend(embeddings)
 
         return all_embeddings
 
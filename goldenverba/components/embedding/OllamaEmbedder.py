@@ -1,11 +1,11 @@
 import os
 import requests
 from wasabi import msg
-import aiohttp
 
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
+from goldenverba.components.http_pool import http_pool
 
 
 class OllamaEmbedder(Embedding):
@@ -13,6 +13,9 @@ class OllamaEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "Ollama"
+        # Local models, smaller requests keep memory usage and latency per request low
+        self.max_batch_size = 32
+        self.max_batch_tokens = 16384
         self.url = os.getenv("OLLAMA_URL", "http://localhost:11434")
         self.description = f"Vectorizes documents and queries using Ollama. If your Ollama instance is not running on {self.url}, you can change the URL by setting the OLLAMA_URL environment variable."
         models = get_models(self.url)
@@ -32,12 +35,12 @@ class OllamaEmbedder(Embedding):
 
         data = {"model": model, "input": content}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.url + "/api/embed", json=data) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings = data.get("embeddings", [])
-                return embeddings
+        session = http_pool.get_session()
+        async with session.post(self.url + "/api/embed", json=data) as response:
+            response.raise_for_status()
+            data = await response.json()
+            embeddings = data.get("embeddings", [])
+            return embeddings
 
 
 def get_models(url: str):
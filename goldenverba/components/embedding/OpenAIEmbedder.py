@@ -9,6 +9,8 @@ from wasabi import msg
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
+from goldenverba.components.http_pool import http_pool
+from goldenverba.components.scheduler import RateLimitError, get_retry_after
 
 
 class OpenAIEmbedder(Embedding):
@@ -17,6 +19,12 @@ class OpenAIEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "OpenAI"
+        self.requests_per_minute = 3000
+        self.tokens_per_minute = 1000000
+        self.max_concurrency = 8
+        # OpenAI accepts up to 2048 inputs and 300k tokens per request
+        self.max_batch_size = 2048
+        self.max_batch_tokens = 300000
         self.description = "Vectorizes documents and queries using OpenAI"
 
         # Fetch available models
@@ -70,36 +78,38 @@ class OpenAIEmbedder(Embedding):
         payload_bytes = json.dumps(payload).encode("utf-8")
         payload_io = io.BytesIO(payload_bytes)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{base_url}/embeddings",
-                    headers=headers,
-                    data=payload_io,
-                    timeout=30,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if "data" not in data:
-                        raise ValueError(f"Unexpected API response: {data}")
-
-                    embeddings = [item["embedding"] for item in data["data"]]
-                    if len(embeddings) != len(content):
-                        raise ValueError(
-                            f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
-                        )
-
-                    return embeddings
-
-            except aiohttp.ClientError as e:
-                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                    raise Exception("Rate limit exceeded. Waiting before retrying...")
-                raise Exception(f"API request failed: {str(e)}")
-
-            except Exception as e:
-                msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
-                raise
+        session = http_pool.get_session()
+        try:
+            async with session.post(
+                f"{base_url}/embeddings",
+                headers=headers,
+                data=payload_io,
+                timeout=30,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+
+                if "data" not in data:
+                    raise ValueError(f"Unexpected API response: {data}")
+
+                embeddings = [item["embedding"] for item in data["data"]]
+                if len(embeddings) != len(content):
+                    raise ValueError(
+                        f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
+                    )
+
+                return embeddings
+
+        except aiohttp.ClientError as e:
+            if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
+                raise RateLimitError(
+                    "Rate limit exceeded", retry_after=get_retry_after(e.headers)
+                ) from e
+            raise Exception(f"API request failed: {str(e)}") from e
+
+        except Exception as e:
+            msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
+            raise
 
     @staticmethod
     def get_models(token: str, url: str) -> List[str]:
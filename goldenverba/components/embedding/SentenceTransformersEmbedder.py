@@ -1,3 +1,11 @@
+import os
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from wasabi import msg
+
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 
@@ -7,6 +15,62 @@ except Exception as e:
     pass
 
 
+class SentenceTransformerRegistry:
+    """
+    Process-wide, size-bounded registry of loaded SentenceTransformer models with LRU eviction.
+    """
+
+    def __init__(self, max_models: int = 2):
+        self.max_models = max(1, max_models)
+        self.models: OrderedDict[str, "SentenceTransformer"] = OrderedDict()
+        # Models being loaded, concurrent requests for the same model wait for one load
+        self.loading: dict[str, Future] = {}
+        self.lock = threading.Lock()
+
+    def get(self, model_name: str) -> "SentenceTransformer":
+        """Return a loaded model, loading it (and evicting the least recently used one) if needed.
+        Blocking, call it from a worker thread. The lock is only held to read or insert, never during a load.
+        """
+        with self.lock:
+            if model_name in self.models:
+                self.models.move_to_end(model_name)
+                return self.models[model_name]
+            future = self.loading.get(model_name)
+            owner = future is None
+            if owner:
+                future = self.loading[model_name] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            msg.info(f"Loading SentenceTransformer model {model_name}")
+            model = SentenceTransformer(model_name)
+        except Exception as e:
+            with self.lock:
+                self.loading.pop(model_name, None)
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            self.loading.pop(model_name, None)
+            self.models[model_name] = model
+            while len(self.models) > self.max_models:
+                evicted, _ = self.models.popitem(last=False)
+                msg.info(f"Evicted SentenceTransformer model {evicted}")
+        future.set_result(model)
+        return model
+
+    def clear(self):
+        with self.lock:
+            self.models.clear()
+
+
+model_registry = SentenceTransformerRegistry(
+    int(os.getenv("VERBA_SENTENCE_TRANSFORMERS_CACHE_SIZE", 2))
+)
+
+
 class SentenceTransformersEmbedder(Embedding):
     """
     SentenceTransformersEmbedder base class for Verba.
@@ -36,8 +100,21 @@ class SentenceTransformersEmbedder(Embedding):
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
         try:
             model_name = config.get("Model").value
-            model = SentenceTransformer(model_name)
-            embeddings = model.encode(content).tolist()
-            return embeddings
+            model = await asyncio.to_thread(model_registry.get, model_name)
+            embeddings = await asyncio.to_thread(model.encode, content)
+            return embeddings.tolist()
         except Exception as e:
             raise Exception(f"Failed to vectorize chunks: {str(e)}")
+
+    async def warm_up(self):
+        """Preload the models listed in VERBA_SENTENCE_TRANSFORMERS_WARMUP (comma separated)"""
+        models = [
+            model.strip()
+            for model in os.getenv("VERBA_SENTENCE_TRANSFORMERS_WARMUP", "").split(",")
+            if model.strip()
+        ]
+        for model_name in models:
+            try:
+                await asyncio.to_thread(model_registry.get, model_name)
+            except Exception as e:
+                msg.warn(f"Failed to warm up {model_name}: {str(e)}")
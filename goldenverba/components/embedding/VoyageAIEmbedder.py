@@ -9,6 +9,8 @@ from wasabi import msg
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
+from goldenverba.components.http_pool import http_pool
+from goldenverba.components.scheduler import RateLimitError, get_retry_after
 
 
 class VoyageAIEmbedder(Embedding):
@@ -17,6 +19,13 @@ class VoyageAIEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "VoyageAI"
+        self.requests_per_minute = 2000
+        self.tokens_per_minute = 3000000
+        self.max_concurrency = 8
+        # VoyageAI accepts up to 128 texts per request, the token limit depends on the model
+        self.max_batch_size = 128
+        self.max_batch_tokens = 120000
+        self.model_limits = {"voyage-2": {"max_batch_tokens": 320000}}
         self.description = "Vectorizes documents and queries using VoyageAI"
 
         # Fetch available models
@@ -66,39 +75,41 @@ class VoyageAIEmbedder(Embedding):
         }
         payload = {"input": content, "model": model}
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{base_url}/embeddings",
-                    headers=headers,
-                    json=payload,  # Use json parameter instead of data
-                    timeout=30,
-                ) as response:
-                    if response.status == 400:
-                        error_body = await response.text()
-                        raise ValueError(f"Bad Request: {error_body}")
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if "data" not in data:
-                        raise ValueError(f"Unexpected API response: {data}")
-
-                    embeddings = [item["embedding"] for item in data["data"]]
-                    if len(embeddings) != len(content):
-                        raise ValueError(
-                            f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
-                        )
-
-                    return embeddings
-
-            except aiohttp.ClientError as e:
-                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                    raise Exception("Rate limit exceeded. Waiting before retrying...")
-                raise Exception(f"API request failed: {str(e)}")
-
-            except Exception as e:
-                msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
-                raise
+        session = http_pool.get_session()
+        try:
+            async with session.post(
+                f"{base_url}/embeddings",
+                headers=headers,
+                json=payload,  # Use json parameter instead of data
+                timeout=30,
+            ) as response:
+                if response.status == 400:
+                    error_body = await response.text()
+                    raise ValueError(f"Bad Request: {error_body}")
+                response.raise_for_status()
+                data = await response.json()
+
+                if "data" not in data:
+                    raise ValueError(f"Unexpected API response: {data}")
+
+                embeddings = [item["embedding"] for item in data["data"]]
+                if len(embeddings) != len(content):
+                    raise ValueError(
+                        f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
+                    )
+
+                return embeddings
+
+        except aiohttp.ClientError as e:
+            if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
+                raise RateLimitError(
+                    "Rate limit exceeded", retry_after=get_retry_after(e.headers)
+                ) from e
+            raise Exception(f"API request failed: {str(e)}") from e
+
+        except Exception as e:
+            msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
+            raise
 
     @staticmethod
     def get_models(token: str, url: str) -> List[str]:
@@ -1,12 +1,12 @@
 import os
 import json
-import aiohttp
 from typing import List, Dict, AsyncGenerator
 
 from goldenverba.components.interfaces import Generator
 from goldenverba.components.types import InputConfig
 from goldenverba.components.embedding.CohereEmbedder import get_models
 from goldenverba.components.util import get_environment, get_token
+from goldenverba.components.http_pool import http_pool
 
 
 class CohereGenerator(Generator):
@@ -74,19 +74,19 @@ class CohereGenerator(Generator):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.url + "/chat", json=data, headers=headers
-                ) as response:
-                    if response.status == 200:
-                        async for line in response.content:
-                            if line.strip():
-                                yield self._process_response(line)
-                    else:
-                        error_message = await response.text()
-                        yield self._error_response(
-                            f"HTTP Error {response.status}: {error_message}"
-                        )
+            session = http_pool.get_session()
+            async with session.post(
+                self.url + "/chat", json=data, headers=headers
+            ) as response:
+                if response.status == 200:
+                    async for line in response.content:
+                        if line.strip():
+                            yield self._process_response(line)
+                else:
+                    error_message = await response.text()
+                    yield self._error_response(
+                        f"HTTP Error {response.status}: {error_message}"
+                    )
 
         except Exception as e:
             yield self._error_response(str(e))
@@ -1,6 +1,5 @@
 import json
 import os
-import aiohttp
 from typing import Any, AsyncGenerator, List, Dict
 from wasabi import msg
 import requests
@@ -8,6 +7,7 @@ import requests
 from goldenverba.components.interfaces import Generator
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
+from goldenverba.components.http_pool import http_pool
 
 GROQ_BASE_URL = "https://api.groq.com/openai/v1/"
 DEFAULT_TEMPERATURE = 0.2
@@ -88,19 +88,19 @@ class GroqGenerator(Generator):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.url + "/chat/completions", json=data, headers=headers
-                ) as response:
-                    if response.status == 200:
-                        async for line in response.content:
-                            if line.strip():
-                                yield GroqGenerator._process_response(line)
-                    else:
-                        error_message = await response.text()
-                        yield GroqGenerator._error_response(
-                            f"HTTP Error {response.status}: {error_message}"
-                        )
+            session = http_pool.get_session()
+            async with session.post(
+                self.url + "/chat/completions", json=data, headers=headers
+            ) as response:
+                if response.status == 200:
+                    async for line in response.content:
+                        if line.strip():
+                            yield GroqGenerator._process_response(line)
+                else:
+                    error_message = await response.text()
+                    yield GroqGenerator._error_response(
+                        f"HTTP Error {response.status}: {error_message}"
+                    )
 
         except Exception as e:
             yield self._error_response(str(e))
@@ -1,11 +1,11 @@
 import os
 import json
-import aiohttp
 from typing import List, Dict, AsyncGenerator
 
 from goldenverba.components.interfaces import Generator
 from goldenverba.components.embedding.OllamaEmbedder import get_models
 from goldenverba.components.types import InputConfig
+from goldenverba.components.http_pool import http_pool
 
 
 class OllamaGenerator(Generator):
@@ -46,13 +46,13 @@ class OllamaGenerator(Generator):
         data = {"model": model, "messages": messages}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    async for line in response.content:
-                        if line.strip():
-                            yield self._process_response(line)
-                        else:
-                            yield self._empty_response()
+            session = http_pool.get_session()
+            async with session.post(url, json=data) as response:
+                async for line in response.content:
+                    if line.strip():
+                        yield self._process_response(line)
+                    else:
+                        yield self._empty_response()
 
         except Exception as e:
             yield self._error_response(
@@ -3,7 +3,7 @@ from dotenv import load_dotenv
 from goldenverba.components.interfaces import Generator
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
-import httpx
+from goldenverba.components.http_pool import http_pool
 import json
 
 load_dotenv()
@@ -72,30 +72,30 @@ class OpenAIGenerator(Generator):
             "stream": True,
         }
 
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST",
-                f"{openai_url}/chat/completions",
-                json=data,
-                headers=headers,
-                timeout=None,
-            ) as response:
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        if line.strip() == "data: [DONE]":
-                            break
-                        json_line = json.loads(line[6:])
-                        choice = json_line["choices"][0]
-                        if "delta" in choice and "content" in choice["delta"]:
-                            yield {
-                                "message": choice["delta"]["content"],
-                                "finish_reason": choice.get("finish_reason"),
-                            }
-                        elif "finish_reason" in choice:
-                            yield {
-                                "message": "",
-                                "finish_reason": choice["finish_reason"],
-                            }
+        client = http_pool.get_client()
+        async with client.stream(
+            "POST",
+            f"{openai_url}/chat/completions",
+            json=data,
+            headers=headers,
+            timeout=None,
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    if line.strip() == "data: [DONE]":
+                        break
+                    json_line = json.loads(line[6:])
+                    choice = json_line["choices"][0]
+                    if "delta" in choice and "content" in choice["delta"]:
+                        yield {
+                            "message": choice["delta"]["content"],
+                            "finish_reason": choice.get("finish_reason"),
+                        }
+                    elif "finish_reason" in choice:
+                        yield {
+                            "message": "",
+                            "finish_reason": choice["finish_reason"],
+                        }
 
     def prepare_messages(
         self, query: str, context: str, conversation: list[dict], system_message: str
@@ -0,0 +1,74 @@
+import os
+import asyncio
+import importlib.util
+
+import aiohttp
+import httpx
+from wasabi import msg
+
+
+class HTTPPool:
+    """
+    Application-scoped HTTP connection pools shared by all embedders and generators.
+    Sessions are created lazily on the running event loop and closed by the FastAPI lifespan.
+    """
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("VERBA_HTTP_MAX_CONNECTIONS", 100))
+        self.max_connections_per_host = int(
+            os.getenv("VERBA_HTTP_MAX_CONNECTIONS_PER_HOST", 20)
+        )
+        self.keepalive = float(os.getenv("VERBA_HTTP_KEEPALIVE", 60))
+        self.dns_cache_ttl = int(os.getenv("VERBA_HTTP_DNS_CACHE_TTL", 300))
+        # HTTP/2 needs the optional h2 package, aiohttp only speaks HTTP/1.1
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+        self.session: aiohttp.ClientSession = None
+        self.session_loop = None
+        self.client: httpx.AsyncClient = None
+        self.client_loop = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session with per-host keep-alive limits and DNS caching"""
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            self.session_loop = loop
+        return self.session
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Shared httpx client, uses HTTP/2 when h2 is installed"""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self.client.is_closed or self.client_loop is not loop:
+            self.client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections_per_host,
+                    keepalive_expiry=self.keepalive,
+                ),
+                timeout=None,
+            )
+            self.client_loop = loop
+        return self.client
+
+    async def close(self):
+        try:
+            if self.session is not None and not self.session.closed:
+                await self.session.close()
+            if self.client is not None and not self.client.is_closed:
+                await self.client.aclose()
+        except Exception as e:
+            msg.warn(f"Failed to close HTTP pool: {str(e)}")
+        self.session = None
+        self.client = None
+
+
+http_pool = HTTPPool()
@@ -0,0 +1,145 @@
+import os
+import random
+import asyncio
+from typing import Iterable
+from uuid import UUID
+
+from weaviate.client import WeaviateAsyncClient
+from weaviate.collections.classes.data import DataObject
+from wasabi import msg
+
+
+class PendingObjects:
+    """Objects waiting in the IngestionBatcher for one collection of one client"""
+
+    def __init__(self, client: WeaviateAsyncClient, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        self.objects: list[tuple[DataObject, asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle = None
+
+
+class IngestionBatcher:
+    """
+    Inserts objects of concurrently imported documents in fixed-size insert_many batches per collection.
+    At most VERBA_INGEST_CONCURRENCY batches are in flight, objects rejected by Weaviate are retried on their own.
+    Batch inserts overwrite objects with the same UUID, so objects with a fixed UUID are never stored twice by a retry.
+    """
+
+    def __init__(
+        self, batch_size: int = None, concurrency: int = None, window: float = None
+    ):
+        self.batch_size = max(
+            1,
+            (
+                batch_size
+                if batch_size is not None
+                else int(os.getenv("VERBA_INGEST_BATCH_SIZE", 200))
+            ),
+        )
+        self.concurrency = max(
+            1,
+            (
+                concurrency
+                if concurrency is not None
+                else int(os.getenv("VERBA_INGEST_CONCURRENCY", 4))
+            ),
+        )
+        self.window = (
+            window
+            if window is not None
+            else float(os.getenv("VERBA_INGEST_BATCH_WINDOW", 0.05))
+        )
+        self.max_retries = int(os.getenv("VERBA_INGEST_MAX_RETRIES", 3))
+        self.backoff = float(os.getenv("VERBA_INGEST_BACKOFF", 1))
+        self.pending: dict[tuple[int, str], PendingObjects] = {}
+        self.tasks: set[asyncio.Task] = set()
+        self.semaphore: asyncio.Semaphore = None
+
+    async def insert(
+        self,
+        client: WeaviateAsyncClient,
+        collection_name: str,
+        objects: Iterable[DataObject],
+    ) -> list[UUID | Exception]:
+        """Queue objects for insertion and wait until all of them are stored or failed
+        @parameter: objects : Iterable[DataObject] - Consumed lazily, full batches are sent while the rest is queued
+        @returns list - UUID per object, or the error of its last attempt
+        """
+        loop = asyncio.get_running_loop()
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        key = (id(client), collection_name)
+
+        futures = []
+        for obj in objects:
+            if key not in self.pending:
+                self.pending[key] = PendingObjects(client, collection_name)
+            future = loop.create_future()
+            self.pending[key].objects.append((obj, future))
+            futures.append(future)
+            if len(self.pending[key].objects) >= self.batch_size:
+                self.flush(key)
+
+        if key in self.pending and self.pending[key].timer is None:
+            self.pending[key].timer = loop.call_later(self.window, self.flush, key)
+
+        # Shield the shared batches, a cancelled import must not cancel objects of other documents
+        return await asyncio.gather(
+            *[asyncio.shield(future) for future in futures], return_exceptions=True
+        )
+
+    def flush(self, key: tuple[int, str]):
+        pending = self.pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        for i in range(0, len(pending.objects), self.batch_size):
+            task = asyncio.create_task(
+                self.send(pending, pending.objects[i : i + self.batch_size])
+            )
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def send(
+        self, pending: PendingObjects, items: list[tuple[DataObject, asyncio.Future]]
+    ):
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                try:
+                    collection = pending.client.collections.get(pending.collection_name)
+                    response = await collection.data.insert_many(
+                        [obj for obj, _ in items]
+                    )
+                    uuids = response.uuids
+                    errors = {i: error.message for i, error in response.errors.items()}
+                except Exception as e:
+                    # The whole request failed, e.g. a timeout, every object is retried
+                    uuids = {}
+                    errors = {i: str(e) for i in range(len(items))}
+
+            failed = []
+            error = None
+            for i, (obj, future) in enumerate(items):
+                if future.done():
+                    continue
+                if i in uuids:
+                    future.set_result(uuids[i])
+                    continue
+                error = errors.get(i, "Missing in the insert_many response")
+                if attempt >= self.max_retries:
+                    future.set_exception(Exception(error))
+                else:
+                    failed.append((obj, future))
+
+            if len(failed) == 0:
+                return
+            attempt += 1
+            delay = random.uniform(0, self.backoff * 2**attempt)
+            msg.warn(
+                f"Failed to insert {len(failed)} of {len(items)} objects into {pending.collection_name} ({error}), retry {attempt}/{self.max_retries} in {delay:.1f}s"
+            )
+            items = failed
+            await asyncio.sleep(delay)
@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from goldenverba.components.document import Document
 from goldenverba.server.types import FileConfig
 from goldenverba.components.types import InputConfig
@@ -69,6 +71,16 @@ class Reader(VerbaComponent):
         """
         raise NotImplementedError("load method must be implemented by a subclass.")
 
+    async def stream(
+        self, config: dict, fileConfig: FileConfig
+    ) -> AsyncIterator[Document]:
+        """Yield Verba Documents as soon as they are ready, readers fetching many documents can override this
+        @parameter: fileConfig: FileConfig - FileConfiguration sent by the frontend
+        @returns AsyncIterator[Document] - Verba documents
+        """
+        for document in await self.load(config, fileConfig):
+            yield document
+
 
 class Embedding(VerbaComponent):
     """
@@ -77,7 +89,17 @@ class Embedding(VerbaComponent):
 
     def __init__(self):
         super().__init__()
+        # Batches are packed up to max_batch_size texts and max_batch_tokens tokens (None for no token limit)
         self.max_batch_size = 128
+        self.max_batch_tokens = None
+        # tiktoken encoding used to count tokens, characters are estimated if unavailable
+        self.tokenizer = "cl100k_base"
+        # Per model overrides, e.g. {"model": {"max_batch_size": 96, "max_batch_tokens": 8192}}
+        self.model_limits: dict[str, dict] = {}
+        # Provider limits used by the EmbeddingScheduler, None disables the bucket
+        self.requests_per_minute = None
+        self.tokens_per_minute = None
+        self.max_concurrency = 4
 
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
         """Embed verba documents and its chunks to Weaviate
@@ -87,6 +109,19 @@ class Embedding(VerbaComponent):
         """
         raise NotImplementedError("embed method must be implemented by a subclass.")
 
+    def get_batch_limits(self, config: dict) -> tuple[int, int | None]:
+        """Return the maximum number of texts and tokens per request for the configured model"""
+        model = config["Model"].value if "Model" in config else None
+        limits = self.model_limits.get(model, {})
+        return (
+            limits.get("max_batch_size", self.max_batch_size),
+            limits.get("max_batch_tokens", self.max_batch_tokens),
+        )
+
+    async def warm_up(self) -> None:
+        """Optional hook called at server start to preload models or resources"""
+        return None
+
 
 class Chunker(VerbaComponent):
     """
@@ -177,9 +212,6 @@ class Embedder(VerbaComponent):
     def get_chunk_class(self) -> str:
         return "VERBA_Chunk_" + strip_non_letters(self.vectorizer)
 
-    def get_cache_class(self) -> str:
-        return "VERBA_Cache_" + strip_non_letters(self.vectorizer)
-
     def search_documents(
         self, client: Client, query: str, doc_type: str, page: int, pageSize: int
     ) -> list:
@@ -250,108 +282,6 @@ class Embedder(VerbaComponent):
 
         return query.lower()
 
-    def retrieve_semantic_cache(
-        self, client: Client, query: str, dist: float = 0.04
-    ) -> str:
-        """Retrieve results from semantic cache based on query and distance threshold
-        @parameter query - str - User query
-        @parameter dist - float - Distance threshold
-        @returns Optional[dict] - List of results or None.
-        """
-        needs_vectorization = self.get_need_vectorization()
-
-        match_results = (
-            client.query.get(
-                class_name=self.get_cache_class(),
-                properties=["query", "system"],
-            )
-            .with_where(
-                {
-                    "path": ["query"],
-                    "operator": "Equal",
-                    "valueText": query,
-                }
-            )
-            .with_limit(1)
-        ).do()
-
-        if (
-            "data" in match_results
-            and len(match_results["data"]["Get"][self.get_cache_class()]) > 0
-            and (
-                query
-                == match_results["data"]["Get"][self.get_cache_class()][0]["query"]
-            )
-        ):
-            msg.good("Direct match from cache")
-            return (
-                match_results["data"]["Get"][self.get_cache_class()][0]["system"],
-                0.0,
-            )
-
-        query_results = (
-            client.query.get(
-                class_name=self.get_cache_class(),
-                properties=["query", "system"],
-            )
-            .with_additional(properties=["distance"])
-            .with_limit(1)
-        )
-
-        if needs_vectorization:
-            vector = self.vectorize_query(query)
-            query_results = query_results.with_near_vector(
-                content={"vector": vector},
-            ).do()
-
-        else:
-            query_results = query_results.with_near_text(
-                content={"concepts": [query]},
-            ).do()
-
-        if "data" not in query_results:
-            msg.warn(query_results)
-            return None, None
-
-        results = query_results["data"]["Get"][self.get_cache_class()]
-
-        if not results:
-            return None, None
-
-        result = results[0]
-
-        if float(result["_additional"]["distance"]) <= dist:
-            msg.good("Retrieved similar from cache")
-            return result["system"], float(result["_additional"]["distance"])
-
-        else:
-            return None, None
-
-    def add_to_semantic_cache(self, client: Client, query: str, system: str):
-        """Add results to semantic cache
-        @parameter query : str - User query
-        @parameter results : list[dict] - Results from Weaviate
-        @parameter system : str - System message
-        @returns None.
-        """
-        needs_vectorization = self.get_need_vectorization()
-
-        with client.batch as batch:
-            batch.batch_size = 1
-            properties = {
-                "query": str(query),
-                "system": system,
-            }
-            msg.good("Saved to cache")
-
-            if needs_vectorization:
-                vector = self.vectorize_query(query)
-                client.batch.add_data_object(
-                    properties, self.get_cache_class(), vector=vector
-                )
-            else:
-                client.batch.add_data_object(properties, self.get_cache_class())
-
 
 class Retriever(VerbaComponent):
     """
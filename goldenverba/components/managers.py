@@ -7,18 +7,31 @@ from weaviate.classes.query import Filter, Sort, MetadataQuery
 from weaviate.collections.classes.data import DataObject
 from weaviate.classes.aggregate import GroupByAggregate
 from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.util import generate_uuid5
 
 import os
+import time
 import asyncio
 import json
 import re
 from urllib.parse import urlparse
 from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable
 
 from sklearn.decomposition import PCA
 
 
 from goldenverba.components.document import Document
+from goldenverba.components.projection import VectorProjection, PROJECTION_BLOCK_SIZE
+from goldenverba.components.util import hash_content
+from goldenverba.components.cache import EmbeddingCache, TTLCache, normalize_query
+from goldenverba.components.ingestion import IngestionBatcher
+from goldenverba.components.schema import get_collection_config, coerce_properties
+from goldenverba.components.scheduler import (
+    EmbeddingScheduler,
+    EmbeddingQueue,
+    count_tokens,
+)
 from goldenverba.components.interfaces import (
     Reader,
     Chunker,
@@ -152,6 +165,13 @@ class WeaviateManager:
         self.config_collection_name = "VERBA_CONFIG"
         self.suggestion_collection_name = "VERBA_SUGGESTION"
         self.embedding_table = {}
+        self.cache_table = {}
+        self.semantic_cache_prefix = "VERBA_SemanticCache_"
+        self.semantic_cache_table = {}
+        self.projection_locks: dict[str, asyncio.Lock] = {}
+        self.batcher = IngestionBatcher()
+        self.strict_import = os.getenv("VERBA_STRICT_IMPORT", "false").lower() == "true"
+        self.delete_batch_size = int(os.getenv("VERBA_DELETE_BATCH_SIZE", 500))
 
     ### Connection Handling
 
@@ -296,7 +316,9 @@ class WeaviateManager:
             msg.info(
                 f"Collection: {collection_name} does not exist, creating new collection."
             )
-            await client.collections.create(name=collection_name)
+            await client.collections.create(
+                name=collection_name, **(get_collection_config(collection_name) or {})
+            )
         return True
 
     async def verify_embedding_collection(self, client: WeaviateAsyncClient, embedder):
@@ -308,11 +330,11 @@ class WeaviateManager:
         return True
 
     async def verify_cache_collection(self, client: WeaviateAsyncClient, embedder):
-        if embedder not in self.embedding_table:
-            self.embedding_table[embedder] = "VERBA_Cache_" + re.sub(
+        if embedder not in self.cache_table:
+            self.cache_table[embedder] = "VERBA_Cache_" + re.sub(
                 r"[^a-zA-Z0-9]", "_", embedder
             )
-            await self.verify_collection(client, self.embedding_table[embedder])
+            await self.verify_collection(client, self.cache_table[embedder])
         return True
 
     async def verify_embedding_collections(
@@ -340,6 +362,120 @@ class WeaviateManager:
         )
         return True
 
+    async def migrate_collection(
+        self,
+        client: WeaviateAsyncClient,
+        collection_name: str,
+        progress: Callable[[str, int, int], Awaitable] = None,
+    ) -> int:
+        """Move an existing collection to its explicit schema.
+        Weaviate can't change indexes of existing properties, so objects are copied into a temporary collection,
+        the original is recreated with the schema and the objects are copied back.
+        @parameter: progress : Callable - Awaited with (step, copied, total) after every page
+        @returns int - Number of migrated objects
+        """
+        config = get_collection_config(collection_name)
+        if config is None:
+            raise Exception(f"{collection_name} has no explicit schema")
+        if not await client.collections.exists(collection_name):
+            await self.verify_collection(client, collection_name)
+            return 0
+
+        temp_name = collection_name + "_Migration"
+        if await client.collections.exists(temp_name):
+            raise Exception(
+                f"{temp_name} exists, a previous migration of {collection_name} did not finish. "
+                f"Its objects are in {temp_name} if {collection_name} is incomplete."
+            )
+        await client.collections.create(name=temp_name, **config)
+
+        total = await self.copy_collection(
+            client, collection_name, temp_name, config["properties"], progress
+        )
+        # The original is only dropped once the copy is complete
+        await client.collections.delete(collection_name)
+        await client.collections.create(name=collection_name, **config)
+        await self.copy_collection(
+            client, temp_name, collection_name, config["properties"], progress
+        )
+        await client.collections.delete(temp_name)
+        msg.good(f"Migrated {total} objects of {collection_name}")
+        return total
+
+    async def copy_collection(
+        self,
+        client: WeaviateAsyncClient,
+        source_name: str,
+        target_name: str,
+        schema: list,
+        progress: Callable[[str, int, int], Awaitable] = None,
+    ) -> int:
+        """Copy every object with its UUID and vector, raises unless all objects arrived"""
+        source = client.collections.get(source_name)
+        target = client.collections.get(target_name)
+        total = (await source.aggregate.over_all(total_count=True)).total_count
+
+        page_size = 1000
+        copied = 0
+        page = []
+
+        async def insert_page():
+            results = await self.batcher.insert(client, target_name, page)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise Exception(
+                    f"Failed to copy {len(errors)} objects from {source_name} to {target_name}: {str(errors[0])}"
+                )
+            msg.info(f"Copied {copied + len(page)} of {total} objects to {target_name}")
+            if progress is not None:
+                await progress(
+                    f"{source_name} -> {target_name}", copied + len(page), total
+                )
+            return len(page)
+
+        async for item in source.iterator(include_vector=True):
+            page.append(
+                DataObject(
+                    properties=coerce_properties(item.properties, schema),
+                    uuid=item.uuid,
+                    vector=item.vector.get("default") if item.vector else None,
+                )
+            )
+            if len(page) >= page_size:
+                copied += await insert_page()
+                page = []
+        if page:
+            copied += await insert_page()
+
+        stored = (await target.aggregate.over_all(total_count=True)).total_count
+        if stored != total:
+            raise Exception(
+                f"Object mismatch after copying {source_name} to {target_name}: Copied:{stored} | Existing: {total}"
+            )
+        return copied
+
+    async def migrate_collections(
+        self,
+        client: WeaviateAsyncClient,
+        progress: Callable[[str, int, int], Awaitable] = None,
+    ) -> dict[str, int]:
+        """Migrate the document, config, suggestion and all embedding collections to their explicit schemas"""
+        collection_names = [
+            self.document_collection_name,
+            self.config_collection_name,
+            self.suggestion_collection_name,
+        ] + sorted(
+            name
+            for name in await client.collections.list_all()
+            if name.startswith("VERBA_Embedding_") and not name.endswith("_Migration")
+        )
+        return {
+            collection_name: await self.migrate_collection(
+                client, collection_name, progress
+            )
+            for collection_name in collection_names
+        }
+
     ### Configuration Handling
 
     async def get_config(self, client: WeaviateAsyncClient, uuid: str) -> dict:
@@ -370,6 +506,62 @@ class WeaviateManager:
             if await config_collection.data.exists(uuid):
                 await config_collection.data.delete_by_id(uuid)
 
+    ### Projection Handling
+
+    def get_projection_uuid(self, embedder: str) -> str:
+        return generate_uuid5(f"VERBA_PROJECTION_{embedder}")
+
+    async def get_projection(
+        self, client: WeaviateAsyncClient, embedder: str
+    ) -> VectorProjection | None:
+        config = await self.get_config(client, self.get_projection_uuid(embedder))
+        if config is None:
+            return None
+        return VectorProjection.from_json(config)
+
+    async def set_projection(
+        self, client: WeaviateAsyncClient, embedder: str, projection: VectorProjection
+    ):
+        await self.set_config(
+            client, self.get_projection_uuid(embedder), projection.to_json()
+        )
+
+    def get_projection_lock(self, embedder: str) -> asyncio.Lock:
+        if embedder not in self.projection_locks:
+            self.projection_locks[embedder] = asyncio.Lock()
+        return self.projection_locks[embedder]
+
+    async def update_projection(
+        self, client: WeaviateAsyncClient, embedder: str, vectors: list[list[float]]
+    ):
+        """Refresh the persisted projection of an embedding collection with newly imported vectors"""
+        async with self.get_projection_lock(embedder):
+            projection = await self.get_projection(client, embedder)
+            if projection is None:
+                # First projection of a collection that may already hold data, the imported vectors are part of it
+                await self.fit_projection(client, embedder)
+                return
+            await asyncio.to_thread(projection.partial_fit, vectors)
+            await self.set_projection(client, embedder, projection)
+
+    async def fit_projection(
+        self, client: WeaviateAsyncClient, embedder: str
+    ) -> VectorProjection:
+        """Fit a projection over a whole embedding collection in fixed-size blocks, callers hold the projection lock"""
+        embedder_collection = client.collections.get(self.embedding_table[embedder])
+        projection = VectorProjection()
+        block = []
+        async for item in embedder_collection.iterator(
+            include_vector=True, return_properties=["chunk_id"]
+        ):
+            block.append(item.vector["default"])
+            if len(block) >= PROJECTION_BLOCK_SIZE:
+                await asyncio.to_thread(projection.partial_fit, block)
+                block = []
+        await asyncio.to_thread(projection.partial_fit, block)
+        await self.set_projection(client, embedder, projection)
+        return projection
+
     ### Import Handling
 
     async def import_document(
@@ -382,50 +574,85 @@ class WeaviateManager:
             embedder_collection = client.collections.get(self.embedding_table[embedder])
 
             ### Import Document
+            document.embedder = embedder
+            document.embedding_collection = self.embedding_table[embedder]
             document_obj = Document.to_json(document)
             doc_uuid = await document_collection.data.insert(document_obj)
 
-            chunk_ids = []
-
             try:
                 for chunk in document.chunks:
                     chunk.doc_uuid = doc_uuid
                     chunk.labels = document.labels
                     chunk.title = document.title
 
-                chunk_response = await embedder_collection.data.insert_many(
-                    [
-                        DataObject(properties=chunk.to_json(), vector=chunk.vector)
-                        for chunk in document.chunks
-                    ]
+                # Chunks are shared with concurrent imports in fixed-size batches,
+                # deterministic UUIDs make a retry overwrite an object stored by a lost response
+                results = await self.batcher.insert(
+                    client,
+                    self.embedding_table[embedder],
+                    (
+                        DataObject(
+                            properties=chunk.to_json(),
+                            vector=chunk.vector,
+                            uuid=generate_uuid5(f"{doc_uuid}:{i}"),
+                        )
+                        for i, chunk in enumerate(document.chunks)
+                    ),
                 )
                 chunk_ids = [
-                    chunk_response.uuids[uuid] for uuid in chunk_response.uuids
+                    result for result in results if not isinstance(result, Exception)
                 ]
+                errors = [result for result in results if isinstance(result, Exception)]
 
-                if chunk_response.has_errors:
+                if errors:
                     raise Exception(
-                        f"Failed to ingest chunks into Weaviate: {chunk_response.errors}"
+                        f"Failed to ingest {len(errors)} of {len(results)} chunks into Weaviate: {str(errors[0])}"
                     )
 
-                if doc_uuid and chunk_response:
+                # The insert_many responses already account for every chunk
+                if len(set(chunk_ids)) != len(document.chunks):
+                    raise Exception(
+                        f"Chunk Mismatch detected after importing: Imported:{len(set(chunk_ids))} | Existing: {len(document.chunks)}"
+                    )
+
+                # Strict mode double checks against what Weaviate actually stores
+                if self.strict_import:
                     response = await embedder_collection.aggregate.over_all(
                         filters=Filter.by_property("doc_uuid").equal(doc_uuid),
                         total_count=True,
                     )
                     if response.total_count != len(document.chunks):
-                        await document_collection.data.delete_by_id(doc_uuid)
-                        for _id in chunk_ids:
-                            await embedder_collection.data.delete_by_id(_id)
                         raise Exception(
                             f"Chunk Mismatch detected after importing: Imported:{response.total_count} | Existing: {len(document.chunks)}"
                         )
 
             except Exception as e:
-                if doc_uuid:
-                    await self.delete_document(client, doc_uuid)
+                try:
+                    await self.rollback_document(client, embedder, doc_uuid)
+                except Exception as rollback_error:
+                    raise Exception(
+                        f"Chunk import failed with : {str(e)}, rolling back document {doc_uuid} failed with : {str(rollback_error)}"
+                    )
                 raise Exception(f"Chunk import failed with : {str(e)}")
 
+            try:
+                await self.update_projection(
+                    client, embedder, [chunk.vector for chunk in document.chunks]
+                )
+            except Exception as e:
+                msg.warn(f"Failed to update vector projection: {str(e)}")
+
+    async def rollback_document(
+        self, client: WeaviateAsyncClient, embedder: str, doc_uuid: str
+    ):
+        """Remove a partially imported document and all of its chunks
+        The document object is only deleted once no chunk is left, a failed rollback can be retried with delete_document
+        """
+        await self.delete_chunks(client, self.embedding_table[embedder], [doc_uuid])
+        document_collection = client.collections.get(self.document_collection_name)
+        await document_collection.data.delete_by_id(doc_uuid)
+        await self.invalidate_semantic_cache(client, [doc_uuid])
+
     ### Document CRUD
 
     async def exist_document_name(self, client: WeaviateAsyncClient, name: str) -> str:
@@ -444,19 +671,16 @@ class WeaviateManager:
 
             return None
 
-    async def delete_document(self, client: WeaviateAsyncClient, uuid: str):
+    async def delete_document(
+        self, client: WeaviateAsyncClient, uuid: str, invalidate_cache: bool = True
+    ):
         if await self.verify_collection(client, self.document_collection_name):
             document_collection = client.collections.get(self.document_collection_name)
 
-            if not await document_collection.data.exists(uuid):
+            embedder = await self.get_document_embedder(client, uuid)
+            if embedder is None:
                 return
 
-            document_obj = await document_collection.query.fetch_object_by_id(uuid)
-            embedding_config = json.loads(document_obj.properties.get("meta"))[
-                "Embedder"
-            ]
-            embedder = embedding_config["config"]["Model"]["value"]
-
             if await self.verify_embedding_collection(client, embedder):
                 if await document_collection.data.delete_by_id(uuid):
                     embedder_collection = client.collections.get(
@@ -466,23 +690,156 @@ class WeaviateManager:
                         where=Filter.by_property("doc_uuid").equal(uuid)
                     )
 
+            if invalidate_cache:
+                try:
+                    await self.invalidate_semantic_cache(client, [uuid])
+                except Exception as e:
+                    msg.warn(f"Failed to invalidate the semantic cache: {str(e)}")
+
+    async def get_document_embedder(
+        self, client: WeaviateAsyncClient, uuid: str, document: dict = None
+    ) -> str | None:
+        """Embedding model of a document, parsed from meta for documents imported before the embedder property existed
+        @parameter: document : dict - Already fetched properties, the embedder is taken from them if present
+        @returns str - Model name, None if the document doesn't exist
+        """
+        if document is None:
+            document = await self.get_document(client, uuid, properties=["embedder"])
+            if document is None:
+                return None
+        if document.get("embedder"):
+            return document["embedder"]
+
+        document = await self.get_document(client, uuid, properties=["meta"])
+        if document is None:
+            return None
+        return json.loads(document["meta"])["Embedder"]["config"]["Model"]["value"]
+
+    async def delete_documents(
+        self,
+        client: WeaviateAsyncClient,
+        uuids: list[str] = None,
+        labels: list[str] = None,
+        progress: Callable[[int, int], Awaitable] = None,
+    ) -> int:
+        """Delete documents by uuid or label in pages, chunks are removed with one delete_many per embedding collection and page
+        @parameter: labels : list[str] - Documents with any of the labels are deleted
+        @parameter: progress : Callable - Awaited with (deleted, total) after every page
+        @returns int - Number of deleted documents
+        """
+        if not uuids and not labels:
+            return 0
+        if not await self.verify_collection(client, self.document_collection_name):
+            return 0
+        document_collection = client.collections.get(self.document_collection_name)
+        filters = (
+            Filter.by_id().contains_any(uuids)
+            if uuids
+            else Filter.by_property("labels").contains_any(labels)
+        )
+        total = (
+            await document_collection.aggregate.over_all(
+                filters=filters, total_count=True
+            )
+        ).total_count
+
+        deleted = 0
+        while deleted < total:
+            # Deleted documents drop out of the filter, every page starts at the top
+            response = await document_collection.query.fetch_objects(
+                filters=filters,
+                limit=self.delete_batch_size,
+                return_properties=["embedding_collection"],
+            )
+            if len(response.objects) == 0:
+                break
+
+            groups: dict[str | None, list[str]] = {}
+            for item in response.objects:
+                groups.setdefault(
+                    item.properties.get("embedding_collection"), []
+                ).append(str(item.uuid))
+
+            for embedding_collection, doc_uuids in groups.items():
+                if embedding_collection:
+                    collection_names = [embedding_collection]
+                else:
+                    # Documents imported before the property existed, look for the chunks in every embedding collection
+                    collection_names = [
+                        name
+                        for name in await client.collections.list_all()
+                        if name.startswith("VERBA_Embedding_")
+                    ]
+                for collection_name in collection_names:
+                    await self.delete_chunks(client, collection_name, doc_uuids)
+
+            # Documents are only deleted once none of their chunks are left
+            page_uuids = [str(item.uuid) for item in response.objects]
+            await document_collection.data.delete_many(
+                where=Filter.by_id().contains_any(page_uuids)
+            )
+            try:
+                await self.invalidate_semantic_cache(client, page_uuids)
+            except Exception as e:
+                msg.warn(f"Failed to invalidate the semantic cache: {str(e)}")
+
+            deleted += len(page_uuids)
+            msg.info(f"Deleted {deleted} of {total} documents")
+            if progress is not None:
+                await progress(deleted, total)
+
+        return deleted
+
+    async def delete_chunks(
+        self, client: WeaviateAsyncClient, collection_name: str, doc_uuids: list[str]
+    ):
+        """Delete all chunks of the documents, delete_many removes at most QUERY_MAXIMUM_RESULTS objects per call"""
+        collection = client.collections.get(collection_name)
+        while True:
+            result = await collection.data.delete_many(
+                where=Filter.by_property("doc_uuid").contains_any(doc_uuids)
+            )
+            if result.matches == 0:
+                return
+            if result.successful == 0:
+                raise Exception(
+                    f"Failed to delete {result.failed} chunks from {collection_name}"
+                )
+
     async def delete_all_documents(self, client: WeaviateAsyncClient):
-        if await self.verify_collection(client, self.document_collection_name):
-            document_collection = client.collections.get(self.document_collection_name)
-            async for item in document_collection.iterator():
-                await self.delete_document(client, item.uuid)
+        """Drop and recreate the document and embedding collections instead of deleting object by object"""
+        collection_names = [
+            name
+            for name in await client.collections.list_all()
+            if name == self.document_collection_name
+            or name.startswith("VERBA_Embedding_")
+        ]
+        for i, collection_name in enumerate(collection_names):
+            await client.collections.delete(collection_name)
+            msg.info(
+                f"Dropped {collection_name} ({i + 1} of {len(collection_names)} collections)"
+            )
+        # Embedding collections are recreated on their next use
+        embedders = list(self.embedding_table)
+        self.embedding_table = {}
+        await self.verify_collection(client, self.document_collection_name)
+
+        for embedder in embedders:
+            await self.reset_config(client, self.get_projection_uuid(embedder))
+        await self.delete_semantic_cache(client)
 
     async def delete_all_configs(self, client: WeaviateAsyncClient):
-        if await self.verify_collection(client, self.config_collection_name):
-            config_collection = client.collections.get(self.config_collection_name)
-            async for item in config_collection.iterator():
-                await config_collection.data.delete_by_id(item.uuid)
+        if await client.collections.exists(self.config_collection_name):
+            await client.collections.delete(self.config_collection_name)
+        await self.verify_collection(client, self.config_collection_name)
 
     async def delete_all(self, client: WeaviateAsyncClient):
         node_payload, collection_payload = await self.get_metadata(client)
         for collection in collection_payload["collections"]:
             if "VERBA" in collection["name"]:
                 await client.collections.delete(collection["name"])
+        self.cache_table = {}
+        self.semantic_cache_table = {}
 
     async def get_documents(
         self,
@@ -553,6 +910,37 @@ class WeaviateManager:
                 msg.warn(f"Document not found ({uuid})")
                 return None
 
+    async def get_documents_by_uuids(
+        self,
+        client: WeaviateAsyncClient,
+        uuids: list[str],
+        properties: list[str] = None,
+    ) -> dict[str, dict]:
+        """Fetch the given properties (title and metadata by default) of many documents in one query
+        @returns dict - Properties by document UUID, empty if the collection doesn't exist
+        """
+        if not uuids or not await self.verify_collection(
+            client, self.document_collection_name
+        ):
+            return {}
+
+        document_collection = client.collections.get(self.document_collection_name)
+        if properties is None:
+            properties = ["title", "metadata"]
+
+        documents = {}
+        batch_size = 1000
+        for i in range(0, len(uuids), batch_size):
+            batch = uuids[i : i + batch_size]
+            response = await document_collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(batch),
+                limit=len(batch),
+                return_properties=properties,
+            )
+            for doc in response.objects:
+                documents[str(doc.uuid)] = doc.properties
+        return documents
+
     ### Labels
 
     async def get_labels(self, client: WeaviateAsyncClient) -> list[str]:
@@ -588,13 +976,10 @@ class WeaviateManager:
 
             offset = pageSize * (page - 1)
 
-            document = await self.get_document(client, uuid, properties=["meta"])
-            if document is None:
+            embedder = await self.get_document_embedder(client, uuid)
+            if embedder is None:
                 return []
 
-            embedding_config = json.loads(document.get("meta"))["Embedder"]
-            embedder = embedding_config["config"]["Model"]["value"]
-
             if await self.verify_embedding_collection(client, embedder):
                 embedder_collection = client.collections.get(
                     self.embedding_table[embedder]
@@ -611,17 +996,78 @@ class WeaviateManager:
                     chunk["doc_uuid"] = str(chunk["doc_uuid"])
                 return chunks
 
+    async def get_reusable_vectors(
+        self, client: WeaviateAsyncClient, uuid: str, embedder: str, metadata: str
+    ) -> dict[str, list[float]]:
+        """Map the content hash of every chunk of a stored document to its vector
+        Vectors are only reusable when the document was embedded with the same model and metadata
+        @returns dict - Content hash to vector, empty if nothing can be reused
+        """
+        document = await self.get_document(
+            client, uuid, properties=["embedder", "metadata"]
+        )
+        if document is None:
+            return {}
+
+        if await self.get_document_embedder(client, uuid, document) != embedder:
+            return {}
+        if document.get("metadata", "") != metadata:
+            return {}
+
+        vectors = {}
+        if await self.verify_embedding_collection(client, embedder):
+            embedder_collection = client.collections.get(self.embedding_table[embedder])
+            async for item in self.iterate_document_chunks(
+                embedder_collection, uuid, ["content"], include_vector=True
+            ):
+                vectors[hash_content(item.properties["content"])] = item.vector[
+                    "default"
+                ]
+        return vectors
+
+    async def iterate_document_chunks(
+        self,
+        embedder_collection,
+        uuid: str,
+        return_properties: list[str],
+        include_vector: bool = False,
+        batch_size: int = 250,
+    ):
+        """Yield all chunks of a document in chunk_id order
+        Pages on chunk_id instead of an offset, offsets stop at QUERY_MAXIMUM_RESULTS and the cursor API can't be filtered
+        """
+        last_chunk_id = None
+        while True:
+            filters = Filter.by_property("doc_uuid").equal(uuid)
+            if last_chunk_id is not None:
+                filters = filters & Filter.by_property("chunk_id").greater_than(
+                    last_chunk_id
+                )
+            weaviate_chunks = await embedder_collection.query.fetch_objects(
+                filters=filters,
+                limit=batch_size,
+                sort=Sort.by_property("chunk_id", ascending=True),
+                return_properties=list({*return_properties, "chunk_id"}),
+                include_vector=include_vector,
+            )
+            for item in weaviate_chunks.objects:
+                yield item
+            if len(weaviate_chunks.objects) < batch_size:
+                return
+            last_chunk_id = weaviate_chunks.objects[-1].properties["chunk_id"]
+
     async def get_vectors(
         self, client: WeaviateAsyncClient, uuid: str, showAll: bool
     ) -> dict:
 
-        document = await self.get_document(client, uuid, properties=["meta", "title"])
+        document = await self.get_document(
+            client, uuid, properties=["embedder", "title"]
+        )
 
         if document is None:
             return None
 
-        embedding_config = json.loads(document.get("meta"))["Embedder"]
-        embedder = embedding_config["config"]["Model"]["value"]
+        embedder = await self.get_document_embedder(client, uuid, document)
 
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
@@ -671,49 +1117,32 @@ class WeaviateManager:
                     "groups": [{"name": document["title"], "chunks": chunks}],
                 }
 
-            # Generate PCA for all embeddings
+            # Project all embeddings with the persisted projection
             else:
+                async with self.get_projection_lock(embedder):
+                    projection = await self.get_projection(client, embedder)
+                    if projection is None or not projection.fitted:
+                        projection = await self.fit_projection(client, embedder)
+
+                if not projection.fitted:
+                    return {
+                        "embedder": embedder,
+                        "dimensions": 0,
+                        "groups": [],
+                    }
+
+                dimensions = int(projection.pca.n_features_in_)
                 vector_map = {}
-                vector_list, vector_ids, vector_chunk_uuids, vector_chunk_ids = (
-                    [],
-                    [],
-                    [],
-                    [],
-                )
-                dimensions = 0
-
-                async for item in embedder_collection.iterator(include_vector=True):
-                    doc_uuid = item.properties["doc_uuid"]
-                    chunk_uuid = item.uuid
-                    if doc_uuid not in vector_map:
-                        _document = await self.get_document(client, doc_uuid)
-                        if _document:
-                            vector_map[doc_uuid] = {
-                                "name": _document["title"],
-                                "chunks": [],
-                            }
-                        else:
-                            continue
-                    vector_list.append(item.vector["default"])
-                    dimensions = len(item.vector["default"])
-                    vector_ids.append(doc_uuid)
-                    vector_chunk_uuids.append(chunk_uuid)
-                    vector_chunk_ids.append(item.properties["chunk_id"])
-
-                if len(vector_ids) > 3:
-                    pca = PCA(n_components=3)
-                    generated_pca_embeddings = pca.fit_transform(vector_list)
-                    pca_embeddings = [
-                        pca_.tolist() for pca_ in generated_pca_embeddings
-                    ]
+                block, block_items = [], []
 
-                    for pca_embedding, _uuid, _chunk_uuid, _chunk_id in zip(
-                        pca_embeddings,
-                        vector_ids,
-                        vector_chunk_uuids,
-                        vector_chunk_ids,
+                async def project_block():
+                    pca_embeddings = await asyncio.to_thread(
+                        projection.transform, block
+                    )
+                    for pca_embedding, (_uuid, _chunk_uuid, _chunk_id) in zip(
+                        pca_embeddings, block_items
                     ):
-                        vector_map[_uuid]["chunks"].append(
+                        vector_map.setdefault(_uuid, []).append(
                             {
                                 "vector": {
                                     "x": pca_embedding[0],
@@ -724,18 +1153,37 @@ class WeaviateManager:
                                 "chunk_id": _chunk_id,
                             }
                         )
+                    block.clear()
+                    block_items.clear()
+
+                async for item in embedder_collection.iterator(
+                    include_vector=True, return_properties=["doc_uuid", "chunk_id"]
+                ):
+                    block.append(item.vector["default"])
+                    block_items.append(
+                        (
+                            str(item.properties["doc_uuid"]),
+                            item.uuid,
+                            item.properties["chunk_id"],
+                        )
+                    )
+                    if len(block) >= PROJECTION_BLOCK_SIZE:
+                        await project_block()
+                await project_block()
 
-                    return {
-                        "embedder": embedder,
-                        "dimensions": dimensions,
-                        "groups": list(vector_map.values()),
-                    }
-                else:
-                    return {
-                        "embedder": embedder,
-                        "dimensions": dimensions,
-                        "groups": [],
-                    }
+                documents = await self.get_documents_by_uuids(
+                    client, list(vector_map.keys()), properties=["title"]
+                )
+
+                return {
+                    "embedder": embedder,
+                    "dimensions": dimensions,
+                    "groups": [
+                        {"name": documents[_uuid]["title"], "chunks": chunks}
+                        for _uuid, chunks in vector_map.items()
+                        if _uuid in documents
+                    ],
+                }
 
         return None
 
@@ -822,9 +1270,16 @@ class WeaviateManager:
                     )
                 )
                 if len(does_suggestion_exists.objects) > 0:
+                    suggestion = does_suggestion_exists.objects[0]
+                    await suggestion_collection.data.update(
+                        uuid=suggestion.uuid,
+                        properties={
+                            "count": (suggestion.properties.get("count") or 1) + 1
+                        },
+                    )
                     return
             await suggestion_collection.data.insert(
-                {"query": query, "timestamp": datetime.now().isoformat()}
+                {"query": query, "timestamp": datetime.now().isoformat(), "count": 1}
             )
 
     async def retrieve_suggestions(
@@ -847,6 +1302,35 @@ class WeaviateManager:
             ]
             return return_suggestions
 
+    async def retrieve_frequent_suggestions(
+        self, client: WeaviateAsyncClient, limit: int
+    ) -> list[str]:
+        """Most frequently asked queries, falls back to the most recent ones for suggestions without counts"""
+        if await self.verify_collection(client, self.suggestion_collection_name):
+            suggestion_collection = client.collections.get(
+                self.suggestion_collection_name
+            )
+            aggregation = await suggestion_collection.aggregate.over_all(
+                total_count=True
+            )
+            if aggregation.total_count == 0:
+                return []
+            try:
+                suggestions = await suggestion_collection.query.fetch_objects(
+                    limit=limit,
+                    sort=Sort.by_property("count", ascending=False),
+                    return_properties=["query"],
+                )
+            except Exception:
+                suggestions = await suggestion_collection.query.fetch_objects(
+                    limit=limit,
+                    sort=Sort.by_property("timestamp", ascending=False),
+                    return_properties=["query"],
+                )
+            return [
+                suggestion.properties["query"] for suggestion in suggestions.objects
+            ]
+
     async def retrieve_all_suggestions(
         self, client: WeaviateAsyncClient, page: int, pageSize: int
     ):
@@ -886,7 +1370,206 @@ class WeaviateManager:
 
     ### Cache Logic
 
-    # TODO: Implement Cache Logic
+    async def get_cached_embeddings(
+        self, client: WeaviateAsyncClient, embedder: str, hashes: list[str]
+    ) -> dict[str, list[float]]:
+        """Fetch cached vectors by content hash from the VERBA_Cache collection of the embedder"""
+        if len(hashes) == 0:
+            return {}
+        if await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            aggregation = await cache_collection.aggregate.over_all(total_count=True)
+            if aggregation.total_count == 0:
+                return {}
+
+            vectors = {}
+            batch_size = 1000
+            for i in range(0, len(hashes), batch_size):
+                batch = hashes[i : i + batch_size]
+                response = await cache_collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(
+                        [generate_uuid5(_hash) for _hash in batch]
+                    ),
+                    limit=len(batch),
+                    return_properties=["hash"],
+                    include_vector=True,
+                )
+                for item in response.objects:
+                    vectors[item.properties["hash"]] = item.vector["default"]
+            return vectors
+
+    async def add_cached_embeddings(
+        self, client: WeaviateAsyncClient, embedder: str, vectors: dict
+    ):
+        if len(vectors) == 0:
+            return
+        if await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            response = await cache_collection.data.insert_many(
+                [
+                    DataObject(
+                        properties={"hash": _hash},
+                        uuid=generate_uuid5(_hash),
+                        vector=vector,
+                    )
+                    for _hash, vector in vectors.items()
+                ]
+            )
+            if response.has_errors:
+                msg.warn(f"Failed to cache embeddings in Weaviate: {response.errors}")
+
+    async def verify_semantic_cache_collection(
+        self, client: WeaviateAsyncClient, embedder: str
+    ):
+        if embedder not in self.semantic_cache_table:
+            self.semantic_cache_table[embedder] = self.semantic_cache_prefix + re.sub(
+                r"[^a-zA-Z0-9]", "_", embedder
+            )
+            await self.verify_collection(client, self.semantic_cache_table[embedder])
+        return True
+
+    async def retrieve_semantic_cache(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        vector: list[float],
+        config_key: str,
+        max_distance: float,
+        ttl: float,
+        filter_key: str = None,
+        context_key: str = None,
+    ) -> dict:
+        """Find the closest answered query within the distance threshold and TTL
+        @returns dict - Cached entry with its distance, or None
+        """
+        if await self.verify_semantic_cache_collection(client, embedder):
+            cache_collection = client.collections.get(
+                self.semantic_cache_table[embedder]
+            )
+            aggregation = await cache_collection.aggregate.over_all(total_count=True)
+            if aggregation.total_count == 0:
+                return None
+
+            filters = (
+                Filter.by_property("config_key").equal(config_key)
+                & Filter.by_property("answered").equal(True)
+                & Filter.by_property("created_at").greater_than(time.time() - ttl)
+            )
+            if filter_key is not None:
+                filters = filters & Filter.by_property("filter_key").equal(filter_key)
+            if context_key is not None:
+                filters = filters & Filter.by_property("context_key").equal(context_key)
+
+            response = await cache_collection.query.near_vector(
+                near_vector=vector,
+                limit=1,
+                distance=max_distance,
+                filters=filters,
+                return_metadata=MetadataQuery(distance=True),
+            )
+            if len(response.objects) == 0:
+                return None
+            entry = response.objects[0]
+            return {
+                **entry.properties,
+                "uuid": str(entry.uuid),
+                "distance": entry.metadata.distance,
+            }
+
+    async def add_to_semantic_cache(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        vector: list[float],
+        query: str,
+        context: str,
+        documents: list[dict],
+        config_key: str,
+        filter_key: str,
+        context_key: str,
+        ttl: float,
+    ):
+        """Store a retrieval as a pending cache entry, its answer is added once generated"""
+        if await self.verify_semantic_cache_collection(client, embedder):
+            cache_collection = client.collections.get(
+                self.semantic_cache_table[embedder]
+            )
+            # Drop expired entries while we are here
+            aggregation = await cache_collection.aggregate.over_all(total_count=True)
+            if aggregation.total_count > 0:
+                await cache_collection.data.delete_many(
+                    where=Filter.by_property("created_at").less_than(time.time() - ttl)
+                )
+            await cache_collection.data.insert(
+                properties={
+                    "query": query,
+                    "context": context,
+                    "documents": json.dumps(documents),
+                    "doc_uuids": [document["uuid"] for document in documents],
+                    "config_key": config_key,
+                    "filter_key": filter_key,
+                    "context_key": context_key,
+                    "answer": "",
+                    "answered": False,
+                    "created_at": time.time(),
+                },
+                vector=vector,
+            )
+
+    async def set_semantic_cache_answer(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        config_key: str,
+        context_key: str,
+        answer: str,
+    ):
+        """Attach the generated answer to the pending entries of the same context"""
+        if await self.verify_semantic_cache_collection(client, embedder):
+            cache_collection = client.collections.get(
+                self.semantic_cache_table[embedder]
+            )
+            aggregation = await cache_collection.aggregate.over_all(total_count=True)
+            if aggregation.total_count == 0:
+                return
+
+            response = await cache_collection.query.fetch_objects(
+                filters=Filter.by_property("config_key").equal(config_key)
+                & Filter.by_property("context_key").equal(context_key)
+                & Filter.by_property("answered").equal(False),
+                return_properties=[],
+            )
+            for entry in response.objects:
+                await cache_collection.data.update(
+                    uuid=entry.uuid,
+                    properties={"answer": answer, "answered": True},
+                )
+
+    async def delete_semantic_cache(self, client: WeaviateAsyncClient):
+        for collection_name in await client.collections.list_all():
+            if collection_name.startswith(self.semantic_cache_prefix):
+                await client.collections.delete(collection_name)
+        self.semantic_cache_table = {}
+
+    async def invalidate_semantic_cache(
+        self, client: WeaviateAsyncClient, doc_uuids: list[str]
+    ):
+        """Remove every cached answer that cited one of the documents"""
+        if len(doc_uuids) == 0:
+            return
+        for collection_name in await client.collections.list_all():
+            if collection_name.startswith(self.semantic_cache_prefix):
+                cache_collection = client.collections.get(collection_name)
+                aggregation = await cache_collection.aggregate.over_all(
+                    total_count=True
+                )
+                if aggregation.total_count == 0:
+                    continue
+                await cache_collection.data.delete_many(
+                    where=Filter.by_property("doc_uuids").contains_any(
+                        [str(uuid) for uuid in doc_uuids]
+                    )
+                )
 
     ### Metadata Retrieval
 
@@ -968,6 +1651,43 @@ class ReaderManager:
         except Exception as e:
             raise Exception(f"Reader {reader} failed with: {str(e)}")
 
+    async def stream(
+        self, reader: str, fileConfig: FileConfig, logger: LoggerManager
+    ) -> AsyncIterator[Document]:
+        """Yield documents of the reader as soon as they are loaded so they can be chunked and embedded right away"""
+        if reader not in self.readers:
+            raise Exception(f"{reader} Reader not found")
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        config = fileConfig.rag_config["Reader"].components[reader].config
+        reader_meta = fileConfig.rag_config["Reader"].components[reader].model_dump()
+        loaded = 0
+        try:
+            async for document in self.readers[reader].stream(config, fileConfig):
+                document.meta["Reader"] = reader_meta
+                loaded += 1
+                await logger.send_report(
+                    fileConfig.fileID,
+                    FileStatus.LOADING,
+                    f"Loaded {loaded} documents",
+                    took=round(loop.time() - start_time, 2),
+                )
+                yield document
+        except Exception as e:
+            raise Exception(f"Reader {reader} failed with: {str(e)}")
+
+        await logger.send_report(
+            fileConfig.fileID,
+            FileStatus.LOADING,
+            (
+                f"Loaded {fileConfig.filename}"
+                if loaded == 1
+                else f"Loaded {fileConfig.filename} with {loaded} documents"
+            ),
+            took=round(loop.time() - start_time, 2),
+        )
+
 
 class ChunkerManager:
     def __init__(self):
@@ -1030,10 +1750,26 @@ class ChunkerManager:
 
 
 class EmbeddingManager:
-    def __init__(self):
+    def __init__(self, weaviate_manager: WeaviateManager = None):
         self.embedders: dict[str, Embedding] = {
             embedder.name: embedder for embedder in embedders
         }
+        self.weaviate_manager = weaviate_manager
+        self.cache = EmbeddingCache()
+        self.scheduler = EmbeddingScheduler()
+        self.queue = EmbeddingQueue(self.scheduler)
+        self.query_cache = TTLCache(
+            max_size=int(os.getenv("VERBA_QUERY_CACHE_SIZE", 1024)),
+            ttl=float(os.getenv("VERBA_QUERY_CACHE_TTL", 3600)),
+        )
+
+    async def warm_up(self):
+        """Run the warm up hook of every embedder"""
+        for embedder in self.embedders.values():
+            try:
+                await embedder.warm_up()
+            except Exception as e:
+                msg.warn(f"Warm up of {embedder.name} failed: {str(e)}")
 
     async def vectorize(
         self,
@@ -1041,9 +1777,13 @@ class EmbeddingManager:
         fileConfig: FileConfig,
         documents: list[Document],
         logger: LoggerManager,
+        reusable_vectors: dict[str, list[float]] = None,
+        client=None,
     ) -> list[Document]:
         """Vectorizes chunks in batches
         @parameter: documents : Document - Verba document
+        @parameter: reusable_vectors : dict - Content hash to vector of already embedded chunks
+        @parameter: client : WeaviateAsyncClient - Enables the Weaviate tier of the embedding cache
         @returns Document - Document with vectorized chunks
         """
         try:
@@ -1051,13 +1791,29 @@ class EmbeddingManager:
             start_time = loop.time()
             if embedder in self.embedders:
                 config = fileConfig.rag_config["Embedder"].components[embedder].config
+                reusable_vectors = reusable_vectors or {}
+                reused = 0
 
                 for document in documents:
-                    content = [
-                        document.metadata + "\n" + chunk.content
+                    embeddings = [
+                        reusable_vectors.get(hash_content(chunk.content))
                         for chunk in document.chunks
                     ]
-                    embeddings = await self.batch_vectorize(embedder, config, content)
+                    missing = [
+                        i for i, vector in enumerate(embeddings) if vector is None
+                    ]
+                    reused += len(embeddings) - len(missing)
+
+                    if len(missing) > 0:
+                        content = [
+                            document.metadata + "\n" + document.chunks[i].content
+                            for i in missing
+                        ]
+                        new_embeddings = await self.batch_vectorize(
+                            embedder, config, content, client
+                        )
+                        for i, vector in zip(missing, new_embeddings):
+                            embeddings[i] = vector
 
                     if len(embeddings) >= 3:
                         pca = PCA(n_components=3)
@@ -1084,7 +1840,11 @@ class EmbeddingManager:
                 await logger.send_report(
                     fileConfig.fileID,
                     FileStatus.EMBEDDING,
-                    f"Vectorized all chunks",
+                    (
+                        f"Vectorized all chunks, reused {reused} unchanged chunks"
+                        if reused > 0
+                        else f"Vectorized all chunks"
+                    ),
                     took=elapsed_time,
                 )
                 await logger.send_report(
@@ -1096,39 +1856,92 @@ class EmbeddingManager:
         except Exception as e:
             raise e
 
+    def get_cache_model(self, embedder: str, config: dict) -> str:
+        if "Model" in config:
+            return f"{embedder}:{config['Model'].value}"
+        return embedder
+
     async def batch_vectorize(
-        self, embedder: str, config: dict, content: list[str]
+        self, embedder: str, config: dict, content: list[str], client=None
     ) -> list[list[float]]:
-        """Vectorize content in batches"""
+        """Vectorize content in batches, texts embedded before are served from the embedding cache"""
         try:
-            batches = [
-                content[i : i + self.embedders[embedder].max_batch_size]
-                for i in range(0, len(content), self.embedders[embedder].max_batch_size)
-            ]
-            msg.info(f"Vectorizing {len(content)} chunks in {len(batches)} batches")
-            tasks = [
-                self.embedders[embedder].vectorize(config, batch) for batch in batches
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            model = self.get_cache_model(embedder, config)
+            hashes = [hash_content(text) for text in content]
+            vectors = await asyncio.to_thread(self.cache.get_many, model, hashes)
+            local_hits = sum(1 for _hash in hashes if _hash in vectors)
+
+            # Unique texts that are not cached locally
+            texts = dict(zip(hashes, content))
+            missing = [_hash for _hash in texts if _hash not in vectors]
+
+            weaviate_hits = 0
+            if (
+                len(missing) > 0
+                and client is not None
+                and self.cache.weaviate_enabled
+                and self.weaviate_manager is not None
+            ):
+                try:
+                    cached = await self.weaviate_manager.get_cached_embeddings(
+                        client, model, missing
+                    )
+                    await asyncio.to_thread(self.cache.set_many, model, cached)
+                    vectors.update(cached)
+                    weaviate_hits = sum(1 for _hash in hashes if _hash in cached)
+                    missing = [_hash for _hash in missing if _hash not in cached]
+                except Exception as e:
+                    msg.warn(f"Failed to read the Weaviate embedding cache: {str(e)}")
+
+            self.cache.record(
+                local_hits, weaviate_hits, len(hashes) - local_hits - weaviate_hits
+            )
 
-            # Check if all tasks were successful
-            errors = [r for r in results if isinstance(r, Exception)]
-            if errors:
-                error_messages = [str(e) for e in errors]
-                raise Exception(
-                    f"Vectorization failed for some batches: {', '.join(error_messages)}"
-                )
+            content = [texts[_hash] for _hash in missing]
+            if len(content) == 0:
+                return [vectors[_hash] for _hash in hashes]
 
-            # Flatten the results
-            flattened_results = [item for sublist in results for item in sublist]
+            token_counts = await asyncio.to_thread(
+                count_tokens, content, self.embedders[embedder].tokenizer
+            )
+            msg.info(
+                f"Vectorizing {len(content)} chunks ({len(hashes) - len(content)} cached)"
+            )
+            # The queue packs chunks of concurrently imported documents into shared batches
+            results = await self.queue.vectorize(
+                self.embedders[embedder], config, content, token_counts
+            )
 
-            # Verify the number of vectors matches the input content
-            if len(flattened_results) != len(content):
+            # Keep the vectors of successful batches so a retried import only embeds the failed ones
+            new_vectors = {}
+            errors = []
+            for _hash, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    if str(result) not in errors:
+                        errors.append(str(result))
+                else:
+                    new_vectors[_hash] = result
+
+            vectors.update(new_vectors)
+            await asyncio.to_thread(self.cache.set_many, model, new_vectors)
+            if (
+                client is not None
+                and self.cache.weaviate_enabled
+                and self.weaviate_manager is not None
+            ):
+                try:
+                    await self.weaviate_manager.add_cached_embeddings(
+                        client, model, new_vectors
+                    )
+                except Exception as e:
+                    msg.warn(f"Failed to update the Weaviate embedding cache: {str(e)}")
+
+            if errors:
                 raise Exception(
-                    f"Mismatch in vectorization results: expected {len(content)} vectors, got {len(flattened_results)}"
+                    f"Vectorization failed for {len(missing) - len(new_vectors)} of {len(missing)} chunks: {', '.join(errors)}"
                 )
 
-            return flattened_results
+            return [vectors[_hash] for _hash in hashes]
         except Exception as e:
             raise Exception(f"Batch vectorization failed: {str(e)}")
 
@@ -1138,13 +1951,50 @@ class EmbeddingManager:
         try:
             if embedder in self.embedders:
                 config = rag_config["Embedder"].components[embedder].config
+                key = (
+                    embedder,
+                    self.get_cache_model(embedder, config),
+                    normalize_query(content),
+                )
+                vector = self.query_cache.get(key)
+                if vector is not None:
+                    return vector
                 embeddings = await self.embedders[embedder].vectorize(config, [content])
+                self.query_cache.set(key, embeddings[0])
                 return embeddings[0]
             else:
                 raise Exception(f"{embedder} Embedder not found")
         except Exception as e:
             raise e
 
+    async def warm_up_queries(
+        self, embedder: str, queries: list[str], rag_config: dict
+    ) -> int:
+        """Pre-embed queries into the query cache in batches
+        @returns int - Number of newly embedded queries
+        """
+        if embedder not in self.embedders:
+            raise Exception(f"{embedder} Embedder not found")
+
+        config = rag_config["Embedder"].components[embedder].config
+        model = self.get_cache_model(embedder, config)
+        missing = {}
+        for query in queries:
+            key = (embedder, model, normalize_query(query))
+            if not self.query_cache.contains(key) and key not in missing:
+                missing[key] = query
+
+        keys = list(missing.keys())
+        batch_size, _ = self.embedders[embedder].get_batch_limits(config)
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i : i + batch_size]
+            embeddings = await self.scheduler.vectorize(
+                self.embedders[embedder], config, [missing[key] for key in batch]
+            )
+            for key, vector in zip(batch, embeddings):
+                self.query_cache.set(key, vector)
+        return len(keys)
+
 
 class RetrieverManager:
     def __init__(self):
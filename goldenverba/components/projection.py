@@ -0,0 +1,87 @@
+import numpy as np
+from sklearn.decomposition import IncrementalPCA
+
+PROJECTION_BLOCK_SIZE = 1000
+
+
+class VectorProjection:
+    """
+    Incrementally fitted 3D PCA projection of an embedding collection.
+    It is fitted block by block and serialized into VERBA_CONFIG so the vector explorer never refits on request.
+    """
+
+    def __init__(self, n_components: int = 3):
+        self.n_components = n_components
+        self.pca = IncrementalPCA(n_components=n_components)
+        # Vectors waiting for a block large enough to fit (IncrementalPCA needs >= n_components rows)
+        self.pending: list[list[float]] = []
+
+    @property
+    def fitted(self) -> bool:
+        return hasattr(self.pca, "components_")
+
+    def partial_fit(self, vectors: list[list[float]]):
+        """Update the projection with a block of vectors"""
+        if len(vectors) == 0:
+            return
+
+        block = np.asarray(self.pending + list(vectors), dtype=np.float64)
+        if len(block) < self.n_components or block.shape[1] < self.n_components:
+            self.pending = block.tolist()
+            return
+
+        if self.fitted and block.shape[1] != self.pca.n_features_in_:
+            raise ValueError(
+                f"Vector dimensions changed from {self.pca.n_features_in_} to {block.shape[1]}"
+            )
+
+        self.pca.partial_fit(block)
+        self.pending = []
+
+    def transform(self, vectors: list[list[float]]) -> list[list[float]]:
+        """Project a block of vectors into 3D"""
+        if len(vectors) == 0:
+            return []
+        return self.pca.transform(np.asarray(vectors, dtype=np.float64)).tolist()
+
+    def to_json(self) -> dict:
+        data = {"n_components": self.n_components, "pending": self.pending}
+        if self.fitted:
+            data["state"] = {
+                "components": self.pca.components_.tolist(),
+                "singular_values": self.pca.singular_values_.tolist(),
+                "mean": self.pca.mean_.tolist(),
+                "var": self.pca.var_.tolist(),
+                "explained_variance": self.pca.explained_variance_.tolist(),
+                "explained_variance_ratio": self.pca.explained_variance_ratio_.tolist(),
+                "noise_variance": float(self.pca.noise_variance_),
+                "n_samples_seen": int(self.pca.n_samples_seen_),
+            }
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict):
+        projection = cls(n_components=data.get("n_components", 3))
+        projection.pending = data.get("pending", [])
+
+        state = data.get("state")
+        if state is not None:
+            pca = projection.pca
+            pca.components_ = np.asarray(state["components"], dtype=np.float64)
+            pca.singular_values_ = np.asarray(
+                state["singular_values"], dtype=np.float64
+            )
+            pca.mean_ = np.asarray(state["mean"], dtype=np.float64)
+            pca.var_ = np.asarray(state["var"], dtype=np.float64)
+            pca.explained_variance_ = np.asarray(
+                state["explained_variance"], dtype=np.float64
+            )
+            pca.explained_variance_ratio_ = np.asarray(
+                state["explained_variance_ratio"], dtype=np.float64
+            )
+            pca.noise_variance_ = state["noise_variance"]
+            pca.n_samples_seen_ = state["n_samples_seen"]
+            pca.n_components_ = pca.components_.shape[0]
+            pca.n_features_in_ = pca.components_.shape[1]
+
+        return projection
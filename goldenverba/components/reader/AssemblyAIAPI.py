@@ -1,5 +1,3 @@
-import base64
-import io
 import os
 
 import requests
@@ -109,7 +107,7 @@ class AssemblyAIReader(Reader):
         msg.info(f"Loading {fileConfig.filename}")
 
         file_data = aiohttp.FormData()
-        file_bytes = io.BytesIO(base64.b64decode(fileConfig.content))
+        file_bytes = fileConfig.open_content()
         file_data.add_field(
             "files",
             file_bytes,
@@ -1,6 +1,5 @@
-import base64
 import json
-import io
+from typing import BinaryIO
 
 from wasabi import msg
 
@@ -70,36 +69,28 @@ class BasicReader(Reader):
             ".hpp",
         ]  # Add supported text extensions
 
-        # Initialize spaCy model if available
-        self.nlp = spacy.blank("en") if spacy else None
-        if self.nlp:
-            self.nlp.add_pipe("sentencizer", config={"punct_chars": None})
-
     async def load(self, config: dict, fileConfig: FileConfig) -> list[Document]:
         """
         Load and process a file based on its extension.
         """
         msg.info(f"Loading {fileConfig.filename} ({fileConfig.extension.lower()})")
 
-        if fileConfig.extension != "":
-            decoded_bytes = base64.b64decode(fileConfig.content)
-
         try:
             if fileConfig.extension == "":
                 file_content = fileConfig.content
             elif fileConfig.extension.lower() == "json":
-                return await self.load_json_file(decoded_bytes, fileConfig)
+                return await self.load_json_file(fileConfig.read_content(), fileConfig)
             elif fileConfig.extension.lower() == "pdf":
-                file_content = await self.load_pdf_file(decoded_bytes)
+                file_content = await self.load_pdf_file(fileConfig.open_content())
             elif fileConfig.extension.lower() == "docx":
-                file_content = await self.load_docx_file(decoded_bytes)
+                file_content = await self.load_docx_file(fileConfig.open_content())
             elif fileConfig.extension.lower() in [
                 ext.lstrip(".") for ext in self.extension
             ]:
-                file_content = await self.load_text_file(decoded_bytes)
+                file_content = await self.load_text_file(fileConfig.read_content())
             else:
                 try:
-                    file_content = await self.load_text_file(decoded_bytes)
+                    file_content = await self.load_text_file(fileConfig.read_content())
                 except Exception as e:
                     raise ValueError(
                         f"Unsupported file extension: {fileConfig.extension}"
@@ -110,21 +101,21 @@ class BasicReader(Reader):
             msg.fail(f"Failed to load {fileConfig.filename}: {str(e)}")
             raise
 
-    async def load_text_file(self, decoded_bytes: bytes) -> str:
+    async def load_text_file(self, decoded_bytes: bytes | memoryview) -> str:
         """Load and decode a text file."""
         try:
-            return decoded_bytes.decode("utf-8")
+            return str(decoded_bytes, "utf-8")
         except UnicodeDecodeError:
             # Fallback to latin-1 if UTF-8 fails
-            return decoded_bytes.decode("latin-1")
+            return str(decoded_bytes, "latin-1")
 
     async def load_json_file(
-        self, decoded_bytes: bytes, fileConfig: FileConfig
+        self, decoded_bytes: bytes | memoryview, fileConfig: FileConfig
     ) -> list[Document]:
         """Load and parse a JSON file."""
         try:
-            json_obj = json.loads(decoded_bytes.decode("utf-8"))
-            document = Document.from_json(json_obj, self.nlp)
+            json_obj = json.loads(str(decoded_bytes, "utf-8"))
+            document = Document.from_json(json_obj)
             return (
                 [document]
                 if document
@@ -133,20 +124,18 @@ class BasicReader(Reader):
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {fileConfig.filename}: {str(e)}")
 
-    async def load_pdf_file(self, decoded_bytes: bytes) -> str:
+    async def load_pdf_file(self, pdf_file: BinaryIO) -> str:
         """Load and extract text from a PDF file."""
         if not PdfReader:
             raise ImportError("pypdf is not installed. Cannot process PDF files.")
-        pdf_bytes = io.BytesIO(decoded_bytes)
-        reader = PdfReader(pdf_bytes)
+        reader = PdfReader(pdf_file)
         return "\n\n".join(page.extract_text() for page in reader.pages)
 
-    async def load_docx_file(self, decoded_bytes: bytes) -> str:
+    async def load_docx_file(self, docx_file: BinaryIO) -> str:
         """Load and extract text from a DOCX file."""
         if not docx:
             raise ImportError(
                 "python-docx is not installed. Cannot process DOCX files."
             )
-        docx_bytes = io.BytesIO(decoded_bytes)
-        reader = docx.Document(docx_bytes)
+        reader = docx.Document(docx_file)
         return "\n".join(paragraph.text for paragraph in reader.paragraphs)
@@ -1,7 +1,12 @@
 import aiohttp
 import os
+import time
 import urllib
 import base64
+import asyncio
+import tarfile
+import tempfile
+from typing import AsyncIterator, Iterator
 
 from wasabi import msg
 
@@ -10,6 +15,8 @@ from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
 from goldenverba.components.reader.BasicReader import BasicReader
 from goldenverba.components.util import get_environment
+from goldenverba.components.http_pool import http_pool
+from goldenverba.components.scheduler import TokenBucket, get_retry_after
 
 from goldenverba.components.types import InputConfig
 
@@ -26,6 +33,12 @@ class GitReader(Reader):
         self.description = (
             "Downloads and ingests all files from a GitHub or GitLab Repo."
         )
+        self.concurrency = int(os.getenv("VERBA_GIT_CONCURRENCY", 8))
+        self.requests_per_minute = float(
+            os.getenv("VERBA_GIT_REQUESTS_PER_MINUTE", 300)
+        )
+        self.max_retries = 3
+        self.max_rate_limit_wait = 300
         self.config = {
             "Platform": InputConfig(
                 type="dropdown",
@@ -57,6 +70,12 @@ class GitReader(Reader):
                 description="Enter the path or leave it empty to import all",
                 values=[],
             ),
+            "Download Archive": InputConfig(
+                type="bool",
+                value=True,
+                description="Download the branch as a single archive instead of file by file",
+                values=[],
+            ),
         }
 
         if os.getenv("GITHUB_TOKEN") is None and os.getenv("GITLAB_TOKEN") is None:
@@ -68,62 +87,85 @@ class GitReader(Reader):
             )
 
     async def load(self, config: dict, fileConfig: FileConfig) -> list[Document]:
-        documents = []
+        return [document async for document in self.stream(config, fileConfig)]
+
+    async def stream(
+        self, config: dict, fileConfig: FileConfig
+    ) -> AsyncIterator[Document]:
         platform = config["Platform"].value
         token = self.get_token(config, platform)
+        owner = config["Owner"].value
+        name = config["Name"].value
+        branch = config["Branch"].value
+        path = config["Path"].value
 
         reader = BasicReader()
+        limiter = TokenBucket(self.requests_per_minute)
+
+        use_archive = config.get("Download Archive")
+        if use_archive is None or use_archive.value:
+            loaded = 0
+            try:
+                async for _file, content, link, size in self.stream_archive(
+                    platform, owner, name, branch, path, token, reader
+                ):
+                    loaded += 1
+                    yield await self.load_file(
+                        reader, config, fileConfig, _file, content, link, size
+                    )
+                return
+            except Exception as e:
+                # Only fall back if nothing was imported yet, otherwise files would be imported twice
+                if loaded > 0:
+                    raise Exception(f"Couldn't extract archive: {str(e)}")
+                msg.warn(f"Archive download failed, downloading file by file: {str(e)}")
 
         if platform == "GitHub":
-            owner = config["Owner"].value
-            name = config["Name"].value
-            branch = config["Branch"].value
-            path = config["Path"].value
             fetch_url = f"https://api.github.com/repos/{owner}/{name}/git/trees/{branch}?recursive=1"
-            docs = await self.fetch_docs_github(fetch_url, path, token, reader)
+            docs = await self.fetch_docs_github(fetch_url, path, token, reader, limiter)
         else:  # GitLab
-            owner = config["Owner"].value
-            name = config["Name"].value
             project_id = urllib.parse.quote(f"{owner}/{name}", safe="")
-            branch = config["Branch"].value
-            path = config["Path"].value
-            fetch_url = f"https://gitlab.com/api/v4/projects/{project_id}/repository/tree?ref={branch}&path={path}&per_page=100"
-            docs = await self.fetch_docs_gitlab(fetch_url, token, reader)
+            fetch_url = f"https://gitlab.com/api/v4/projects/{project_id}/repository/tree?ref={branch}&path={urllib.parse.quote(path, safe='')}&recursive=true&per_page=100"
+            docs = await self.fetch_docs_gitlab(fetch_url, token, reader, limiter)
 
         msg.info(f"Fetched {len(docs)} document paths from {fetch_url}")
 
-        for _file in docs:
-            try:
-                if platform == "GitHub":
-                    content, link, size, extension = await self.download_file_github(
-                        owner, name, _file, branch, token
-                    )
-                else:
-                    content, link, size, extension = await self.download_file_gitlab(
-                        owner, name, _file, branch, token
-                    )
-
-                if content:
-                    new_file_config = FileConfig(
-                        fileID=fileConfig.fileID,
-                        filename=_file,
-                        isURL=False,
-                        overwrite=fileConfig.overwrite,
-                        extension=extension,
-                        source=link,
-                        content=content,
-                        labels=fileConfig.labels,
-                        rag_config=fileConfig.rag_config,
-                        file_size=size,
-                        status=fileConfig.status,
-                        status_report=fileConfig.status_report,
-                    )
-                    document = await reader.load(config, new_file_config)
-                    documents.append(document[0])
-            except Exception as e:
-                raise Exception(f"Couldn't load retrieve {_file}: {str(e)}")
+        async for _file, content, link, size in self.download_files(
+            platform, owner, name, branch, token, docs, limiter
+        ):
+            yield await self.load_file(
+                reader, config, fileConfig, _file, content, link, size
+            )
 
-        return documents
+    async def load_file(
+        self,
+        reader: BasicReader,
+        config: dict,
+        fileConfig: FileConfig,
+        _file: str,
+        content: str,
+        link: str,
+        size: int,
+    ) -> Document:
+        try:
+            new_file_config = FileConfig(
+                fileID=fileConfig.fileID,
+                filename=_file,
+                isURL=False,
+                overwrite=fileConfig.overwrite,
+                extension=os.path.splitext(_file)[1][1:],
+                source=link,
+                content=content,
+                labels=fileConfig.labels,
+                rag_config=fileConfig.rag_config,
+                file_size=size,
+                status=fileConfig.status,
+                status_report=fileConfig.status_report,
+            )
+            document = await reader.load(config, new_file_config)
+            return document[0]
+        except Exception as e:
+            raise Exception(f"Couldn't load retrieve {_file}: {str(e)}")
 
     def get_token(self, config: dict, platform: str) -> str:
         env_var = "GITHUB_TOKEN" if platform == "GitHub" else "GITLAB_TOKEN"
@@ -131,73 +173,220 @@ class GitReader(Reader):
             config, "Git Token", env_var, f"No {platform} Token detected"
         )
 
+    def is_included(self, path: str, folder: str, reader: Reader) -> bool:
+        return path.startswith(folder) and any(
+            path.endswith(ext) for ext in reader.extension
+        )
+
+    async def request(
+        self,
+        url: str,
+        headers: dict,
+        limiter: TokenBucket,
+        as_json: bool = True,
+    ) -> tuple[dict | list | bytes, dict]:
+        """GET through the shared session, waiting for the rate limit and retrying once the API allows it again
+        @returns tuple - Response body and headers
+        """
+        session = http_pool.get_session()
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire(1)
+            async with session.get(url, headers=headers) as response:
+                rate_limited = response.status == 429 or (
+                    response.status == 403
+                    and response.headers.get("X-RateLimit-Remaining") == "0"
+                )
+                if rate_limited and attempt < self.max_retries:
+                    delay = get_retry_after(response.headers)
+                    if delay is None and "X-RateLimit-Reset" in response.headers:
+                        delay = (
+                            float(response.headers["X-RateLimit-Reset"]) - time.time()
+                        )
+                    delay = max(1.0, delay if delay is not None else 2**attempt)
+                    if delay > self.max_rate_limit_wait:
+                        raise Exception(
+                            f"Rate limit of {url} resets in {delay:.0f}s, try again later or use a token"
+                        )
+                    msg.warn(f"Rate limited by {url}, retrying in {delay:.0f}s")
+                elif response.status != 200:
+                    raise Exception(
+                        f"Failed to download {url}: {response.status} {await response.text()}"
+                    )
+                else:
+                    body = await (response.json() if as_json else response.read())
+                    return body, response.headers
+            await asyncio.sleep(delay)
+
     async def fetch_docs_github(
-        self, url: str, folder: str, token: str, reader: Reader
+        self,
+        url: str,
+        folder: str,
+        token: str,
+        reader: Reader,
+        limiter: TokenBucket,
     ) -> list[str]:
         headers = self.get_headers(token, "GitHub")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [
-                    item["path"]
-                    for item in data["tree"]
-                    if item["path"].startswith(folder)
-                    and any(item["path"].endswith(ext) for ext in reader.extension)
-                ]
-
-    async def fetch_docs_gitlab(self, url: str, token: str, reader: Reader) -> list:
+        data, _ = await self.request(url, headers, limiter)
+        if data.get("truncated"):
+            msg.warn(f"GitHub truncated the file tree of {url}, some files are missing")
+        return [
+            item["path"]
+            for item in data["tree"]
+            if item["type"] == "blob" and self.is_included(item["path"], folder, reader)
+        ]
+
+    async def fetch_docs_gitlab(
+        self, url: str, token: str, reader: Reader, limiter: TokenBucket
+    ) -> list:
+        """Follow the pagination of the GitLab tree endpoint"""
         headers = self.get_headers(token, "GitLab")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [
-                    item["path"]
-                    for item in data
-                    if item["type"] == "blob"
-                    and any(item["path"].endswith(ext) for ext in reader.extension)
-                ]
+        paths = []
+        page = "1"
+        while page:
+            data, response_headers = await self.request(
+                f"{url}&page={page}", headers, limiter
+            )
+            paths.extend(
+                item["path"]
+                for item in data
+                if item["type"] == "blob" and self.is_included(item["path"], "", reader)
+            )
+            page = response_headers.get("X-Next-Page")
+        return paths
+
+    async def download_files(
+        self,
+        platform: str,
+        owner: str,
+        name: str,
+        branch: str,
+        token: str,
+        files: list[str],
+        limiter: TokenBucket,
+    ) -> AsyncIterator[tuple[str, str, str, int]]:
+        """Download files concurrently and yield them in completion order.
+        At most self.concurrency downloads run ahead of the consumer.
+        """
+        files = iter(files)
+        pending = set()
+        try:
+            while True:
+                for _file in files:
+                    if platform == "GitHub":
+                        download = self.download_file_github(
+                            owner, name, _file, branch, token, limiter
+                        )
+                    else:
+                        download = self.download_file_gitlab(
+                            owner, name, _file, branch, token, limiter
+                        )
+                    pending.add(asyncio.create_task(download))
+                    if len(pending) >= self.concurrency:
+                        break
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    _file, content, link, size = task.result()
+                    if content:
+                        yield _file, content, link, size
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def download_file_github(
-        self, owner: str, name: str, path: str, branch: str, token: str
-    ) -> tuple[str, str, int, str]:
-        url = (
-            f"https://api.github.com/repos/{owner}/{name}/contents/{path}?ref={branch}"
-        )
+        self,
+        owner: str,
+        name: str,
+        path: str,
+        branch: str,
+        token: str,
+        limiter: TokenBucket,
+    ) -> tuple[str, str, str, int]:
+        url = f"https://api.github.com/repos/{owner}/{name}/contents/{urllib.parse.quote(path)}?ref={branch}"
         headers = self.get_headers(token, "GitHub")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                content_b64 = data["content"]
-                link = data["html_url"]
-                size = data["size"]
-                extension = os.path.splitext(path)[1][1:]
-                return content_b64, link, size, extension
+        try:
+            data, _ = await self.request(url, headers, limiter)
+        except Exception as e:
+            raise Exception(f"Couldn't load retrieve {path}: {str(e)}")
+        return path, data["content"], data["html_url"], data["size"]
 
     async def download_file_gitlab(
-        self, owner: str, name: str, file_path: str, branch: str, token: str
-    ) -> tuple[str, str, int, str]:
+        self,
+        owner: str,
+        name: str,
+        file_path: str,
+        branch: str,
+        token: str,
+        limiter: TokenBucket,
+    ) -> tuple[str, str, str, int]:
         project_id = urllib.parse.quote(f"{owner}/{name}", safe="")
         url = f"https://gitlab.com/api/v4/projects/{project_id}/repository/files/{urllib.parse.quote(file_path, safe='')}/raw?ref={branch}"
         headers = {"PRIVATE-TOKEN": token}
+        try:
+            content, _ = await self.request(url, headers, limiter, as_json=False)
+        except Exception as e:
+            raise Exception(f"Couldn't load retrieve {file_path}: {str(e)}")
+        content_b64 = base64.b64encode(content).decode("utf-8")
+        link = f"https://gitlab.com/{owner}/{name}/-/blob/{branch}/{file_path}"
+        return file_path, content_b64, link, len(content)
+
+    async def stream_archive(
+        self,
+        platform: str,
+        owner: str,
+        name: str,
+        branch: str,
+        folder: str,
+        token: str,
+        reader: Reader,
+    ) -> AsyncIterator[tuple[str, str, str, int]]:
+        """Download the branch as one tarball and yield the matching files while reading through the archive"""
+        if platform == "GitHub":
+            url = f"https://api.github.com/repos/{owner}/{name}/tarball/{urllib.parse.quote(branch)}"
+            headers = self.get_headers(token, "GitHub")
+            link = f"https://github.com/{owner}/{name}/blob/{branch}/"
+        else:
+            project_id = urllib.parse.quote(f"{owner}/{name}", safe="")
+            url = f"https://gitlab.com/api/v4/projects/{project_id}/repository/archive.tar.gz?sha={urllib.parse.quote(branch)}"
+            if folder:
+                url += f"&path={urllib.parse.quote(folder)}"
+            headers = {"PRIVATE-TOKEN": token}
+            link = f"https://gitlab.com/{owner}/{name}/-/blob/{branch}/"
 
-        async with aiohttp.ClientSession() as session:
+        # The archive is spooled to disk and read member by member, only one file is held in memory
+        with tempfile.TemporaryFile() as archive:
+            session = http_pool.get_session()
             async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    content_b64 = base64.b64encode(content).decode("utf-8")
-                    size = len(content)
-                    extension = os.path.splitext(file_path)[1][1:]
-                    link = (
-                        f"https://gitlab.com/{owner}/{name}/-/blob/{branch}/{file_path}"
-                    )
-                    return content_b64, link, size, extension
-                else:
+                if response.status != 200:
                     raise Exception(
-                        f"Failed to download file: {response.status} {await response.text()}"
+                        f"Failed to download {url}: {response.status} {await response.text()}"
                     )
+                async for data in response.content.iter_chunked(1024 * 1024):
+                    await asyncio.to_thread(archive.write, data)
+            await asyncio.to_thread(archive.seek, 0)
+
+            members = self.read_archive(archive, folder, reader)
+            while (member := await asyncio.to_thread(next, members, None)) is not None:
+                path, content = member
+                yield path, base64.b64encode(content).decode("utf-8"), link + path, len(
+                    content
+                )
+
+    def read_archive(
+        self, archive, folder: str, reader: Reader
+    ) -> Iterator[tuple[str, bytes]]:
+        with tarfile.open(fileobj=archive, mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Archives wrap the repository in a "<repo>-<sha>/" directory
+                path = member.name.split("/", 1)[-1]
+                if self.is_included(path, folder, reader):
+                    yield path, tar.extractfile(member).read()
 
     def get_headers(self, token: str, platform: str) -> dict:
         if platform == "GitHub":
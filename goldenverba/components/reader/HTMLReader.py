@@ -1,6 +1,6 @@
 import base64
-import aiohttp
-from typing import Tuple, List
+import asyncio
+from typing import AsyncIterator, Tuple, List
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
@@ -11,6 +11,9 @@ from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
 from goldenverba.components.reader.BasicReader import BasicReader
 from goldenverba.components.types import InputConfig
+from goldenverba.components.cache import PageCache
+from goldenverba.components.crawler import Crawler
+from goldenverba.components.http_pool import http_pool
 
 try:
     from markdownify import markdownify as md
@@ -21,7 +24,7 @@ except ImportError:
 class HTMLReader(Reader):
     """
     The HTMLReader downloads HTML content from URLs and ingests it into Weaviate.
-    It can optionally fetch linked pages recursively.
+    It can optionally crawl linked pages breadth-first, see Crawler.
     """
 
     def __init__(self):
@@ -57,126 +60,104 @@ class HTMLReader(Reader):
                 description="Maximum depth for recursive fetching",
                 values=[],
             ),
+            "Respect Robots": InputConfig(
+                type="bool",
+                value=True,
+                description="Skip pages disallowed by robots.txt and honour its crawl delay",
+                values=[],
+            ),
+            "Use Sitemap": InputConfig(
+                type="bool",
+                value=False,
+                description="Also crawl the pages listed in the site's sitemap",
+                values=[],
+            ),
         }
+        # Created on the first crawl, readers are instantiated when the module is imported
+        self.page_cache: PageCache = None
 
     async def load(self, config: dict, fileConfig: FileConfig) -> list[Document]:
+        return [document async for document in self.stream(config, fileConfig)]
+
+    async def stream(
+        self, config: dict, fileConfig: FileConfig
+    ) -> AsyncIterator[Document]:
         reader = BasicReader()
         urls = config["URLs"].values
         to_markdown = config["Convert To Markdown"].value
         recursive = config["Recursive"].value
         max_depth = int(config["Max Depth"].value)
-
-        documents = []
-        processed_urls = set()
-
-        async with aiohttp.ClientSession() as session:
-            for url in urls:
-                try:
-                    await self.process_url(
-                        url,
-                        to_markdown,
-                        recursive,
-                        max_depth,
-                        0,
-                        session,
-                        reader,
-                        fileConfig,
-                        documents,
-                        processed_urls,
-                    )
-                except Exception as e:
-                    msg.warn(f"Failed to process URL {url}: {str(e)}")
-
-        return documents
+        respect_robots = config.get("Respect Robots")
+        use_sitemap = config.get("Use Sitemap")
+        if self.page_cache is None:
+            self.page_cache = PageCache()
+
+        crawler = Crawler(
+            http_pool.get_session(),
+            max_depth=max_depth if recursive else 0,
+            link_extractor=self.extract_links,
+            respect_robots=respect_robots is None or respect_robots.value,
+            use_sitemap=use_sitemap is not None and use_sitemap.value,
+            page_cache=self.page_cache,
+        )
+        async for url, _html in crawler.crawl(urls):
+            try:
+                documents = await self.process_url(
+                    url, _html, to_markdown, reader, fileConfig
+                )
+            except Exception as e:
+                msg.warn(f"Failed to process URL {url}: {str(e)}")
+                continue
+            for document in documents:
+                yield document
 
     async def process_url(
         self,
         url: str,
+        html_content: str,
         to_markdown: bool,
-        recursive: bool,
-        max_depth: int,
-        current_depth: int,
-        session: aiohttp.ClientSession,
         reader: BasicReader,
         fileConfig: FileConfig,
-        documents: List[Document],
-        processed_urls: set,
-    ):
-        if url in processed_urls or current_depth > max_depth:
-            return
-
-        processed_urls.add(url)
-
-        try:
-            content, size, _html = await self.fetch_html_and_convert(
-                session, url, to_markdown
-            )
-            new_file_config = FileConfig(
-                fileID=fileConfig.fileID,
-                filename=url,
-                isURL=False,
-                overwrite=fileConfig.overwrite,
-                extension="md" if to_markdown else "html",
-                source=url,
-                content=content,
-                labels=fileConfig.labels,
-                rag_config=fileConfig.rag_config,
-                file_size=size,
-                status=fileConfig.status,
-                status_report=fileConfig.status_report,
-                metadata=fileConfig.metadata,
-            )
-            document = await reader.load(self.config, new_file_config)
-            documents.extend(document)
-
-            if recursive and current_depth < max_depth:
-                linked_urls = self.extract_links(_html, url)
-                for linked_url in linked_urls:
-                    await self.process_url(
-                        linked_url,
-                        to_markdown,
-                        recursive,
-                        max_depth,
-                        current_depth + 1,
-                        session,
-                        reader,
-                        fileConfig,
-                        documents,
-                        processed_urls,
-                    )
-        except Exception as e:
-            msg.warn(f"Failed to process URL {url}: {str(e)}")
+    ) -> List[Document]:
+        content, size = await asyncio.to_thread(
+            self.convert_html, html_content, to_markdown
+        )
+        new_file_config = FileConfig(
+            fileID=fileConfig.fileID,
+            filename=url,
+            isURL=False,
+            overwrite=fileConfig.overwrite,
+            extension="md" if to_markdown else "html",
+            source=url,
+            content=content,
+            labels=fileConfig.labels,
+            rag_config=fileConfig.rag_config,
+            file_size=size,
+            status=fileConfig.status,
+            status_report=fileConfig.status_report,
+            metadata=fileConfig.metadata,
+        )
+        return await reader.load(self.config, new_file_config)
 
-    async def fetch_html_and_convert(
-        self, session: aiohttp.ClientSession, url: str, to_markdown: bool
-    ) -> Tuple[str, int, str]:
+    def convert_html(self, html_content: str, to_markdown: bool) -> Tuple[str, int]:
         """
-        Fetches the HTML content of the given URL and optionally converts it to Markdown.
+        Optionally converts fetched HTML to Markdown.
 
-        :param session: The aiohttp ClientSession to use for the request.
-        :param url: The URL of the web page to fetch.
+        :param html_content: The HTML content of the page.
         :param to_markdown: Whether to convert the HTML to Markdown.
         :return: A tuple containing the base64-encoded content and its size.
         """
-        try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html_content = await response.text()
-
-            if to_markdown:
-                if md is None:
-                    raise ImportError("markdownify is required for Markdown conversion")
-                content = md(html_content).encode("utf-8")
-            else:
-                content = html_content.encode("utf-8")
-
-            base64_content = base64.b64encode(content).decode("utf-8")
-            return base64_content, len(content), html_content
-
-        except aiohttp.ClientError as e:
-            raise Exception(f"Failed to fetch HTML content from URL: {str(e)}")
-        except ImportError as e:
-            raise Exception(f"Markdown conversion failed: {str(e)}")
+        if to_markdown:
+            if md is None:
+                raise Exception(
+                    "Markdown conversion failed: markdownify is required for Markdown conversion"
+                )
+            content = md(html_content).encode("utf-8")
+        else:
+            content = html_content.encode("utf-8")
+
+        base64_content = base64.b64encode(content).decode("utf-8")
+        return base64_content, len(content)
 
     def extract_links(self, html_content: str, base_url: str) -> List[str]:
         """
@@ -1,3 +1,5 @@
+import asyncio
+
 from goldenverba.components.interfaces import Retriever
 from goldenverba.components.types import InputConfig
 
@@ -79,14 +81,17 @@ class WindowRetriever(Retriever):
         if len(chunks) == 0:
             return ([], "We couldn't find any chunks to the query")
 
+        # Fetch title and metadata of all hit documents at once
+        documents_by_uuid = await weaviate_manager.get_documents_by_uuids(
+            client, list({str(chunk.properties["doc_uuid"]) for chunk in chunks})
+        )
+
         # Group Chunks by document and sum score
         doc_map = {}
         scores = [0]
         for chunk in chunks:
             if chunk.properties["doc_uuid"] not in doc_map:
-                document = await weaviate_manager.get_document(
-                    client, chunk.properties["doc_uuid"]
-                )
+                document = documents_by_uuid.get(str(chunk.properties["doc_uuid"]))
                 if document is None:
                     continue
                 doc_map[chunk.properties["doc_uuid"]] = {
@@ -118,8 +123,7 @@ class WindowRetriever(Retriever):
             # Create a range of values around the given value, excluding the original value
             return [i for i in range(value - window, value + window + 1) if i != value]
 
-        documents = []
-        context_documents = []
+        window_chunk_ids = {}
         for doc in doc_map:
             additional_chunk_ids = []
             for chunk in doc_map[doc]["chunks"]:
@@ -130,26 +134,38 @@ class WindowRetriever(Retriever):
                         chunk["chunk_id"], window
                     )
             unique_chunk_ids = set(additional_chunk_ids)
-
             if len(unique_chunk_ids) > 0:
-                additional_chunks = await weaviate_manager.get_chunk_by_ids(
-                    client, embedder, doc, unique_chunk_ids
-                )
-                existing_chunk_ids = set(
-                    chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
-                )
-                for chunk in additional_chunks:
-                    if chunk.properties["chunk_id"] not in existing_chunk_ids:
-                        doc_map[doc]["chunks"].append(
-                            {
-                                "uuid": str(chunk.uuid),
-                                "score": 0,
-                                "chunk_id": chunk.properties["chunk_id"],
-                                "content": chunk.properties["content"],
-                            }
-                        )
-                        existing_chunk_ids.add(chunk.properties["chunk_id"])
+                window_chunk_ids[doc] = list(unique_chunk_ids)
 
+        # Expand the windows of all documents concurrently
+        additional_chunks_per_doc = await asyncio.gather(
+            *[
+                weaviate_manager.get_chunk_by_ids(client, embedder, doc, chunk_ids)
+                for doc, chunk_ids in window_chunk_ids.items()
+            ]
+        )
+
+        for doc, additional_chunks in zip(
+            window_chunk_ids.keys(), additional_chunks_per_doc
+        ):
+            existing_chunk_ids = set(
+                chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
+            )
+            for chunk in additional_chunks:
+                if chunk.properties["chunk_id"] not in existing_chunk_ids:
+                    doc_map[doc]["chunks"].append(
+                        {
+                            "uuid": str(chunk.uuid),
+                            "score": 0,
+                            "chunk_id": chunk.properties["chunk_id"],
+                            "content": chunk.properties["content"],
+                        }
+                    )
+                    existing_chunk_ids.add(chunk.properties["chunk_id"])
+
+        documents = []
+        context_documents = []
+        for doc in doc_map:
             _chunks = [
                 {
                     "uuid": str(chunk["uuid"]),
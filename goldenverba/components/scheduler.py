@@ -0,0 +1,362 @@
+import os
+import json
+import time
+import random
+import asyncio
+from functools import lru_cache
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+from wasabi import msg
+
+from goldenverba.components.interfaces import Embedding
+
+# Statuses worth retrying, everything else fails the batch immediately
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class RateLimitError(Exception):
+    """Raised by embedders when the provider rejects a request with HTTP 429"""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def get_retry_after(headers) -> float | None:
+    """Parse a Retry-After header given either in seconds or as HTTP date"""
+    if headers is None:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def get_retry(e: Exception) -> tuple[bool, float | None]:
+    """Return whether an embedding error is transient and how long the provider asked us to wait"""
+    while e is not None:
+        if isinstance(e, RateLimitError):
+            return True, e.retry_after
+        if isinstance(e, aiohttp.ClientResponseError):
+            return e.status in RETRYABLE_STATUS, get_retry_after(e.headers)
+        if isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+            return True, None
+        # Embedders wrap client errors, follow the chain to the original one
+        e = e.__cause__
+    return False, None
+
+
+@lru_cache(maxsize=None)
+def get_encoding(tokenizer: str):
+    """Load a tiktoken encoding once, None if tiktoken or the encoding file is unavailable"""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(tokenizer)
+    except Exception as e:
+        msg.warn(
+            f"Tokenizer {tokenizer} unavailable, estimating tokens from characters: {str(e)}"
+        )
+        return None
+
+
+def count_tokens(content: list[str], tokenizer: str | None = None) -> list[int]:
+    """Token count per text, falls back to roughly four characters per token"""
+    encoding = get_encoding(tokenizer) if tokenizer else None
+    if encoding is None:
+        return [len(text) // 4 + 1 for text in content]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(content)]
+
+
+def pack_batches(
+    token_counts: list[int], max_items: int, max_tokens: int | None = None
+) -> list[list[int]]:
+    """Greedily group text indices into batches of at most max_items texts and max_tokens tokens.
+    A text larger than max_tokens is sent on its own.
+    """
+    batches = []
+    batch = []
+    batch_tokens = 0
+    for i, tokens in enumerate(token_counts):
+        if batch and (
+            len(batch) >= max_items
+            or (max_tokens is not None and batch_tokens + tokens > max_tokens)
+        ):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class TokenBucket:
+    """Refills capacity units per minute, acquire waits until enough units are available"""
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.rate = capacity / 60
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        # Requests larger than the bucket would wait forever, let them drain it instead
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            self.refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= amount
+
+    def drain(self):
+        self.tokens = 0
+        self.updated = time.monotonic()
+
+
+class ProviderLimiter:
+    """Request and token buckets plus an in-flight limit for one embedding provider"""
+
+    def __init__(
+        self,
+        requests_per_minute: float | None,
+        tokens_per_minute: float | None,
+        max_concurrency: int,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.blocked_until = 0.0
+
+    async def acquire(self, tokens: int):
+        # A Retry-After pauses every batch of the provider, not only the rejected one
+        while (delay := self.blocked_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            await self.tokens.acquire(tokens)
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        # The provider says we are over quota, start refilling from zero
+        if self.requests is not None:
+            self.requests.drain()
+        if self.tokens is not None:
+            self.tokens.drain()
+
+
+class EmbeddingScheduler:
+    """
+    Schedules embedding requests per provider.
+    Batches wait for rate limit budget and a free in-flight slot, transient failures are retried with exponential backoff.
+    """
+
+    def __init__(self):
+        self.max_retries = int(os.getenv("VERBA_EMBEDDING_MAX_RETRIES", 5))
+        self.backoff = float(os.getenv("VERBA_EMBEDDING_BACKOFF", 1))
+        self.max_backoff = float(os.getenv("VERBA_EMBEDDING_MAX_BACKOFF", 60))
+        self.limiters: dict[str, ProviderLimiter] = {}
+
+    def get_limiter(self, embedder: Embedding) -> ProviderLimiter:
+        """Limits default to the embedder's own and can be overwritten per provider, e.g. OPENAI_EMBEDDING_RPM"""
+        if embedder.name not in self.limiters:
+            prefix = embedder.name.upper().replace(" ", "_")
+            rpm = os.getenv(f"{prefix}_EMBEDDING_RPM", embedder.requests_per_minute)
+            tpm = os.getenv(f"{prefix}_EMBEDDING_TPM", embedder.tokens_per_minute)
+            concurrency = os.getenv(
+                f"{prefix}_EMBEDDING_CONCURRENCY", embedder.max_concurrency
+            )
+            self.limiters[embedder.name] = ProviderLimiter(
+                float(rpm) if rpm else None,
+                float(tpm) if tpm else None,
+                int(concurrency),
+            )
+        return self.limiters[embedder.name]
+
+    def get_backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent batches from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    async def vectorize(
+        self,
+        embedder: Embedding,
+        config: dict,
+        batch: list[str],
+        tokens: int | None = None,
+    ) -> list[list[float]]:
+        """Embed a single batch, retrying transient failures of this batch only
+        @parameter: tokens : int - Token count of the batch, counted with the embedder's tokenizer if not given
+        """
+        limiter = self.get_limiter(embedder)
+        if tokens is None:
+            tokens = sum(count_tokens(batch, embedder.tokenizer))
+        attempt = 0
+        while True:
+            async with limiter.semaphore:
+                await limiter.acquire(tokens)
+                try:
+                    return await embedder.vectorize(config, batch)
+                except Exception as e:
+                    retryable, retry_after = get_retry(e)
+                    if not retryable or attempt >= self.max_retries:
+                        raise
+                    error = str(e)
+
+            if retry_after is not None:
+                limiter.block(retry_after)
+                delay = retry_after
+            else:
+                delay = self.get_backoff(attempt)
+            attempt += 1
+            msg.warn(
+                f"{embedder.name} batch failed ({error}), retry {attempt}/{self.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+class PendingTexts:
+    """Texts waiting in the EmbeddingQueue for one embedder and configuration"""
+
+    def __init__(self, embedder: Embedding, config: dict):
+        self.embedder = embedder
+        self.config = config
+        # text -> (token count, future), identical texts share one future
+        self.texts: dict[str, tuple[int, asyncio.Future]] = {}
+        self.tokens = 0
+        self.timer: asyncio.TimerHandle = None
+
+
+class EmbeddingQueue:
+    """
+    Coalesces texts of concurrently imported documents into full provider batches.
+    Full batches are sent right away, the remainder waits up to the batch window for more texts.
+    """
+
+    def __init__(self, scheduler: EmbeddingScheduler, window: float = None):
+        self.scheduler = scheduler
+        self.window = (
+            window
+            if window is not None
+            else float(os.getenv("VERBA_EMBEDDING_BATCH_WINDOW", 0.05))
+        )
+        self.pending: dict[str, PendingTexts] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    def get_key(self, embedder: Embedding, config: dict) -> str:
+        return json.dumps(
+            [embedder.name, {key: setting.value for key, setting in config.items()}],
+            sort_keys=True,
+            default=str,
+        )
+
+    async def vectorize(
+        self,
+        embedder: Embedding,
+        config: dict,
+        content: list[str],
+        token_counts: list[int],
+    ) -> list[list[float] | Exception]:
+        """Queue texts for embedding and wait for their vectors
+        @returns list - Vector per text, or the exception of the batch it was sent in
+        """
+        loop = asyncio.get_running_loop()
+        key = self.get_key(embedder, config)
+        if key not in self.pending:
+            self.pending[key] = PendingTexts(embedder, config)
+        pending = self.pending[key]
+
+        futures = []
+        for text, tokens in zip(content, token_counts):
+            if text not in pending.texts:
+                pending.texts[text] = (tokens, loop.create_future())
+                pending.tokens += tokens
+            futures.append(pending.texts[text][1])
+
+        max_items, max_tokens = embedder.get_batch_limits(config)
+        if len(pending.texts) >= max_items or (
+            max_tokens is not None and pending.tokens >= max_tokens
+        ):
+            self.flush(key, full_only=True)
+        if key in self.pending and self.pending[key].timer is None:
+            self.pending[key].timer = loop.call_later(self.window, self.flush, key)
+
+        # Shield the shared futures, a cancelled document must not cancel texts of other documents
+        return await asyncio.gather(
+            *[asyncio.shield(future) for future in futures], return_exceptions=True
+        )
+
+    def flush(self, key: str, full_only: bool = False):
+        """Send the pending texts of a queue in packed batches
+        @parameter: full_only : bool - Keep a trailing partial batch queued for more texts
+        """
+        pending = self.pending.get(key)
+        if pending is None:
+            return
+
+        texts = list(pending.texts.items())
+        max_items, max_tokens = pending.embedder.get_batch_limits(pending.config)
+        batches = pack_batches(
+            [tokens for _, (tokens, _) in texts], max_items, max_tokens
+        )
+        if full_only and batches:
+            last_tokens = sum(texts[i][1][0] for i in batches[-1])
+            if len(batches[-1]) < max_items and (
+                max_tokens is None or last_tokens < max_tokens
+            ):
+                batches = batches[:-1]
+
+        for batch in batches:
+            items = [texts[i] for i in batch]
+            for text, (tokens, _) in items:
+                del pending.texts[text]
+                pending.tokens -= tokens
+            task = asyncio.create_task(self.send(pending, items))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        if len(pending.texts) == 0:
+            if pending.timer is not None:
+                pending.timer.cancel()
+            del self.pending[key]
+
+    async def send(
+        self, pending: PendingTexts, items: list[tuple[str, tuple[int, asyncio.Future]]]
+    ):
+        futures = [future for _, (_, future) in items]
+        try:
+            vectors = await self.scheduler.vectorize(
+                pending.embedder,
+                pending.config,
+                [text for text, _ in items],
+                sum(tokens for _, (tokens, _) in items),
+            )
+            if len(vectors) != len(items):
+                raise Exception(
+                    f"Mismatch in vectorization results: expected {len(items)} vectors, got {len(vectors)}"
+                )
+            for future, vector in zip(futures, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
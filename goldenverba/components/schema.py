@@ -0,0 +1,158 @@
+import os
+from datetime import datetime
+from uuid import UUID
+
+from weaviate.classes.config import Configure, DataType, Property, Tokenization
+
+DOCUMENT_COLLECTION = "VERBA_DOCUMENTS"
+CONFIG_COLLECTION = "VERBA_CONFIG"
+SUGGESTION_COLLECTION = "VERBA_SUGGESTION"
+EMBEDDING_PREFIX = "VERBA_Embedding_"
+
+
+def searchable(name: str) -> Property:
+    # BM25 fields, only content, title and query are searchable
+    return Property(
+        name=name,
+        data_type=DataType.TEXT,
+        tokenization=Tokenization.WORD,
+        index_filterable=True,
+        index_searchable=True,
+    )
+
+
+def keyword(name: str, data_type: DataType = DataType.TEXT) -> Property:
+    # Exact match filters and sorting, never part of BM25
+    return Property(
+        name=name,
+        data_type=data_type,
+        tokenization=Tokenization.FIELD,
+        index_filterable=True,
+        index_searchable=False,
+    )
+
+
+def stored(name: str, data_type: DataType = DataType.TEXT) -> Property:
+    # Returned but never filtered, searched or sorted on
+    return Property(
+        name=name,
+        data_type=data_type,
+        index_filterable=False,
+        index_searchable=False if data_type == DataType.TEXT else None,
+        index_range_filters=False,
+    )
+
+
+def integer(name: str, range_filters: bool = False) -> Property:
+    return Property(
+        name=name,
+        data_type=DataType.INT,
+        index_filterable=True,
+        index_range_filters=range_filters,
+    )
+
+
+DOCUMENT_PROPERTIES = [
+    searchable("title"),
+    searchable("content"),
+    keyword("extension"),
+    integer("fileSize"),
+    keyword("labels", DataType.TEXT_ARRAY),
+    keyword("source"),
+    stored("meta"),
+    stored("metadata"),
+    keyword("embedder"),
+    keyword("embedding_collection"),
+]
+
+CHUNK_PROPERTIES = [
+    searchable("content"),
+    searchable("title"),
+    stored("content_without_overlap"),
+    integer("chunk_id", range_filters=True),
+    Property(name="doc_uuid", data_type=DataType.UUID, index_filterable=True),
+    stored("pca", DataType.NUMBER_ARRAY),
+    stored("start_i", DataType.INT),
+    stored("end_i", DataType.INT),
+    keyword("labels", DataType.TEXT_ARRAY),
+]
+
+CONFIG_PROPERTIES = [stored("config")]
+
+SUGGESTION_PROPERTIES = [
+    searchable("query"),
+    # ISO timestamps sort chronologically as text and are returned unchanged to the frontend
+    keyword("timestamp"),
+    integer("count"),
+]
+
+
+def get_vector_index_config():
+    """HNSW settings of the embedding collections, tunable through VERBA_HNSW_* and VERBA_VECTOR_QUANTIZATION (none, pq, bq, sq)"""
+    quantization = os.getenv("VERBA_VECTOR_QUANTIZATION", "none").lower()
+    quantizers = {
+        "none": lambda: None,
+        "pq": Configure.VectorIndex.Quantizer.pq,
+        "bq": Configure.VectorIndex.Quantizer.bq,
+        "sq": Configure.VectorIndex.Quantizer.sq,
+    }
+    if quantization not in quantizers:
+        raise Exception(
+            f"Unknown vector quantization {quantization}, use one of {', '.join(quantizers)}"
+        )
+
+    def get_int(key: str) -> int | None:
+        value = os.getenv(key)
+        return int(value) if value else None
+
+    return Configure.VectorIndex.hnsw(
+        ef=get_int("VERBA_HNSW_EF"),
+        ef_construction=get_int("VERBA_HNSW_EF_CONSTRUCTION"),
+        max_connections=get_int("VERBA_HNSW_MAX_CONNECTIONS"),
+        quantizer=quantizers[quantization](),
+    )
+
+
+def get_collection_config(collection_name: str) -> dict | None:
+    """Arguments for collections.create of a Verba collection, None for collections left to auto schema (caches)"""
+    if collection_name == DOCUMENT_COLLECTION:
+        properties = DOCUMENT_PROPERTIES
+    elif collection_name == CONFIG_COLLECTION:
+        properties = CONFIG_PROPERTIES
+    elif collection_name == SUGGESTION_COLLECTION:
+        properties = SUGGESTION_PROPERTIES
+    elif collection_name.startswith(EMBEDDING_PREFIX):
+        return {
+            "properties": CHUNK_PROPERTIES,
+            "vectorizer_config": Configure.Vectorizer.none(),
+            "vector_index_config": get_vector_index_config(),
+        }
+    else:
+        return None
+    # Nothing in these collections is vectorized, a flat index costs nothing
+    return {
+        "properties": properties,
+        "vectorizer_config": Configure.Vectorizer.none(),
+        "vector_index_config": Configure.VectorIndex.flat(),
+    }
+
+
+def coerce_properties(properties: dict, schema: list[Property]) -> dict:
+    """Convert auto schema values (e.g. integers stored as float, UUIDs stored as text) to the explicit schema types"""
+    types = {prop.name: prop.dataType for prop in schema}
+    coerced = {}
+    for key, value in properties.items():
+        data_type = types.get(key)
+        if value is None or data_type is None:
+            coerced[key] = value
+        elif data_type == DataType.INT:
+            coerced[key] = int(value)
+        elif data_type == DataType.UUID:
+            coerced[key] = str(UUID(str(value)))
+        elif data_type == DataType.TEXT and isinstance(value, datetime):
+            coerced[key] = value.isoformat()
+        elif data_type == DataType.TEXT and not isinstance(value, str):
+            coerced[key] = str(value)
+        else:
+            coerced[key] = value
+    return coerced
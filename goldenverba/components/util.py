@@ -1,5 +1,6 @@
 import numpy as np
 import os
+import hashlib
 
 # Step 1: Standardize the data
 def standardize_data(X):
@@ -58,4 +59,15 @@ def get_environment(config, value: str, env: str, error_msg: str) -> str:
 def get_token(env: str, default: str = None) -> str:
     # return token, but treat empty string als None
     token = tok if bool(tok := os.getenv(env, None)) else default
-    return token
\ No newline at end of file
+    return token
+
+
+def get_cache_dir(*parts: str) -> str:
+    # Local directory for Verba's persistent caches and manifests
+    path = os.path.join(os.getenv("VERBA_CACHE_DIR", "./.verba"), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -0,0 +1,106 @@
+import os
+import asyncio
+from typing import AsyncIterable, Awaitable, Callable, Iterable
+
+from goldenverba.components.document import Document
+
+
+class ImportExecutor:
+    """
+    Bounded worker pool for document imports shared by all running imports.
+    A document is only admitted when a slot is free and its estimated memory fits the budget,
+    documents are pulled from the source one at a time so readers can yield them incrementally.
+    """
+
+    def __init__(self, max_documents: int = None, max_memory_mb: float = None):
+        self.max_documents = max(
+            1,
+            (
+                max_documents
+                if max_documents is not None
+                else int(os.getenv("VERBA_IMPORT_CONCURRENCY", 8))
+            ),
+        )
+        self.max_memory = int(
+            (
+                max_memory_mb
+                if max_memory_mb is not None
+                else float(os.getenv("VERBA_IMPORT_MEMORY_MB", 1024))
+            )
+            * 1024
+            * 1024
+        )
+        # Chunks, spaCy docs and vectors take a multiple of the raw text size
+        self.memory_factor = int(os.getenv("VERBA_IMPORT_MEMORY_FACTOR", 20))
+        self.in_flight = 0
+        self.reserved = 0
+        self.condition: asyncio.Condition = None
+
+    def estimate_memory(self, document: Document) -> int:
+        return (len(document.content) + len(document.metadata)) * self.memory_factor
+
+    def can_admit(self, size: int) -> bool:
+        # A single document larger than the budget is admitted once nothing else runs
+        if self.in_flight == 0:
+            return True
+        return (
+            self.in_flight < self.max_documents
+            and self.reserved + size <= self.max_memory
+        )
+
+    async def admit(self, size: int):
+        if self.condition is None:
+            self.condition = asyncio.Condition()
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.can_admit(size))
+            self.in_flight += 1
+            self.reserved += size
+
+    async def release(self, size: int):
+        async with self.condition:
+            self.in_flight -= 1
+            self.reserved -= size
+            self.condition.notify_all()
+
+    async def run(
+        self,
+        documents: Iterable[Document] | AsyncIterable[Document],
+        process: Callable[[Document], Awaitable],
+    ) -> list:
+        """Process documents in the pool and wait for all of them
+        @parameter: documents : Iterable | AsyncIterable - Documents, consumed only as fast as they are admitted
+        @parameter: process : Callable - Coroutine function importing a single document
+        @returns list - Result or exception per document
+        """
+        results = []
+        tasks = set()
+
+        async def worker(index: int, document: Document, size: int):
+            try:
+                results[index] = await process(document)
+            except Exception as e:
+                results[index] = e
+            finally:
+                await self.release(size)
+
+        async def submit(document: Document):
+            size = self.estimate_memory(document)
+            await self.admit(size)
+            results.append(None)
+            task = asyncio.create_task(worker(len(results) - 1, document, size))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            if hasattr(documents, "__aiter__"):
+                async for document in documents:
+                    await submit(document)
+            else:
+                for document in documents:
+                    await submit(document)
+        except Exception as e:
+            results.append(e)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return results
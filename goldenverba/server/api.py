@@ -4,8 +4,14 @@ from fastapi.responses import FileResponse, JSONResponse
 from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 import asyncio
+import json
 
-from goldenverba.server.helpers import LoggerManager, BatchManager
+from goldenverba.server.helpers import (
+    LoggerManager,
+    BatchManager,
+    UploadManager,
+    UploadStore,
+)
 from weaviate.client import WeaviateAsyncClient
 
 import os
@@ -16,10 +22,8 @@ from starlette.websockets import WebSocketDisconnect
 from wasabi import msg  # type: ignore[import]
 
 from goldenverba import verba_manager
-
-from goldenverba.server.types import FileConfig, FileStatus
-import base64
-
+from goldenverba.sync_manager import SyncManager, SyncManifest
+from goldenverba.components.http_pool import http_pool
 
 # Define the supported extensions
 SUPPORTED_EXTENSIONS = {"docx", "pdf", "xlsx", "pptx", "json"}
@@ -30,6 +34,7 @@ from goldenverba.server.types import (
     GeneratePayload,
     Credentials,
     GetDocumentPayload,
+    DeleteDocumentsPayload,
     ConnectPayload,
     DatacountPayload,
     GetSuggestionsPayload,
@@ -43,6 +48,9 @@ from goldenverba.server.types import (
     GetChunkPayload,
     GetVectorPayload,
     DataBatchPayload,
+    UploadHeaderPayload,
+    UploadOffsetPayload,
+    UploadStatusPayload,
     ChunksPayload,
 )
 
@@ -63,13 +71,22 @@ manager = verba_manager.VerbaManager()
 
 client_manager = verba_manager.ClientManager()
 
+# The manifest is opened in the lifespan, importing the module has no side effects
+sync_manager = SyncManager(manager)
+
+upload_store = UploadStore()
+
 ### Lifespan
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await manager.embedder_manager.warm_up()
+    sync_manager.manifest = SyncManifest()
     yield
+    sync_manager.manifest.close()
     await client_manager.disconnect()
+    await http_pool.close()
 
 
 # FastAPI App
@@ -164,91 +181,68 @@ async def health_check():
     )
 
 
-@app.get("/api/sync_drive_from_folder_files_only")
-async def sync_drive_from_folder_files_only():
-    try:
-        # Get the folder path from environment variable
-        # folder_path = os.getenv("SYNC_DRIVE_FOLDER_PATH","C:/organizations/peter/google-drive-service/test_rag")
-        folder_path = "C:/organizations/peter/google-drive-service/test_rag"
-        if not folder_path:
-            raise HTTPException(status_code=400, detail="SYNC_DRIVE_FOLDER_PATH environment variable is not set.")
+def describe_drive_file(file_path: str) -> tuple[str, str, str]:
+    """Drive exports are named <filename>.<fileID>.<extension>"""
+    full_file_name_split = os.path.basename(file_path).split(".")
+    extension = full_file_name_split.pop()
+    fileID = full_file_name_split.pop()
+    filename = ".".join(full_file_name_split)
+    return fileID, filename, extension
 
-        # Use pathlib for cross-platform compatibility
-        folder = Path(folder_path)
 
-        if not folder.exists() or not folder.is_dir():
-            raise HTTPException(status_code=400, detail="The provided folder path does not exist or is not a directory.")
+def describe_file(file_path: str) -> tuple[str, str, str]:
+    fileID = os.path.basename(file_path)
+    extension = os.path.splitext(fileID)[1][1:]  # Get file extension without dot
+    return fileID, fileID, extension
 
-        # List all files in the folder and its subdirectories
-        file_paths = [
-            str(file) for file in folder.rglob("*")  # rglob() is used to recursively list files
-            if file.suffix[1:].lower() in SUPPORTED_EXTENSIONS  # Check file extension without the leading dot
-        ]
 
-        if not file_paths:
-            return {"message": "No supported files found in the folder."}
+def list_supported_files(folder_path: str) -> list[str]:
+    # Use pathlib for cross-platform compatibility
+    folder = Path(folder_path)
 
-        # Get credentials (you might need to adjust this based on your environment)
-        credentials = Credentials(
-            deployment='Custom',
-            url="localhost",
-            key=''
+    if not folder.exists() or not folder.is_dir():
+        raise HTTPException(
+            status_code=400,
+            detail="The provided folder path does not exist or is not a directory.",
         )
 
-        # Connect to the Weaviate client
-        client = await client_manager.connect(credentials)
+    # List all files in the folder and its subdirectories
+    return [
+        str(file)
+        for file in folder.rglob("*")
+        if file.suffix[1:].lower() in SUPPORTED_EXTENSIONS
+    ]
 
-        # Dummy logger for reporting (since websockets are not used)
-        class DummyLogger:
-            async def send_report(self, *args, **kwargs):
-                pass
 
-            async def create_new_document(self, *args, **kwargs):
-                pass
+async def connect_sync_client() -> WeaviateAsyncClient:
+    credentials = Credentials(deployment="Custom", url="localhost", key="")
+    return await client_manager.connect(credentials)
 
-        logger = DummyLogger()
 
-        # Process each file in the filtered list
-        print(f"Nuber of files {len(file_paths)}")
-        for file_path in file_paths:
-            # Extract file information
-            full_file_name = os.path.basename(file_path)
-            full_file_name_split = full_file_name.split('.') # original file ID (e.g., the unique identifier part)
-            extension = full_file_name_split.pop()  # Get the file extension without the leading dot
-            fileID = full_file_name_split.pop()
-            new_filename = ".".join(full_file_name_split) # Get the file name without the extension
-
-            # Read the file
-            with open(file_path, "rb") as f:
-                file_bytes = f.read()
-
-            # Encode the content to base64
-            encoded_content = base64.b64encode(file_bytes).decode('utf-8')
-            print(f"file ID: {fileID}")
-            print(f"filename: {new_filename}")
-            print(f"extension: {extension}")
-            # Create a FileConfig object with the new filename
-            fileConfig = FileConfig(
-                fileID=fileID,
-                filename=new_filename,  # Use the newly formatted filename
-                isURL=False,
-                overwrite=False,
-                extension=extension,
-                source='',
-                content=encoded_content,
-                labels=['Document'],
-                rag_config=manager.create_config(),  # Get default RAG config
-                file_size=len(file_bytes),
-                status=FileStatus.READY,
-                metadata='',
-                status_report={}
+@app.get("/api/sync_drive_from_folder_files_only")
+async def sync_drive_from_folder_files_only():
+    try:
+        # Get the folder path from environment variable
+        # folder_path = os.getenv("SYNC_DRIVE_FOLDER_PATH","C:/organizations/peter/google-drive-service/test_rag")
+        folder_path = "C:/organizations/peter/google-drive-service/test_rag"
+        if not folder_path:
+            raise HTTPException(
+                status_code=400,
+                detail="SYNC_DRIVE_FOLDER_PATH environment variable is not set.",
             )
 
-            # Call import_document for each file
-            await manager.import_document(client, fileConfig, logger)
+        file_paths = list_supported_files(folder_path)
+        if not file_paths:
+            return {"message": "No supported files found in the folder."}
+
+        client = await connect_sync_client()
+        msg.info(f"Number of files {len(file_paths)}")
+        report = await sync_manager.sync(client, file_paths, describe_drive_file)
 
-        return {"message": "Sync completed successfully"}
+        return {"message": "Sync completed successfully", "report": report}
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
@@ -260,83 +254,26 @@ async def sync_drive_from_folder():
         folder_path = os.getenv("SYNC_DRIVE_FOLDER_PATH")
 
         if not folder_path:
-            raise HTTPException(status_code=400, detail="SYNC_DRIVE_FOLDER_PATH environment variable is not set.")
-
-        # Use pathlib for cross-platform compatibility
-        folder = Path(folder_path)
-
-        if not folder.exists() or not folder.is_dir():
-            raise HTTPException(status_code=400, detail="The provided folder path does not exist or is not a directory.")
-
-        # List all files in the folder and its subdirectories
-        file_paths = [
-            str(file) for file in folder.rglob("*")  # rglob() is used to recursively list files
-            if file.suffix[1:].lower() in SUPPORTED_EXTENSIONS  # Check file extension without the leading dot
-        ]
+            raise HTTPException(
+                status_code=400,
+                detail="SYNC_DRIVE_FOLDER_PATH environment variable is not set.",
+            )
 
+        file_paths = list_supported_files(folder_path)
         if not file_paths:
             return {"message": "No supported files found in the folder."}
 
-        # Get credentials (you might need to adjust this based on your environment)
-        credentials = Credentials(
-            deployment='Custom',
-            url="localhost",
-            key=''
-        )
-
-        # Connect to the Weaviate client
-        client = await client_manager.connect(credentials)
-
-        # Since LoggerManager expects a websocket, and we're not using websockets here,
-        # we can create a dummy logger that does nothing
-        class DummyLogger:
-            async def send_report(self, *args, **kwargs):
-                pass
-
-            async def create_new_document(self, *args, **kwargs):
-                pass
+        client = await connect_sync_client()
+        report = await sync_manager.sync(client, file_paths, describe_file)
 
-        logger = DummyLogger()
-
-        # Process each file in the filtered list
-        for file_path in file_paths:
-            # Extract file information
-            fileID = os.path.basename(file_path)
-            filename = fileID
-            extension = os.path.splitext(fileID)[1][1:]  # Get file extension without dot
-
-            # Read the file
-            with open(file_path, "rb") as f:
-                file_bytes = f.read()
-
-            # Encode the content to base64
-            encoded_content = base64.b64encode(file_bytes).decode('utf-8')
-
-            # Create a FileConfig object
-            fileConfig = FileConfig(
-                fileID=fileID,
-                filename=filename,
-                isURL=False,
-                overwrite=False,
-                extension=extension,
-                source='',
-                content=encoded_content,
-                labels=['Document'],
-                rag_config=manager.create_config(),  # Get default RAG config
-                file_size=len(file_bytes),
-                status=FileStatus.READY,
-                metadata='',
-                status_report={}
-            )
-
-            # Call import_document for each file
-            await manager.import_document(client, fileConfig, logger)
-
-        return {"message": "Sync completed successfully"}
+        return {"message": "Sync completed successfully", "report": report}
 
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
+
 @app.post("/api/sync_drive")
 async def sync_drive(request: Request):
     try:
@@ -346,77 +283,23 @@ async def sync_drive(request: Request):
 
         if not file_paths:
             return JSONResponse(
-                content={"message": "No file paths provided."},
-                status_code=400
+                content={"message": "No file paths provided."}, status_code=400
             )
 
-        # Get credentials (you might need to adjust this based on your environment)
-        credentials = Credentials(
-            deployment='Custom',
-            url="localhost",
-            key=''
-        )
-
-        # Connect to the Weaviate client
-        client = await client_manager.connect(credentials)
-
-        # Since LoggerManager expects a websocket, and we're not using websockets here,
-        # we can create a dummy logger that does nothing
-        class DummyLogger:
-            async def send_report(self, *args, **kwargs):
-                pass
-
-            async def create_new_document(self, *args, **kwargs):
-                pass
-
-        logger = DummyLogger()
-
+        existing_file_paths = []
         for file_path in file_paths:
-            # Check if the file exists
-            print(f"file_path {file_path}")
             if not os.path.exists(file_path):
-                print(f"Skipping non existing path: {file_path}")
-                continue  # Skip the file if it doesn't exist
-
-            # Extract file information
-            print(f"file_path {file_path}")
-            fileID = os.path.basename(file_path)
-            filename = fileID
-            extension = os.path.splitext(fileID)[1][1:]  # Get file extension without dot
-            print(f"fileID: {fileID}")
-            print(f"filename: {filename}")
-            print(f"extension: {extension}")
-
-            # Read the file
-            with open(file_path, "rb") as f:
-                file_bytes = f.read()
-
-            # Encode the content to base64
-            encoded_content = base64.b64encode(file_bytes).decode('utf-8')
-
-            # Create a FileConfig object
-            fileConfig = FileConfig(
-                fileID=fileID,
-                filename=filename,
-                isURL=False,
-                overwrite=False,
-                extension=extension,
-                source='',
-                content=encoded_content,
-                labels=['Document'],
-                rag_config=manager.create_config(),  # Get default RAG config
-                file_size=len(file_bytes),
-                status=FileStatus.READY,
-                metadata='',
-                status_report={}
-            )
+                msg.warn(f"Skipping non existing path: {file_path}")
+                continue
+            existing_file_paths.append(file_path)
 
-            # Call import_document for each file
-            await manager.import_document(client, fileConfig, logger)
+        client = await connect_sync_client()
+        report = await sync_manager.sync(client, existing_file_paths, describe_file)
 
         return JSONResponse(
             content={
                 "message": "Sync completed successfully",
+                "report": report,
             }
         )
 
@@ -425,9 +308,10 @@ async def sync_drive(request: Request):
             content={
                 "message": f"An error occurred: {str(e)}",
             },
-            status_code=500
+            status_code=500,
         )
 
+
 @app.post("/api/connect")
 async def connect_to_verba(payload: ConnectPayload):
     try:
@@ -438,6 +322,7 @@ async def connect_to_verba(payload: ConnectPayload):
             config = await manager.load_rag_config(client)
             user_config = await manager.load_user_config(client)
             theme, themes = await manager.load_theme_config(client)
+            asyncio.create_task(manager.warm_up_query_cache(client))
             return JSONResponse(
                 status_code=200,
                 content={
@@ -481,12 +366,18 @@ async def websocket_generate_stream(websocket: WebSocket):
 
             msg.good(f"Received generate stream call for {payload.query}")
 
+            # Credentials are optional, without them the semantic cache is skipped
+            client = None
+            if payload.credentials is not None:
+                client = await client_manager.connect(payload.credentials)
+
             full_text = ""
             async for chunk in manager.generate_stream_answer(
                 payload.rag_config,
                 payload.query,
                 payload.context,
                 payload.conversation,
+                client,
             ):
                 full_text += chunk["message"]
                 if chunk["finish_reason"] == "stop":
@@ -514,23 +405,53 @@ async def websocket_import_files(websocket: WebSocket):
     await websocket.accept()
     logger = LoggerManager(websocket)
     batcher = BatchManager()
+    uploader = UploadManager(upload_store)
 
     while True:
         try:
-            data = await websocket.receive_text()
-            batch_data = DataBatchPayload.model_validate_json(data)
-            fileConfig = batcher.add_batch(batch_data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            # Binary protocol: a JSON header frame followed by raw byte frames
+            if message.get("bytes") is not None:
+                credentials = uploader.credentials
+                fileConfig = uploader.add_bytes(message["bytes"])
+            else:
+                data = json.loads(message["text"])
+                if "fileConfig" in data:
+                    # Reply with the received ranges so clients only send what is missing
+                    upload = uploader.start(UploadHeaderPayload.model_validate(data))
+                    await websocket.send_json(upload.status())
+                    credentials = uploader.credentials
+                    fileConfig = uploader.check_upload()
+                elif "offset" in data:
+                    uploader.seek(UploadOffsetPayload.model_validate(data))
+                    fileConfig = None
+                elif "uploadID" in data:
+                    status = UploadStatusPayload.model_validate(data)
+                    await client_manager.connect(status.credentials)
+                    upload = upload_store.get(status.uploadID)
+                    await websocket.send_json(
+                        upload.status()
+                        if upload is not None
+                        else {"uploadID": status.uploadID, "error": "Unknown upload"}
+                    )
+                    fileConfig = None
+                else:
+                    batch_data = DataBatchPayload.model_validate(data)
+                    credentials = batch_data.credentials
+                    fileConfig = batcher.add_batch(batch_data)
+
             if fileConfig is not None:
-                client = await client_manager.connect(batch_data.credentials)
-                print("Hello !!!")
-                # print(f"In websocket_import_files..........")
-                # print(f"client : {client}")
-                # print(f"fileConfig : {fileConfig}")
-                # print(f"logger : {logger}")
-                # print(f"batch_data : {batch_data.chunk}")
-                await asyncio.create_task(
-                    manager.import_document(client, fileConfig, logger)
-                )
+                client = await client_manager.connect(credentials)
+                try:
+                    await asyncio.create_task(
+                        manager.import_document(client, fileConfig, logger)
+                    )
+                finally:
+                    if fileConfig._upload is not None:
+                        upload_store.remove(fileConfig._upload)
 
         except WebSocketDisconnect:
             msg.warn("Import WebSocket connection closed by client.")
@@ -539,6 +460,92 @@ async def websocket_import_files(websocket: WebSocket):
             msg.fail(f"Import WebSocket Error: {str(e)}")
             break
 
+    uploader.close()
+
+
+# Received byte ranges of a binary upload, used by clients to resume after a disconnect
+@app.post("/api/get_upload_status")
+async def get_upload_status(payload: UploadStatusPayload):
+    if production == "Demo":
+        return JSONResponse(
+            status_code=403,
+            content={
+                "uploadID": payload.uploadID,
+                "error": "Uploads are disabled in Demo Mode",
+            },
+        )
+
+    try:
+        await client_manager.connect(payload.credentials)
+    except Exception as e:
+        msg.warn(f"Failed to authenticate upload status request: {str(e)}")
+        return JSONResponse(
+            status_code=401,
+            content={"uploadID": payload.uploadID, "error": str(e)},
+        )
+
+    upload = upload_store.get(payload.uploadID)
+    if upload is None:
+        return JSONResponse(
+            status_code=404,
+            content={"uploadID": payload.uploadID, "error": "Unknown upload"},
+        )
+    return JSONResponse(status_code=200, content={**upload.status(), "error": ""})
+
+
+@app.websocket("/ws/delete_documents")
+async def websocket_delete_documents(websocket: WebSocket):
+
+    if production == "Demo":
+        return
+
+    await websocket.accept()
+
+    while True:
+        try:
+            data = await websocket.receive_text()
+            payload = DeleteDocumentsPayload.model_validate_json(data)
+            client = await client_manager.connect(payload.credentials)
+
+            # Every deleted page is reported, the last message has finished set
+            async def send_progress(deleted: int, total: int):
+                await websocket.send_json(
+                    {"deleted": deleted, "total": total, "finished": False, "error": ""}
+                )
+
+            try:
+                deleted = await manager.weaviate_manager.delete_documents(
+                    client,
+                    uuids=payload.uuids,
+                    labels=payload.labels,
+                    progress=send_progress,
+                )
+                await websocket.send_json(
+                    {
+                        "deleted": deleted,
+                        "total": deleted,
+                        "finished": True,
+                        "error": "",
+                    }
+                )
+            except Exception as e:
+                msg.fail(f"Bulk deleting documents failed: {str(e)}")
+                await websocket.send_json(
+                    {
+                        "deleted": 0,
+                        "total": 0,
+                        "finished": True,
+                        "error": f"Bulk delete failed: {str(e)}",
+                    }
+                )
+
+        except WebSocketDisconnect:
+            msg.warn("Delete WebSocket connection closed by client.")
+            break
+        except Exception as e:
+            msg.fail(f"Delete WebSocket Error: {str(e)}")
+            break
+
 
 ### CONFIG ENDPOINTS
 
@@ -954,6 +961,28 @@ async def delete_document(payload: GetDocumentPayload):
         return JSONResponse(status_code=400, content={})
 
 
+# Delete documents by UUID list or label in bulk, /ws/delete_documents reports progress while deleting
+@app.post("/api/delete_documents")
+async def delete_documents(payload: DeleteDocumentsPayload):
+    if production == "Demo":
+        msg.warn("Can't delete documents when in Production Mode")
+        return JSONResponse(status_code=200, content={"deleted": 0, "error": ""})
+
+    try:
+        client = await client_manager.connect(payload.credentials)
+        deleted = await manager.weaviate_manager.delete_documents(
+            client, uuids=payload.uuids, labels=payload.labels
+        )
+        return JSONResponse(status_code=200, content={"deleted": deleted, "error": ""})
+
+    except Exception as e:
+        msg.fail(f"Bulk deleting documents failed: {str(e)}")
+        return JSONResponse(
+            status_code=400,
+            content={"deleted": 0, "error": f"Bulk delete failed: {str(e)}"},
+        )
+
+
 ### ADMIN
 
 
@@ -990,11 +1019,19 @@ async def get_meta(payload: Credentials):
         node_payload, collection_payload = await manager.weaviate_manager.get_metadata(
             client
         )
+        embedding_cache_stats = await asyncio.to_thread(
+            manager.embedder_manager.cache.get_stats
+        )
         return JSONResponse(
             content={
                 "error": "",
                 "node_payload": node_payload,
                 "collection_payload": collection_payload,
+                "cache_payload": {
+                    **embedding_cache_stats,
+                    "query_cache": manager.embedder_manager.query_cache.get_stats(),
+                    "semantic_cache": manager.semantic_cache.get_stats(),
+                },
             }
         )
     except Exception as e:
@@ -1003,6 +1040,7 @@ async def get_meta(payload: Credentials):
                 "error": f"Couldn't retrieve metadata {str(e)}",
                 "node_payload": {},
                 "collection_payload": {},
+                "cache_payload": {},
             }
         )
 
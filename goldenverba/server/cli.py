@@ -49,6 +49,27 @@ def start(port, host, prod, workers):
     )
 
 
+async def connect(manager, url, api_key, deployment):
+    if url is not None and api_key is not None:
+        if deployment == "" or deployment == "Weaviate":
+            return await manager.connect(
+                Credentials(deployment="Weaviate", url=url, key=api_key)
+            )
+        elif deployment == "Docker":
+            return await manager.connect(
+                Credentials(deployment="Docker", url=url, key=api_key)
+            )
+        else:
+            raise ValueError("Invalid deployment")
+    else:
+        if deployment == "" or deployment == "Local":
+            return await manager.connect(
+                Credentials(deployment="Local", url="", key="")
+            )
+        else:
+            raise ValueError("Invalid deployment")
+
+
 @click.option(
     "--url",
     default=os.getenv("WEAVIATE_URL_VERBA"),
@@ -79,24 +100,7 @@ def reset(url, api_key, deployment, full_reset):
     manager = verba_manager.VerbaManager()
 
     async def async_reset():
-        if url is not None and api_key is not None:
-            if deployment == "" or deployment == "Weaviate":
-                client = await manager.connect(
-                    Credentials(deployment="Weaviate", url=url, key=api_key)
-                )
-            elif deployment == "Docker":
-                client = await manager.connect(
-                    Credentials(deployment="Docker", url=url, key=api_key)
-                )
-            else:
-                raise ValueError("Invalid deployment")
-        else:
-            if deployment == "" or deployment == "Local":
-                client = await manager.connect(
-                    Credentials(deployment="Local", url="", key="")
-                )
-            else:
-                raise ValueError("Invalid deployment")
+        client = await connect(manager, url, api_key, deployment)
 
         if not full_reset:
             await manager.reset_rag_config(client)
@@ -110,5 +114,41 @@ def reset(url, api_key, deployment, full_reset):
     asyncio.run(async_reset())
 
 
+@click.option(
+    "--url",
+    default=os.getenv("WEAVIATE_URL_VERBA"),
+    help="Weaviate URL",
+)
+@click.option(
+    "--api_key",
+    default=os.getenv("WEAVIATE_API_KEY_VERBA"),
+    help="Weaviate API Key",
+)
+@click.option(
+    "--deployment",
+    default="",
+    help="Deployment (Local, Weaviate, Docker)",
+)
+@cli.command()
+def migrate(url, api_key, deployment):
+    """
+    Migrate existing Verba collections to the explicit schemas.
+    """
+    import asyncio
+
+    manager = verba_manager.VerbaManager()
+
+    async def async_migrate():
+        client = await connect(manager, url, api_key, deployment)
+        try:
+            migrated = await manager.weaviate_manager.migrate_collections(client)
+            for collection_name, count in migrated.items():
+                click.echo(f"{collection_name}: {count} objects")
+        finally:
+            await client.close()
+
+    asyncio.run(async_migrate())
+
+
 if __name__ == "__main__":
     cli()
@@ -1,3 +1,10 @@
+import os
+import io
+import json
+import mmap
+import time
+import hashlib
+
 from fastapi import WebSocket
 from goldenverba.server.types import (
     FileStatus,
@@ -5,7 +12,11 @@ from goldenverba.server.types import (
     DataBatchPayload,
     FileConfig,
     CreateNewDocument,
+    UploadHeaderPayload,
+    UploadOffsetPayload,
+    Credentials,
 )
+from goldenverba.components.util import get_cache_dir
 from wasabi import msg
 
 
@@ -60,9 +71,14 @@ class BatchManager:
 
             fileConfig = self.check_batch(payload.fileID)
 
-            if fileConfig is not None or payload.isLastChunk:
+            # The last chunk can overtake earlier ones, only drop the batch once it is complete
+            if fileConfig is not None:
                 msg.info(f"Removing {payload.fileID} from BatchManager")
                 del self.batches[payload.fileID]
+            elif payload.isLastChunk:
+                msg.warn(
+                    f"Received last chunk of {payload.fileID}, waiting for {self.batches[payload.fileID]['total'] - len(self.batches[payload.fileID]['chunks'])} missing chunks"
+                )
 
             return fileConfig
 
@@ -73,7 +89,315 @@ class BatchManager:
         if len(self.batches[fileID]["chunks"].keys()) == self.batches[fileID]["total"]:
             msg.good(f"Collected all Batches of {fileID}")
             chunks = self.batches[fileID]["chunks"]
-            data = "".join([chunks[chunk] for chunk in chunks])
+            data = "".join([chunks[order] for order in sorted(chunks)])
             return FileConfig.model_validate_json(data)
         else:
             return None
+
+
+class ResumableUpload:
+    """
+    Upload spooled to a file in the upload directory, pieces may arrive in any order and over several connections.
+    The FileConfig and size are persisted once next to the file, the received byte ranges every
+    VERBA_UPLOAD_SAVE_MB or VERBA_UPLOAD_SAVE_SECONDS so an upload can be resumed after a disconnect or restart.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        upload_id: str,
+        fileConfig: FileConfig,
+        size: int,
+        received: list[list[int]] = None,
+    ):
+        self.path = path
+        self.upload_id = upload_id
+        self.fileConfig = fileConfig
+        self.size = size
+        # Sorted, merged [start, end) ranges of received bytes
+        self.received = received or []
+        self.claimed = False
+        self.mmap: mmap.mmap = None
+        self.save_bytes = int(float(os.getenv("VERBA_UPLOAD_SAVE_MB", 8)) * 1024 * 1024)
+        self.save_seconds = float(os.getenv("VERBA_UPLOAD_SAVE_SECONDS", 2))
+        self.unsaved_bytes = 0
+        self.saved_at = time.time()
+        self.updated_at = time.time()
+        if os.path.exists(path + ".part"):
+            self.file = open(path + ".part", "r+b")
+        else:
+            self.file = open(path + ".part", "w+b")
+            self.file.truncate(size)
+            self.save_metadata()
+            self.save_ranges()
+
+    def write(self, offset: int, data: bytes):
+        if offset < 0 or offset + len(data) > self.size:
+            raise Exception(
+                f"Upload {self.upload_id} piece at offset {offset} exceeds its announced size of {self.size} bytes"
+            )
+        if len(data) == 0:
+            return
+        self.file.seek(offset)
+        self.file.write(data)
+        self.add_range(offset, offset + len(data))
+        self.unsaved_bytes += len(data)
+        self.updated_at = time.time()
+        # Ranges lost in a crash are only sent again, so they are saved in intervals and once complete
+        if (
+            self.unsaved_bytes >= self.save_bytes
+            or self.updated_at - self.saved_at >= self.save_seconds
+            or self.is_complete()
+        ):
+            self.save_ranges()
+
+    def add_range(self, start: int, end: int):
+        ranges = []
+        for range_start, range_end in self.received:
+            if range_end < start or range_start > end:
+                ranges.append([range_start, range_end])
+            else:
+                start = min(start, range_start)
+                end = max(end, range_end)
+        ranges.append([start, end])
+        self.received = sorted(ranges)
+
+    def missing(self) -> list[list[int]]:
+        ranges = []
+        position = 0
+        for start, end in self.received:
+            if start > position:
+                ranges.append([position, start])
+            position = end
+        if position < self.size:
+            ranges.append([position, self.size])
+        return ranges
+
+    def is_complete(self) -> bool:
+        return len(self.missing()) == 0
+
+    def status(self) -> dict:
+        return {
+            "uploadID": self.upload_id,
+            "fileID": self.fileConfig.fileID,
+            "size": self.size,
+            "received": self.received,
+            "missing": self.missing(),
+            "complete": self.is_complete(),
+        }
+
+    def save_metadata(self):
+        """Write the FileConfig and size, only needed when the upload is created or resumed"""
+        self.write_json(
+            ".json",
+            {
+                "uploadID": self.upload_id,
+                "fileConfig": self.fileConfig.model_dump(),
+                "size": self.size,
+            },
+        )
+
+    def save_ranges(self):
+        if self.file.closed:
+            return
+        # Data first, a restart must never report bytes as received that never reached the file
+        self.file.flush()
+        self.write_json(".ranges", self.received)
+        self.unsaved_bytes = 0
+        self.saved_at = time.time()
+
+    def write_json(self, suffix: str, state):
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.path + ".tmp", self.path + suffix)
+
+    def open(self) -> io.BufferedIOBase:
+        self.file.seek(0)
+        return self.file
+
+    def getbuffer(self) -> memoryview:
+        if self.size == 0:
+            return memoryview(b"")
+        # Map the file instead of reading it into memory
+        if self.mmap is None:
+            self.file.flush()
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self.mmap)
+
+    def close(self):
+        try:
+            if self.mmap is not None:
+                self.mmap.close()
+        except BufferError:
+            # A reader still holds a view, the mapping is released once it is garbage collected
+            pass
+        finally:
+            self.file.close()
+
+    def __deepcopy__(self, memo):
+        # FileConfigs are deep copied per document, they all share the same upload
+        return self
+
+
+class UploadStore:
+    """
+    Uploads of all connections, spooled to VERBA_UPLOAD_DIR.
+    Incomplete uploads are kept until VERBA_UPLOAD_TTL_HOURS after their last piece,
+    uploads larger than VERBA_UPLOAD_MAX_SIZE_MB are rejected before any space is reserved.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("VERBA_UPLOAD_DIR", get_cache_dir("uploads"))
+        os.makedirs(self.path, exist_ok=True)
+        self.ttl = float(os.getenv("VERBA_UPLOAD_TTL_HOURS", 24)) * 3600
+        self.max_size = int(
+            float(os.getenv("VERBA_UPLOAD_MAX_SIZE_MB", 1024)) * 1024 * 1024
+        )
+        self.uploads: dict[str, ResumableUpload] = {}
+
+    def get_path(self, upload_id: str) -> str:
+        # Upload IDs come from clients, never use them as file names directly
+        return os.path.join(self.path, hashlib.sha256(upload_id.encode()).hexdigest())
+
+    def get(self, upload_id: str) -> ResumableUpload | None:
+        if upload_id in self.uploads:
+            return self.uploads[upload_id]
+        path = self.get_path(upload_id)
+        if not os.path.exists(path + ".json") or not os.path.exists(path + ".part"):
+            return None
+        try:
+            with open(path + ".json") as f:
+                state = json.load(f)
+            received = []
+            if os.path.exists(path + ".ranges"):
+                with open(path + ".ranges") as f:
+                    received = json.load(f)
+            upload = ResumableUpload(
+                path,
+                upload_id,
+                FileConfig.model_validate(state["fileConfig"]),
+                state["size"],
+                received,
+            )
+        except Exception as e:
+            msg.warn(f"Couldn't restore upload {upload_id}: {str(e)}")
+            self.delete_files(path)
+            return None
+        self.uploads[upload_id] = upload
+        return upload
+
+    def start(self, header: UploadHeaderPayload) -> ResumableUpload:
+        """Create an upload or resume the existing one with the same ID and size"""
+        self.cleanup()
+        upload_id = header.uploadID or header.fileConfig.fileID
+        if header.size < 0 or header.size > self.max_size:
+            raise Exception(
+                f"Upload {upload_id} announced {header.size} bytes, the limit is {self.max_size} bytes (VERBA_UPLOAD_MAX_SIZE_MB)"
+            )
+        upload = self.get(upload_id)
+        if upload is not None and (upload.size != header.size or upload.claimed):
+            msg.warn(f"Restarting upload {upload_id}")
+            self.remove(upload)
+            upload = None
+        if upload is None:
+            upload = ResumableUpload(
+                self.get_path(upload_id), upload_id, header.fileConfig, header.size
+            )
+            self.uploads[upload_id] = upload
+        else:
+            msg.info(
+                f"Resuming upload {upload_id} ({header.size - sum(end - start for start, end in upload.missing())} of {header.size} bytes received)"
+            )
+            upload.fileConfig = header.fileConfig
+            upload.save_metadata()
+        return upload
+
+    def claim(self, upload: ResumableUpload) -> FileConfig | None:
+        """Return the FileConfig with the upload attached once, after all bytes arrived"""
+        if upload.claimed or not upload.is_complete():
+            return None
+        upload.claimed = True
+        msg.good(f"Received {upload.size} bytes of {upload.fileConfig.fileID}")
+        fileConfig = upload.fileConfig
+        fileConfig._upload = upload
+        return fileConfig
+
+    def remove(self, upload: ResumableUpload):
+        upload.close()
+        self.uploads.pop(upload.upload_id, None)
+        self.delete_files(upload.path)
+
+    def delete_files(self, path: str):
+        for suffix in [".part", ".json", ".ranges", ".tmp"]:
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                msg.warn(f"Couldn't delete {path + suffix}: {str(e)}")
+
+    def cleanup(self):
+        expires = time.time() - self.ttl
+        for upload in list(self.uploads.values()):
+            if not upload.claimed and upload.updated_at < expires:
+                msg.info(f"Removing expired upload {upload.upload_id}")
+                self.remove(upload)
+        # Leftovers of earlier runs
+        active = {upload.path for upload in self.uploads.values()}
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, os.path.splitext(name)[0])
+            if path in active:
+                continue
+            try:
+                if os.path.getmtime(os.path.join(self.path, name)) < expires:
+                    self.delete_files(path)
+            except FileNotFoundError:
+                pass
+
+
+class UploadManager:
+    """
+    Receives binary framed uploads of one connection into the shared UploadStore.
+    An UploadHeaderPayload starts or resumes an upload, raw byte frames are written at the current offset
+    and an UploadOffsetPayload moves the offset to send pieces out of order or resume at a missing range.
+    """
+
+    def __init__(self, store: UploadStore):
+        self.store = store
+        self.upload: ResumableUpload = None
+        self.credentials: Credentials = None
+        self.offset = 0
+
+    def start(self, header: UploadHeaderPayload) -> ResumableUpload:
+        self.close()
+        self.upload = self.store.start(header)
+        self.credentials = header.credentials
+        self.offset = 0
+        return self.upload
+
+    def seek(self, payload: UploadOffsetPayload):
+        if self.upload is None or self.upload.upload_id != payload.uploadID:
+            raise Exception(
+                f"Upload {payload.uploadID} was not started on this connection"
+            )
+        self.offset = payload.offset
+
+    def add_bytes(self, data: bytes) -> FileConfig | None:
+        if self.upload is None:
+            raise Exception("Received file bytes without an upload header")
+        self.upload.write(self.offset, data)
+        self.offset += len(data)
+        return self.check_upload()
+
+    def check_upload(self) -> FileConfig | None:
+        if self.upload is None:
+            return None
+        fileConfig = self.store.claim(self.upload)
+        if fileConfig is not None:
+            self.upload = None
+        return fileConfig
+
+    def close(self):
+        """Save the received ranges of the current upload, e.g. when the connection is closed"""
+        if self.upload is not None:
+            self.upload.save_ranges()
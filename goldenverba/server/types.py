@@ -1,5 +1,7 @@
-from typing import Literal
-from pydantic import BaseModel
+import io
+import base64
+from typing import Any, BinaryIO, Literal
+from pydantic import BaseModel, PrivateAttr
 from enum import Enum
 
 
@@ -149,6 +151,38 @@ class FileConfig(BaseModel):
     status: FileStatus
     metadata: str
     status_report: dict
+    # Raw bytes of a binary websocket upload (ResumableUpload), content stays empty in that case
+    _upload: Any = PrivateAttr(default=None)
+
+    def open_content(self) -> BinaryIO:
+        """File handle over the raw file bytes"""
+        if self._upload is not None:
+            return self._upload.open()
+        return io.BytesIO(base64.b64decode(self.content))
+
+    def read_content(self) -> bytes | memoryview:
+        """Raw file bytes, binary uploads are returned as memoryview without copying"""
+        if self._upload is not None:
+            return self._upload.getbuffer()
+        return base64.b64decode(self.content)
+
+
+class UploadHeaderPayload(BaseModel):
+    fileConfig: FileConfig
+    size: int
+    credentials: Credentials
+    # Identifies the upload across connections for resuming, defaults to the fileID
+    uploadID: str = ""
+
+
+class UploadOffsetPayload(BaseModel):
+    uploadID: str
+    offset: int
+
+
+class UploadStatusPayload(BaseModel):
+    uploadID: str
+    credentials: Credentials
 
 
 class ImportStreamPayload(BaseModel):
@@ -231,6 +265,7 @@ class GeneratePayload(BaseModel):
     context: str
     conversation: list[ConversationItem]
     rag_config: dict[str, RAGComponentClass]
+    credentials: Credentials | None = None
 
 
 class ConfigPayload(BaseModel):
@@ -254,6 +289,12 @@ class GetDocumentPayload(BaseModel):
     credentials: Credentials
 
 
+class DeleteDocumentsPayload(BaseModel):
+    uuids: list[str] = []
+    labels: list[str] = []
+    credentials: Credentials
+
+
 class ResetPayload(BaseModel):
     resetMode: str
     credentials: Credentials
@@ -0,0 +1,419 @@
+import os
+import base64
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from typing import Callable
+
+from wasabi import msg
+
+from goldenverba.components.document import Document
+from goldenverba.components.util import get_cache_dir
+from goldenverba.server.helpers import LoggerManager
+from goldenverba.server.types import FileConfig, FileStatus
+
+
+class StageMetrics:
+    """Throughput metrics of a single sync stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+
+    def to_json(self, elapsed: float) -> dict:
+        return {
+            "stage": self.name,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_time": round(self.busy_time, 2),
+            "avg_latency": (
+                round(self.busy_time / self.processed, 3) if self.processed else 0
+            ),
+            "throughput": round(self.processed / elapsed, 2) if elapsed > 0 else 0,
+        }
+
+
+class SyncItem:
+    """A file or one of its documents moving through the sync stages"""
+
+    def __init__(self, file_path: str, fileConfig: FileConfig = None):
+        self.file_path = file_path
+        self.fileConfig = fileConfig
+        self.document: Document = None
+        # Previous version of the document, replaced once the new one is ingested
+        self.duplicate_uuid: str = None
+
+
+class SyncManifest:
+    """
+    Persistent manifest of synced files stored in a local SQLite file.
+    Maps each source path to its size, mtime and sha256 so unchanged files are skipped without being read.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv(
+            "VERBA_SYNC_MANIFEST", os.path.join(get_cache_dir(), "sync_manifest.db")
+        )
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS manifest ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, sha256 TEXT, title TEXT)"
+            )
+            self.connection.commit()
+
+    def get(self, file_path: str) -> dict | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT size, mtime, sha256, title FROM manifest WHERE path = ?",
+                (normalize_path(file_path),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"size": row[0], "mtime": row[1], "sha256": row[2], "title": row[3]}
+
+    def set(self, file_path: str, size: int, mtime: float, sha256: str, title: str):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO manifest (path, size, mtime, sha256, title) VALUES (?, ?, ?, ?, ?)",
+                (normalize_path(file_path), size, mtime, sha256, title),
+            )
+            self.connection.commit()
+
+    def remove(self, file_path: str):
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM manifest WHERE path = ?", (normalize_path(file_path),)
+            )
+            self.connection.commit()
+
+    def is_unchanged(self, entry: dict, file_path: str) -> bool:
+        """Compare size and mtime of a manifest entry with the file, the file is not read"""
+        stat = os.stat(file_path)
+        return entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class SyncManager:
+    """
+    Bounded-parallel folder sync pipeline.
+    Files move through separate read, chunk, embed and ingest stages connected by bounded queues,
+    so reading file N+1 overlaps with embedding file N.
+    """
+
+    stages = ["read", "chunk", "embed", "ingest"]
+
+    def __init__(self, manager, concurrency: int = None, manifest: SyncManifest = None):
+        self.manager = manager
+        self.manifest = manifest
+        self.concurrency = max(
+            1,
+            (
+                concurrency
+                if concurrency is not None
+                else int(os.getenv("VERBA_SYNC_CONCURRENCY", 4))
+            ),
+        )
+
+    async def sync(
+        self,
+        client,
+        file_paths: list[str],
+        describe: Callable[[str], tuple[str, str, str]],
+        logger: LoggerManager = LoggerManager(),
+        overwrite: bool = False,
+    ) -> dict:
+        """Import all files and return per-stage metrics
+        @parameter: file_paths : list[str] - Paths of the files to import
+        @parameter: describe : Callable - Maps a file path to (fileID, filename, extension)
+        @returns dict - Imported, skipped and failed file counts with per-stage metrics
+        """
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+
+        rag_config = self.manager.create_config()
+        metrics = {stage: StageMetrics(stage) for stage in self.stages}
+        queues = {
+            stage: asyncio.Queue(maxsize=self.concurrency * 2) for stage in self.stages
+        }
+        # Per file bookkeeping, a file is recorded in the manifest once all its documents are ingested
+        files = {}
+        handlers = {
+            "read": lambda item: self.read(
+                client, item, describe, rag_config, overwrite, logger, files
+            ),
+            "chunk": lambda item: self.chunk(item, logger),
+            "embed": lambda item: self.embed(client, item, logger),
+            "ingest": lambda item: self.ingest(client, item, logger, files),
+        }
+        failed_files = set()
+
+        async def worker(stage: str, outbox: asyncio.Queue | None):
+            inbox = queues[stage]
+            while True:
+                item: SyncItem = await inbox.get()
+                try:
+                    stage_start = loop.time()
+                    try:
+                        results = await handlers[stage](item)
+                        metrics[stage].processed += 1
+                    except Exception as e:
+                        metrics[stage].failed += 1
+                        fileID = (
+                            item.fileConfig.fileID
+                            if item.fileConfig is not None
+                            else item.file_path
+                        )
+                        failed_files.add(fileID)
+                        if item.file_path in files:
+                            files[item.file_path]["failed"] = True
+                        msg.fail(f"Sync {stage} failed for {item.file_path}: {str(e)}")
+                        await logger.send_report(
+                            fileID,
+                            status=FileStatus.ERROR,
+                            message=f"Import for {item.file_path} failed: {str(e)}",
+                            took=round(loop.time() - stage_start, 2),
+                        )
+                        continue
+                    finally:
+                        metrics[stage].busy_time += loop.time() - stage_start
+
+                    if outbox is not None:
+                        for result in results:
+                            await outbox.put(result)
+                finally:
+                    inbox.task_done()
+
+        workers = []
+        for i, stage in enumerate(self.stages):
+            outbox = queues[self.stages[i + 1]] if i + 1 < len(self.stages) else None
+            for _ in range(self.concurrency):
+                workers.append(asyncio.create_task(worker(stage, outbox)))
+
+        try:
+            for file_path in file_paths:
+                await queues["read"].put(SyncItem(file_path))
+            for stage in self.stages:
+                await queues[stage].join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        elapsed = loop.time() - start_time
+        skipped = sum(1 for state in files.values() if state["skipped"])
+        report = {
+            "files": len(file_paths),
+            "skipped": skipped,
+            "failed": len(failed_files),
+            "took": round(elapsed, 2),
+            "metrics": [metrics[stage].to_json(elapsed) for stage in self.stages],
+        }
+        msg.good(
+            f"Synced {len(file_paths)} files ({skipped} unchanged, {len(failed_files)} failed) in {elapsed:.2f} seconds"
+        )
+        return report
+
+    ### Stages
+
+    async def read(
+        self,
+        client,
+        item: SyncItem,
+        describe: Callable[[str], tuple[str, str, str]],
+        rag_config: dict,
+        overwrite: bool,
+        logger: LoggerManager,
+        files: dict,
+    ) -> list[SyncItem]:
+        fileID, filename, extension = describe(item.file_path)
+        stat = os.stat(item.file_path)
+        state = files[item.file_path] = {
+            "pending": 0,
+            "failed": False,
+            "skipped": False,
+            "record": None,
+            # Previous document of a file whose new documents have other titles
+            "replaced": None,
+        }
+
+        duplicate_uuid = await self.manager.weaviate_manager.exist_document_name(
+            client, filename
+        )
+        entry = self.manifest.get(item.file_path) if self.manifest else None
+        if entry is not None and entry["title"] != filename:
+            entry = None
+
+        # Only trust the manifest while the document is still in Verba
+        if entry is not None and duplicate_uuid is None:
+            self.manifest.remove(item.file_path)
+            entry = None
+
+        if entry is not None:
+            if self.manifest.is_unchanged(entry, item.file_path):
+                return await self.skip(fileID, filename, state, logger)
+        elif duplicate_uuid is not None and not overwrite:
+            raise Exception(f"{filename} already exists in Verba")
+
+        file_bytes = await asyncio.to_thread(read_file, item.file_path)
+        sha256 = hashlib.sha256(file_bytes).hexdigest()
+        state["record"] = (stat.st_size, stat.st_mtime, sha256, filename)
+
+        # Touched but identical files only refresh their manifest entry
+        if (
+            entry is not None
+            and duplicate_uuid is not None
+            and entry["sha256"] == sha256
+        ):
+            self.manifest.set(item.file_path, *state["record"])
+            return await self.skip(fileID, filename, state, logger)
+
+        item.fileConfig = FileConfig(
+            fileID=fileID,
+            filename=filename,
+            isURL=False,
+            overwrite=overwrite,
+            extension=extension,
+            source="",
+            content=base64.b64encode(file_bytes).decode("utf-8"),
+            labels=["Document"],
+            rag_config=rag_config,
+            file_size=len(file_bytes),
+            status=FileStatus.READY,
+            metadata="",
+            status_report={},
+        )
+        del file_bytes
+
+        documents = await self.manager.reader_manager.load(
+            item.fileConfig.rag_config["Reader"].selected, item.fileConfig, logger
+        )
+        # The documents hold the decoded content, the base64 copy is no longer needed
+        item.fileConfig.content = ""
+
+        # Documents with the same title replace it once ingested, otherwise it is removed after the whole file
+        titles = [document.title for document in documents]
+        if duplicate_uuid is not None and filename not in titles:
+            state["replaced"] = duplicate_uuid
+
+        state["pending"] = len(documents)
+        items = []
+        for document in documents:
+            document_item = SyncItem(item.file_path, item.fileConfig)
+            document_item.document = document
+            if document.title == filename:
+                document_item.duplicate_uuid = duplicate_uuid
+            items.append(document_item)
+        return items
+
+    async def chunk(self, item: SyncItem, logger: LoggerManager) -> list[SyncItem]:
+        fileConfig = item.fileConfig
+        chunked_documents = await self.manager.chunker_manager.chunk(
+            fileConfig.rag_config["Chunker"].selected,
+            fileConfig,
+            [item.document],
+            self.manager.embedder_manager.embedders[
+                fileConfig.rag_config["Embedder"].selected
+            ],
+            logger,
+        )
+        item.document = chunked_documents[0]
+        return [item]
+
+    async def embed(
+        self, client, item: SyncItem, logger: LoggerManager
+    ) -> list[SyncItem]:
+        fileConfig = item.fileConfig
+        embedder = fileConfig.rag_config["Embedder"].selected
+
+        reusable_vectors = {}
+        if item.duplicate_uuid is not None:
+            try:
+                reusable_vectors = (
+                    await self.manager.weaviate_manager.get_reusable_vectors(
+                        client,
+                        item.duplicate_uuid,
+                        fileConfig.rag_config["Embedder"]
+                        .components[embedder]
+                        .config["Model"]
+                        .value,
+                        item.document.metadata,
+                    )
+                )
+            except Exception as e:
+                msg.warn(f"Could not reuse vectors of {item.document.title}: {str(e)}")
+
+        vectorized_documents = await self.manager.embedder_manager.vectorize(
+            embedder,
+            fileConfig,
+            [item.document],
+            logger,
+            reusable_vectors,
+            client,
+        )
+        item.document = vectorized_documents[0]
+        return [item]
+
+    async def ingest(
+        self, client, item: SyncItem, logger: LoggerManager, files: dict
+    ) -> list[SyncItem]:
+        fileConfig = item.fileConfig
+        embedder = fileConfig.rag_config["Embedder"].selected
+        await self.manager.weaviate_manager.import_document(
+            client,
+            item.document,
+            fileConfig.rag_config["Embedder"]
+            .components[embedder]
+            .config["Model"]
+            .value,
+        )
+        # Full re-insert on change, see VerbaManager.process_single_document
+        if item.duplicate_uuid is not None:
+            await self.manager.weaviate_manager.delete_document(
+                client, item.duplicate_uuid
+            )
+        await logger.send_report(
+            fileConfig.fileID,
+            status=FileStatus.DONE,
+            message=f"Import for {item.document.title} completed successfully",
+            took=0,
+        )
+
+        state = files[item.file_path]
+        state["pending"] -= 1
+        if state["pending"] == 0 and not state["failed"]:
+            if state["replaced"] is not None:
+                await self.manager.weaviate_manager.delete_document(
+                    client, state["replaced"]
+                )
+            if self.manifest:
+                self.manifest.set(item.file_path, *state["record"])
+        return []
+
+    async def skip(
+        self, fileID: str, filename: str, state: dict, logger: LoggerManager
+    ) -> list[SyncItem]:
+        state["skipped"] = True
+        await logger.send_report(
+            fileID,
+            status=FileStatus.DONE,
+            message=f"{filename} is unchanged, skipping import",
+            took=0,
+        )
+        return []
+
+
+def read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def normalize_path(file_path: str) -> str:
+    return os.path.normcase(os.path.abspath(file_path))
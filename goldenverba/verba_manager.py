@@ -19,6 +19,7 @@ from goldenverba.server.types import (
     FileStatus,
     ChunkScore,
     Credentials,
+    RAGComponentClass,
 )
 
 from goldenverba.components.managers import (
@@ -29,6 +30,8 @@ from goldenverba.components.managers import (
     GeneratorManager,
     WeaviateManager,
 )
+from goldenverba.components.cache import SemanticCache
+from goldenverba.import_executor import ImportExecutor
 
 load_dotenv()
 
@@ -39,10 +42,12 @@ class VerbaManager:
     def __init__(self) -> None:
         self.reader_manager = ReaderManager()
         self.chunker_manager = ChunkerManager()
-        self.embedder_manager = EmbeddingManager()
+        self.weaviate_manager = WeaviateManager()
+        self.embedder_manager = EmbeddingManager(self.weaviate_manager)
+        self.import_executor = ImportExecutor()
+        self.semantic_cache = SemanticCache()
         self.retriever_manager = RetrieverManager()
         self.generator_manager = GeneratorManager()
-        self.weaviate_manager = WeaviateManager()
         self.rag_config_uuid = "e0adcc12-9bad-4588-8a1e-bab0af6ed485"
         self.theme_config_uuid = "baab38a7-cb51-4108-acd8-6edeca222820"
         self.user_config_uuid = "f53f7738-08be-4d5a-b003-13eb4bf03ac7"
@@ -106,7 +111,6 @@ class VerbaManager:
             if duplicate_uuid is not None and not fileConfig.overwrite:
                 raise Exception(f"{fileConfig.filename} already exists in Verba")
             elif duplicate_uuid is not None and fileConfig.overwrite:
-                await self.weaviate_manager.delete_document(client, duplicate_uuid)
                 await logger.send_report(
                     fileConfig.fileID,
                     status=FileStatus.STARTING,
@@ -121,19 +125,35 @@ class VerbaManager:
                     took=0,
                 )
 
-            documents = await self.reader_manager.load(
-                fileConfig.rag_config["Reader"].selected, fileConfig, logger
-            )
+            titles = []
 
-            tasks = [
-                self.process_single_document(client, doc, fileConfig, logger)
-                for doc in documents
+            async def stream_documents():
+                # Documents are chunked and embedded while the reader is still loading the next ones
+                async for document in self.reader_manager.stream(
+                    fileConfig.rag_config["Reader"].selected, fileConfig, logger
+                ):
+                    titles.append(document.title)
+                    yield document
+
+            results = await self.import_executor.run(
+                stream_documents(),
+                lambda document: self.process_single_document(
+                    client, document, fileConfig, logger
+                ),
+            )
+            # Successful imports return their number of chunks
+            imported_chunks = [
+                result for result in results if not isinstance(result, Exception)
             ]
+            successful_tasks = len(imported_chunks)
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            successful_tasks = sum(
-                1 for result in results if not isinstance(result, Exception)
-            )
+            # Documents with the same title are updated incrementally in process_single_document
+            if (
+                duplicate_uuid is not None
+                and successful_tasks > 0
+                and fileConfig.filename not in titles
+            ):
+                await self.weaviate_manager.delete_document(client, duplicate_uuid)
 
             if successful_tasks > 1:
                 await logger.send_report(
@@ -146,7 +166,7 @@ class VerbaManager:
                 await logger.send_report(
                     fileConfig.fileID,
                     status=FileStatus.INGESTING,
-                    message=f"Imported {fileConfig.filename} and {len(documents[0].chunks)} chunks into Weaviate",
+                    message=f"Imported {fileConfig.filename} and {imported_chunks[0]} chunks into Weaviate",
                     took=round(loop.time() - start_time, 2),
                 )
             elif (
@@ -208,8 +228,24 @@ class VerbaManager:
             )
             if duplicate_uuid is not None and not currentFileConfig.overwrite:
                 raise Exception(f"{document.title} already exists in Verba")
-            elif duplicate_uuid is not None and currentFileConfig.overwrite:
-                await self.weaviate_manager.delete_document(client, duplicate_uuid)
+
+            embedder = currentFileConfig.rag_config["Embedder"].selected
+            embedder_model = (
+                currentFileConfig.rag_config["Embedder"]
+                .components[embedder]
+                .config["Model"]
+                .value
+            )
+
+            # On overwrite, unchanged chunks keep the vectors of the existing document
+            reusable_vectors = {}
+            if duplicate_uuid is not None:
+                try:
+                    reusable_vectors = await self.weaviate_manager.get_reusable_vectors(
+                        client, duplicate_uuid, embedder_model, document.metadata
+                    )
+                except Exception as e:
+                    msg.warn(f"Could not reuse vectors of {document.title}: {str(e)}")
 
             chunk_task = asyncio.create_task(
                 self.chunker_manager.chunk(
@@ -230,6 +266,8 @@ class VerbaManager:
                     currentFileConfig,
                     chunked_documents,
                     logger,
+                    reusable_vectors,
+                    client,
                 )
             )
             vectorized_documents = await embedding_task
@@ -237,16 +275,19 @@ class VerbaManager:
             for document in vectorized_documents:
                 ingesting_task = asyncio.create_task(
                     self.weaviate_manager.import_document(
-                        client,
-                        document,
-                        currentFileConfig.rag_config["Embedder"]
-                        .components[fileConfig.rag_config["Embedder"].selected]
-                        .config["Model"]
-                        .value,
+                        client, document, embedder_model
                     )
                 )
                 await ingesting_task
 
+            # Overwrites re-insert the whole document instead of patching chunks in place:
+            # the per-document PCA and the chunk positions change for every chunk on any edit,
+            # so nearly every stored chunk would be rewritten anyway. Only the embeddings are reused.
+            # The previous version stays searchable until the new one is imported, a failed import
+            # rolls back the new doc_uuid and leaves the old document untouched.
+            if duplicate_uuid is not None:
+                await self.weaviate_manager.delete_document(client, duplicate_uuid)
+
             await logger.send_report(
                 currentFileConfig.fileID,
                 status=FileStatus.INGESTING,
@@ -260,6 +301,7 @@ class VerbaManager:
                 message=f"Import for {currentFileConfig.filename} completed successfully",
                 took=round(loop.time() - start_time, 2),
             )
+            return len(document.chunks)
         except Exception as e:
             await logger.send_report(
                 currentFileConfig.fileID,
@@ -662,11 +704,7 @@ class VerbaManager:
 
         # Return Content based on Page
         else:
-            document = await self.weaviate_manager.get_document(
-                client, uuid, properties=["meta"]
-            )
-            config = json.loads(document["meta"])
-            embedder = config["Embedder"]["config"]["Model"]["value"]
+            embedder = await self.weaviate_manager.get_document_embedder(client, uuid)
             request_chunk_ids = [
                 i
                 for i in range(
@@ -718,6 +756,31 @@ class VerbaManager:
         vector = await self.embedder_manager.vectorize_query(
             embedder, query, rag_config
         )
+
+        if self.semantic_cache.enabled:
+            cache_model = self.get_embedder_model(rag_config)
+            config_key = self.semantic_cache.get_config_key(rag_config)
+            filter_key = self.semantic_cache.get_filter_key(labels, document_uuids)
+            try:
+                entry = await self.weaviate_manager.retrieve_semantic_cache(
+                    client,
+                    cache_model,
+                    vector,
+                    config_key,
+                    self.semantic_cache.max_distance,
+                    self.semantic_cache.ttl,
+                    filter_key=filter_key,
+                )
+            except Exception as e:
+                msg.warn(f"Semantic cache lookup failed: {str(e)}")
+                entry = None
+
+            if self.semantic_cache.record("retrieval", entry) is not None:
+                msg.good(
+                    f"Retrieved similar query from semantic cache ({entry['distance']:.4f})"
+                )
+                return (json.loads(entry["documents"]), entry["context"])
+
         documents, context = await self.retriever_manager.retrieve(
             client,
             retriever,
@@ -729,6 +792,23 @@ class VerbaManager:
             document_uuids,
         )
 
+        if self.semantic_cache.enabled and len(documents) > 0:
+            try:
+                await self.weaviate_manager.add_to_semantic_cache(
+                    client,
+                    cache_model,
+                    vector,
+                    query,
+                    context,
+                    documents,
+                    config_key,
+                    filter_key,
+                    self.semantic_cache.get_context_key(context),
+                    self.semantic_cache.ttl,
+                )
+            except Exception as e:
+                msg.warn(f"Failed to add query to the semantic cache: {str(e)}")
+
         return (documents, context)
 
     async def generate_stream_answer(
@@ -737,7 +817,45 @@ class VerbaManager:
         query: str,
         context: str,
         conversation: list[dict],
+        client=None,
     ):
+        """Stream the answer, cached answers of a similar query over the same context are streamed at once"""
+        use_cache = (
+            client is not None
+            and self.semantic_cache.enabled
+            and self.semantic_cache.is_first_turn(conversation)
+        )
+
+        if use_cache:
+            cache_model = self.get_embedder_model(rag_config)
+            config_key = self.semantic_cache.get_config_key(rag_config)
+            context_key = self.semantic_cache.get_context_key(context)
+            try:
+                vector = await self.embedder_manager.vectorize_query(
+                    rag_config["Embedder"].selected, query, rag_config
+                )
+                entry = await self.weaviate_manager.retrieve_semantic_cache(
+                    client,
+                    cache_model,
+                    vector,
+                    config_key,
+                    self.semantic_cache.max_distance,
+                    self.semantic_cache.ttl,
+                    context_key=context_key,
+                )
+            except Exception as e:
+                msg.warn(f"Semantic cache lookup failed: {str(e)}")
+                entry = None
+
+            if self.semantic_cache.record("answer", entry) is not None:
+                msg.good("Streaming answer from semantic cache")
+                yield {
+                    "message": entry["answer"],
+                    "finish_reason": "stop",
+                    "cached": True,
+                    "distance": entry["distance"],
+                }
+                return
 
         full_text = ""
         async for result in self.generator_manager.generate_stream(
@@ -746,6 +864,41 @@ class VerbaManager:
             full_text += result["message"]
             yield result
 
+        if use_cache and full_text != "":
+            try:
+                await self.weaviate_manager.set_semantic_cache_answer(
+                    client, cache_model, config_key, context_key, full_text
+                )
+            except Exception as e:
+                msg.warn(f"Failed to add answer to the semantic cache: {str(e)}")
+
+    async def warm_up_query_cache(self, client):
+        """Pre-embed the most frequent suggestions with the configured embedder"""
+        limit = int(os.getenv("VERBA_QUERY_CACHE_WARMUP", 100))
+        if limit <= 0:
+            return
+        try:
+            config = await self.load_rag_config(client)
+            rag_config = {
+                component: RAGComponentClass.model_validate(config[component])
+                for component in config
+            }
+            queries = await self.weaviate_manager.retrieve_frequent_suggestions(
+                client, limit
+            )
+            if len(queries) == 0:
+                return
+            embedded = await self.embedder_manager.warm_up_queries(
+                rag_config["Embedder"].selected, queries, rag_config
+            )
+            msg.good(f"Warmed up query cache with {embedded} suggestions")
+        except Exception as e:
+            msg.warn(f"Query cache warm up failed: {str(e)}")
+
+    def get_embedder_model(self, rag_config: dict) -> str:
+        embedder = rag_config["Embedder"].selected
+        return rag_config["Embedder"].components[embedder].config["Model"].value
+
 
 class ClientManager:
     def __init__(self) -> None:
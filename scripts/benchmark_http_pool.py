@@ -0,0 +1,101 @@
+import asyncio
+import argparse
+import time
+
+import aiohttp
+from aiohttp import web
+
+from goldenverba.components.types import InputConfig
+from goldenverba.components.embedding.OpenAIEmbedder import OpenAIEmbedder
+from goldenverba.components.http_pool import http_pool
+
+
+# Minimal OpenAI compatible /embeddings endpoint
+async def embeddings(request: web.Request) -> web.Response:
+    payload = await request.json()
+    return web.json_response(
+        {"data": [{"embedding": [0.1] * 8} for _ in payload["input"]]}
+    )
+
+
+# Old behaviour: a new ClientSession (and TCP connection) is opened for every batch
+async def vectorize_unpooled(url: str, batch: list[str]) -> list[list[float]]:
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{url}/embeddings",
+            headers={"Authorization": "Bearer benchmark"},
+            json={"input": batch, "model": "benchmark"},
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return [item["embedding"] for item in data["data"]]
+
+
+def percentile(latencies: list[float], p: float) -> float:
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+
+async def timed(call) -> float:
+    start = time.perf_counter()
+    await call
+    return time.perf_counter() - start
+
+
+async def run(batches: int, batch_size: int, concurrency: int, port: int):
+    app = web.Application()
+    app.router.add_post("/embeddings", embeddings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    url = f"http://127.0.0.1:{port}"
+
+    batch = [f"benchmark chunk {i}" for i in range(batch_size)]
+    config = {
+        "Model": InputConfig(
+            type="dropdown", value="benchmark", description="", values=[]
+        ),
+        "API Key": InputConfig(
+            type="password", value="benchmark", description="", values=[]
+        ),
+        "URL": InputConfig(type="text", value=url, description="", values=[]),
+    }
+    embedder = OpenAIEmbedder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            return await timed(call)
+
+    results = {}
+    for label, make_call in [
+        ("Before (session per batch)", lambda: vectorize_unpooled(url, batch)),
+        ("After (shared pool)", lambda: embedder.vectorize(config, batch)),
+    ]:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(
+            *[limited(make_call()) for _ in range(batches)]
+        )
+        results[label] = (latencies, batches / (time.perf_counter() - start))
+
+    await http_pool.close()
+    await runner.cleanup()
+
+    print(f"Batches: {batches} | Batch size: {batch_size} | Concurrency: {concurrency}")
+    for label, (latencies, throughput) in results.items():
+        print(
+            f"{label}: p50 {percentile(latencies, 0.5):.2f}ms | p99 {percentile(latencies, 0.99):.2f}ms | {throughput:.1f} batches/sec"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark embedding requests with and without the shared HTTP pool."
+    )
+    parser.add_argument("--batches", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.batches, args.batch_size, args.concurrency, args.port))
@@ -0,0 +1,59 @@
+import asyncio
+import argparse
+import time
+
+from sentence_transformers import SentenceTransformer
+
+from goldenverba.components.types import InputConfig
+from goldenverba.components.embedding.SentenceTransformersEmbedder import (
+    SentenceTransformersEmbedder,
+    model_registry,
+)
+
+
+# Old behaviour: a new SentenceTransformer is constructed for every batch
+async def vectorize_uncached(model_name: str, batch: list[str]) -> list[list[float]]:
+    model = SentenceTransformer(model_name)
+    return model.encode(batch).tolist()
+
+
+async def run(model_name: str, chunks: int, batch_size: int):
+    content = [
+        f"This is benchmark chunk number {i} with some filler text to embed."
+        for i in range(chunks)
+    ]
+    batches = [content[i : i + batch_size] for i in range(0, chunks, batch_size)]
+    config = {
+        "Model": InputConfig(
+            type="dropdown", value=model_name, description="", values=[]
+        )
+    }
+
+    start = time.perf_counter()
+    for batch in batches:
+        await vectorize_uncached(model_name, batch)
+    before = chunks / (time.perf_counter() - start)
+
+    model_registry.clear()
+    embedder = SentenceTransformersEmbedder()
+    start = time.perf_counter()
+    for batch in batches:
+        await embedder.vectorize(config, batch)
+    after = chunks / (time.perf_counter() - start)
+
+    print(f"Model: {model_name} | Chunks: {chunks} | Batch size: {batch_size}")
+    print(f"Before (model per batch): {before:.1f} chunks/sec")
+    print(f"After (model registry):   {after:.1f} chunks/sec")
+    print(f"Speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark SentenceTransformersEmbedder with and without the model registry."
+    )
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=128)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.model, args.chunks, args.batch_size))
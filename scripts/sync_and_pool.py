@@ -10,6 +10,7 @@ import io
 from datetime import datetime
 import pytz
 import re
+import requests
 
 # Scopes to access Google Drive
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
@@ -129,8 +130,22 @@ def download_files_recursively(service, drive_id, folder_id, parent_path):
                 download_file(service, file_id, file_name, mime_type, parent_path)
 
 
+# Ask Verba to import the downloaded files, its sync manifest skips files whose content did not change
+def trigger_sync(verba_url, file_paths):
+    try:
+        # Verba only serves /api requests whose Origin matches its own URL
+        response = requests.post(f"{verba_url}/api/sync_drive", json={'file_paths': file_paths},
+                                 headers={'Origin': verba_url.rstrip('/')})
+        response.raise_for_status()
+        report = response.json()['report']
+        print(f"Verba sync: {report.get('files', 0)} files, {report.get('skipped', 0)} unchanged, "
+              f"{report.get('failed', 0)} failed")
+    except Exception as e:
+        print(f"Triggering Verba sync failed: {str(e)}")
+
+
 # Function to poll for changes and download only new or modified files (with subfolder support)
-def poll_for_changes(service, drive_id, folder_id, parent_path, poll_interval=60):
+def poll_for_changes(service, drive_id, folder_id, parent_path, poll_interval=60, verba_url=None):
     print(f"Polling for new or modified files in folder ID: {folder_id} and all subfolders in drive ID: {drive_id}")
 
     while True:
@@ -174,6 +189,8 @@ def poll_for_changes(service, drive_id, folder_id, parent_path, poll_interval=60
             print("\nDownloaded Files:")
             for file_path in downloaded_files:
                 print(file_path)
+            if verba_url:
+                trigger_sync(verba_url, downloaded_files)
         else:
             print("\nNo new or modified files found.")
 
@@ -187,6 +204,8 @@ if __name__ == '__main__':
         description='Google Drive file download script with initialization and polling modes.')
     parser.add_argument('-ini-drive', action='store_true', help='Run initial drive download to sync all files.')
     parser.add_argument('-pool-mode', action='store_true', help='Run polling mode to sync only new or modified files.')
+    parser.add_argument('--verba-url', default=None,
+                        help='Verba server to import new or modified files into during polling, e.g. http://localhost:8000')
     args = parser.parse_args()
 
     # Authenticate and create the Google Drive service
@@ -205,6 +224,7 @@ if __name__ == '__main__':
     elif args.pool_mode:
         # Run in polling mode
         print("Running in polling mode (-pool-mode)...")
-        poll_for_changes(service, drive_id, root_folder_id, download_folder, poll_interval=30)
+        poll_for_changes(service, drive_id, root_folder_id, download_folder, poll_interval=30,
+                         verba_url=args.verba_url)
     else:
         print("Please specify either -ini-drive or -pool-mode.")